@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Automod Offline Evaluation - Run automod patterns over exported chat logs
+Usage: python automod_eval.py <log_file> [<log_file> ...] [--workers N] [--chunk N] [--samples N] [--clean]
+Example: python automod_eval.py logs/messages.txt transcripts/*.txt --workers 4
+
+Accepted input lines:
+  - JSON lines with a "content" (or "message") key
+  - logs/messages.txt lines written by cogs/message.py
+  - ticket transcript lines written by cogs/ticket_system.py
+
+Use --clean when the input is known to contain no violations; every match is
+then counted as a false positive.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from multiprocessing import Pool
+
+from utils.automod_patterns import TIERS, iter_pattern_matches, load_blocked_words
+
+# "[ts] (guild) #channel | author (id): content" and "[ts] author (id): content"
+TEXT_LINE_RE = re.compile(r"^\[[^\]]*\][^\n]*?\(\d+\): (?P<content>.*)$")
+
+
+def parse_line(line):
+    """Extract message content from a single exported log line."""
+    line = line.rstrip("\n")
+    if not line.strip():
+        return None
+    if line.lstrip().startswith("{"):
+        try:
+            record = json.loads(line)
+            return record.get("content") or record.get("message") or ""
+        except Exception:
+            pass
+    m = TEXT_LINE_RE.match(line)
+    return m.group("content") if m else line
+
+
+def iter_chunks(paths, chunk_size):
+    """Stream message contents from files in chunks without loading whole files."""
+    chunk = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                content = parse_line(line)
+                if content is None:
+                    continue
+                chunk.append(content)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+
+# Set in each worker by init_worker
+_blocked = set()
+_sample_limit = 0
+
+
+def init_worker(blocked, sample_limit):
+    global _blocked, _sample_limit
+    _blocked = blocked
+    _sample_limit = sample_limit
+
+
+def evaluate_chunk(chunk):
+    """Worker: match a chunk of messages and return aggregated counts and a few samples.
+
+    Like the cog, a message with any match in blocked_words.json is skipped entirely,
+    so it counts toward no tier or pattern.
+    """
+    pattern_counts = Counter()
+    tier_messages = Counter()
+    blocked_hits = Counter()
+    samples = defaultdict(list)
+    for content in chunk:
+        hits = list(iter_pattern_matches(content))
+        suppressed = [text for _, _, text in hits if text in _blocked]
+        if suppressed:
+            blocked_hits.update(suppressed)
+            continue
+        for tier, idx, text in hits:
+            pattern_counts[(tier, idx)] += 1
+            bucket = samples[(tier, idx)]
+            if len(bucket) < _sample_limit:
+                bucket.append((text, content[:200]))
+        for tier in {tier for tier, _, _ in hits}:
+            tier_messages[tier] += 1
+    return len(chunk), pattern_counts, tier_messages, blocked_hits, dict(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate automod patterns against exported chat logs.")
+    parser.add_argument("files", nargs="+", help="Chat export files (messages.txt, transcripts, JSONL)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk", type=int, default=1000, help="Messages per worker batch (default: 1000)")
+    parser.add_argument("--samples", type=int, default=5, help="Sample hits to show per pattern (default: 5)")
+    parser.add_argument("--clean", action="store_true", help="Treat input as known-clean; every match is a false positive")
+    args = parser.parse_args()
+
+    for path in args.files:
+        if not os.path.exists(path):
+            print(f"❌ Error: File not found: {path}")
+            sys.exit(1)
+
+    blocked = load_blocked_words()
+    total = 0
+    pattern_counts = Counter()
+    tier_messages = Counter()
+    blocked_hits = Counter()
+    samples = defaultdict(list)
+
+    print("=" * 60)
+    print("🔍 AUTOMOD OFFLINE EVALUATION")
+    print("=" * 60)
+    print(f"📌 Files: {len(args.files)} | Workers: {args.workers} | Chunk: {args.chunk}")
+
+    start = time.perf_counter()
+    with Pool(processes=max(1, args.workers), initializer=init_worker, initargs=(blocked, args.samples)) as pool:
+        for n, counts, tiers, suppressed, chunk_samples in pool.imap_unordered(evaluate_chunk, iter_chunks(args.files, args.chunk)):
+            total += n
+            pattern_counts.update(counts)
+            tier_messages.update(tiers)
+            blocked_hits.update(suppressed)
+            for key, found in chunk_samples.items():
+                bucket = samples[key]
+                bucket.extend(found[:args.samples - len(bucket)])
+    elapsed = time.perf_counter() - start
+
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"\n📊 Messages: {total} in {elapsed:.2f}s ({rate:,.0f} msg/s)")
+
+    print("\n📈 Messages matched per tier:")
+    for tier, _ in TIERS:
+        count = tier_messages.get(tier, 0)
+        pct = (count / total * 100) if total else 0.0
+        label = "false positive rate" if args.clean else "of messages"
+        print(f"   • {tier}: {count} ({pct:.3f}% {label})")
+
+    print("\n🧩 Matches per pattern:")
+    for tier, compiled in TIERS:
+        for idx, pattern in enumerate(compiled):
+            print(f"   • {tier}[{idx}]: {pattern_counts.get((tier, idx), 0)}  {pattern.pattern}")
+
+    if blocked_hits:
+        print("\n🚫 Suppressed by blocked_words.json (messages not counted above):")
+        for word, count in blocked_hits.most_common(20):
+            print(f"   • {word!r}: {count}")
+
+    heading = "False positives" if args.clean else "Sample hits (review for false positives)"
+    print(f"\n🔎 {heading}:")
+    for (tier, idx), bucket in sorted(samples.items()):
+        print(f"   {tier}[{idx}]:")
+        for text, content in bucket:
+            print(f"     - {text!r} in: {content}")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ import traceback
 from aiohttp import web
 from version_manager import get_version
 from embed_storage import store_embed, get_embed_json_by_message_id, list_recent_embeds, clear_old_embeds
+from utils.database import database
 import json
 from datetime import datetime, timezone, date
 from typing import Optional
@@ -55,6 +56,9 @@ bot = commands.Bot(
     application_id=APPLICATION_ID
 )
 
+# Shared pooled SQLite connections for all cogs (see utils/database.py)
+bot.db = database
+
 # Image server is no longer managed by the bot. Run `image_server.py` manually.
 
 startup_output = io.StringIO()
@@ -581,6 +585,14 @@ async def main():
         print("All cogs loaded. Starting bot...")
         await bot.start(TOKEN)
 
+async def run():
+    try:
+        await main()
+    finally:
+        # Leaving `async with bot:` runs Bot.close(), which unloads the cogs and their
+        # cog_unload flushes; only then is it safe to close the database pool.
+        await bot.db.close()
+
 @bot.tree.command(name="sync", description="Sync slash commands (admin only).")
 async def sync_commands(interaction: discord.Interaction):
     if not interaction.user.guild_permissions.administrator:
@@ -1017,4 +1029,4 @@ async def clear_old_embeds_cmd(ctx: commands.Context, days: int = 30):
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(run())
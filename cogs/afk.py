@@ -1,157 +1,110 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
+import asyncio
+import io
 import os
+import time
 import datetime
-import aiosqlite
 import json
 from typing import Optional, Dict, List
-from collections import defaultdict
+from utils.activity_histograms import ActivityHistogramStore, aggregate_matrix, snapshot
 
 AFK_LOG_CHANNEL_ID = 1343686645815181382
-AFK_ADMIN_ROLE_IDS = {1329910241835352064}  # Only this role can use afkremove
+AFK_ADMIN_ROLE_IDS = {1329910241835352064}  # Only this role can use afkremove and activity_heatmap
 AFK_LOG_FILE = os.path.join("logs", "afk.txt")
 AFK_DB_FILE = os.path.join("data", "afk.db")
 AFK_ACTIVITY_FILE = os.path.join("data", "activity_tracking.json")
 AFK_PREFIX = "[AFK] "
+AFK_FLUSH_SECONDS = int(os.getenv("AFK_FLUSH_SECONDS", 5))
+HEATMAP_CACHE_SECONDS = 3600
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+
+def render_activity_heatmap(packed: bytes, days: List[int], title: str):
+    """Aggregate histograms and draw a 7x24 heatmap PNG. Runs in a worker thread.
+
+    Uses a standalone Figure rather than pyplot, whose global figure state is not thread-safe.
+    matplotlib is imported here so the rest of the cog loads without it.
+    """
+    from matplotlib.figure import Figure
+
+    matrix = aggregate_matrix(packed, days, int(time.time()) // 86400)
+    fig = Figure(figsize=(12, 4))
+    ax = fig.subplots()
+    image = ax.imshow(matrix, cmap="YlOrRd", aspect="auto")
+    ax.set_yticks(range(7), WEEKDAY_NAMES)
+    ax.set_xticks(range(24), [f"{h:02d}" for h in range(24)])
+    ax.set_xlabel("Hour (UTC)")
+    ax.set_title(title)
+    fig.colorbar(image, ax=ax, label="Decayed message-hours")
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=100)
+    # Top three (weekday, hour) cells for the embed text
+    flat = sorted(((matrix[d, h], d, h) for d in range(7) for h in range(24)), reverse=True)
+    peaks = [(d, h) for value, d, h in flat[:3] if value > 0]
+    return buffer.getvalue(), peaks
 
 class AFK(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.afk_messages = {}  # user_id: (message, timestamp)
-        self.activity_data = {}  # user_id: List[{"status": str, "timestamp": str}]
-        self.load_activity_data()
-
-    def load_activity_data(self):
-        """Load activity tracking data from JSON file."""
-        if os.path.exists(AFK_ACTIVITY_FILE):
-            try:
-                with open(AFK_ACTIVITY_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # Convert string keys to int keys
-                    self.activity_data = {int(k): v for k, v in data.items()}
-            except Exception as e:
-                print(f"Error loading activity data: {e}")
-                self.activity_data = {}
-        else:
-            self.activity_data = {}
+        self.afk_messages = {}  # user_id: (message, timestamp); source of truth, persisted by flush_afk
+        self.dirty_afk = set()  # user ids whose afk row must be upserted (still AFK) or deleted
+        self.afk_lock = asyncio.Lock()
+        # user_id -> 7x24 decaying message histogram; dirty users are persisted by flush_afk
+        self.activity = ActivityHistogramStore()
+        self.heatmap_cache = {}  # role id (0 = everyone) -> (expires_at, png, peaks, member count)
 
-    def save_activity_data(self):
-        """Save activity tracking data to JSON file."""
+    async def migrate_activity_json(self, db):
+        """One-time import of the old activity_tracking.json timestamps into histograms."""
+        if not os.path.exists(AFK_ACTIVITY_FILE):
+            return
         try:
-            with open(AFK_ACTIVITY_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.activity_data, f, indent=2)
+            with open(AFK_ACTIVITY_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for user_id, entries in data.items():
+                for entry in sorted(entries, key=lambda e: e.get("timestamp", "")):
+                    try:
+                        ts = datetime.datetime.fromisoformat(entry["timestamp"]).replace(tzinfo=datetime.timezone.utc)
+                    except Exception:
+                        continue
+                    self.activity.record(int(user_id), ts.timestamp())
+            await self.write_activity(db, self.activity.dirty_rows())
+            await db.commit()
+            os.replace(AFK_ACTIVITY_FILE, AFK_ACTIVITY_FILE + ".migrated")
+            print(f"Migrated activity data for {len(data)} users from {AFK_ACTIVITY_FILE}")
         except Exception as e:
-            print(f"Error saving activity data: {e}")
+            print(f"Error migrating activity data: {e}")
+
+    async def write_activity(self, db, rows):
+        if rows:
+            await db.executemany(
+                "INSERT OR REPLACE INTO activity_histograms (user_id, day, last_seen, buckets) VALUES (?, ?, ?, ?)",
+                rows
+            )
 
     def record_message_activity(self, user_id: int):
-        """Record when a user sends a message in the server."""
-        if user_id not in self.activity_data:
-            self.activity_data[user_id] = []
-        
-        now = datetime.datetime.utcnow()
-        timestamp = now.isoformat()
-        
-        # Throttle: don't record if last message was less than 1 hour ago
-        # This prevents spam while still capturing meaningful activity patterns
-        if self.activity_data[user_id]:
-            last_entry = self.activity_data[user_id][-1]
-            try:
-                last_time = datetime.datetime.fromisoformat(last_entry["timestamp"])
-                if (now - last_time).total_seconds() < 3600:  # Less than 1 hour
-                    return  # Too soon, skip
-            except Exception:
-                pass
-        
-        self.activity_data[user_id].append({
-            "timestamp": timestamp
-        })
-        
-        # Keep only last 30 days of data to prevent file from growing too large
-        cutoff = (now - datetime.timedelta(days=30)).isoformat()
-        self.activity_data[user_id] = [
-            entry for entry in self.activity_data[user_id]
-            if entry["timestamp"] >= cutoff
-        ]
-        
-        self.save_activity_data()
+        """Record when a user sends a message in the server (at most once per hour)."""
+        self.activity.record(user_id)
 
     def get_usually_active_time(self, user_id: int) -> Optional[str]:
-        """Calculate and return the usually active time frame for a user based on message activity."""
+        """Return the usually active time frame for a user based on message activity."""
         try:
-            user_id = int(user_id)
-            
-            if user_id not in self.activity_data or not self.activity_data[user_id]:
-                return None
-            
-            # Count message activity by hour (UTC)
-            hour_counts = defaultdict(int)
-            message_entries = self.activity_data[user_id]
-            
-            if len(message_entries) < 5:  # Need at least 5 message data points
-                return None
-            
-            for entry in message_entries:
-                try:
-                    timestamp_str = entry.get("timestamp")
-                    if not timestamp_str:
-                        continue
-                    dt = datetime.datetime.fromisoformat(timestamp_str)
-                    hour = dt.hour
-                    hour_counts[hour] += 1
-                except Exception:
-                    continue
-            
-            if not hour_counts:
-                return None
-            
-            # Find the most active hours
-            sorted_hours = sorted(hour_counts.items(), key=lambda x: x[1], reverse=True)
-            if not sorted_hours:
+            window = self.activity.active_window(int(user_id))
+            if window is None:
                 return None
-            
-            max_count = sorted_hours[0][1]
-            threshold = max(1, max_count * 0.5)
-            active_hours = [h for h, count in sorted_hours if count >= threshold]
-            
-            if not active_hours:
-                return None
-            
-            # Find the continuous range
-            active_hours.sort()
-            if len(active_hours) == 1:
-                start_hour = active_hours[0]
-                end_hour = active_hours[0]
-            else:
-                # Find the longest continuous range
-                start_hour = active_hours[0]
-                end_hour = active_hours[0]
-                current_start = active_hours[0]
-                current_end = active_hours[0]
-                
-                for i in range(1, len(active_hours)):
-                    if active_hours[i] == current_end + 1:
-                        current_end = active_hours[i]
-                    else:
-                        if current_end - current_start > end_hour - start_hour:
-                            start_hour = current_start
-                            end_hour = current_end
-                        current_start = active_hours[i]
-                        current_end = active_hours[i]
-                
-                if current_end - current_start > end_hour - start_hour:
-                    start_hour = current_start
-                    end_hour = current_end
-            
+            start_hour, end_hour = window
+
             # Format as Discord timestamps (short time format)
             now = datetime.datetime.utcnow()
-            
+
             def create_timestamp(hour):
                 """Create a Discord timestamp for today at the specified hour."""
-                dt = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+                dt = now.replace(hour=hour, minute=0, second=0, microsecond=0, tzinfo=datetime.timezone.utc)
                 timestamp = int(dt.timestamp())
                 return f"<t:{timestamp}:t>"
-            
+
             if start_hour == end_hour:
                 return create_timestamp(start_hour)
             else:
@@ -163,7 +116,7 @@ class AFK(commands.Cog):
     async def cog_load(self):
         os.makedirs("data", exist_ok=True)
         os.makedirs("logs", exist_ok=True)
-        async with aiosqlite.connect(AFK_DB_FILE) as db:
+        async with self.bot.db.connection(AFK_DB_FILE) as db:
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS afk (
                     user_id INTEGER PRIMARY KEY,
@@ -171,27 +124,66 @@ class AFK(commands.Cog):
                     timestamp TEXT
                 )
             """)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS activity_histograms (
+                    user_id INTEGER PRIMARY KEY,
+                    day INTEGER NOT NULL,
+                    last_seen INTEGER NOT NULL,
+                    buckets BLOB NOT NULL
+                )
+            """)
             await db.commit()
             async with db.execute("SELECT user_id, message, timestamp FROM afk") as cursor:
                 async for row in cursor:
                     self.afk_messages[row[0]] = (row[1], row[2])
+            async with db.execute("SELECT user_id, day, last_seen, buckets FROM activity_histograms") as cursor:
+                async for row in cursor:
+                    self.activity.load_row(*row)
+            await self.migrate_activity_json(db)
+        self.flush_afk.start()
+
+    async def cog_unload(self):
+        self.flush_afk.cancel()
+        await self.flush()
+
+    @tasks.loop(seconds=AFK_FLUSH_SECONDS)
+    async def flush_afk(self):
+        await self.flush()
+
+    async def flush(self):
+        """Persist buffered AFK set/remove changes and activity histograms in a single transaction."""
+        if not self.dirty_afk and not self.activity.dirty:
+            return
+        async with self.afk_lock:
+            user_ids = list(self.dirty_afk)
+            self.dirty_afk.clear()
+            upserts = [(uid, *self.afk_messages[uid]) for uid in user_ids if uid in self.afk_messages]
+            deletes = [(uid,) for uid in user_ids if uid not in self.afk_messages]
+            activity_rows = self.activity.dirty_rows()
+            try:
+                async with self.bot.db.connection(AFK_DB_FILE) as db:
+                    if upserts:
+                        await db.executemany(
+                            "INSERT OR REPLACE INTO afk (user_id, message, timestamp) VALUES (?, ?, ?)", upserts
+                        )
+                    if deletes:
+                        await db.executemany("DELETE FROM afk WHERE user_id = ?", deletes)
+                    await self.write_activity(db, activity_rows)
+                    await db.commit()
+            except Exception as e:
+                self.dirty_afk.update(user_ids)
+                self.activity.dirty.update(row[0] for row in activity_rows)
+                print(f"Failed to flush AFK state for {len(user_ids)} users: {e}")
 
     async def set_afk(self, user: discord.Member, message: str):
         timestamp = datetime.datetime.utcnow().isoformat()
         self.afk_messages[user.id] = (message, timestamp)
-        async with aiosqlite.connect(AFK_DB_FILE) as db:
-            await db.execute(
-                "INSERT OR REPLACE INTO afk (user_id, message, timestamp) VALUES (?, ?, ?)",
-                (user.id, message, timestamp)
-            )
-            await db.commit()
+        self.dirty_afk.add(user.id)
         await self.set_afk_nick(user)
 
     async def remove_afk(self, user: discord.Member):
         self.afk_messages.pop(user.id, None)
-        async with aiosqlite.connect(AFK_DB_FILE) as db:
-            await db.execute("DELETE FROM afk WHERE user_id = ?", (user.id,))
-            await db.commit()
+        self.dirty_afk.add(user.id)
         await self.remove_afk_nick(user)
 
     def log_afk_action(self, action: str, user: discord.User, moderator: discord.abc.User = None, reason: str = None):
@@ -337,6 +329,52 @@ class AFK(commands.Cog):
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    @app_commands.command(name="activity_heatmap", description="Show when members are usually active (UTC weekday x hour).")
+    @app_commands.describe(role="Only include members with this role (defaults to everyone)")
+    async def activity_heatmap_slash(self, interaction: discord.Interaction, role: Optional[discord.Role] = None):
+        """Heatmap of message activity across the server or a role, cached for an hour. Staff only."""
+        if not (interaction.user.guild_permissions.administrator
+                or any(r.id in AFK_ADMIN_ROLE_IDS for r in getattr(interaction.user, "roles", []))):
+            await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+            return
+        key = role.id if role else 0
+        cached = self.heatmap_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            _, png, peaks, members = cached
+        else:
+            await interaction.response.defer(thinking=True)
+            user_ids = [m.id for m in role.members] if role else None
+            packed, days = snapshot(self.activity, user_ids)
+            members = len(days)
+            title = f"Activity heatmap: {role.name if role else interaction.guild.name}"
+            try:
+                png, peaks = await asyncio.to_thread(render_activity_heatmap, packed, days, title)
+            except Exception as e:
+                print(f"Error rendering activity heatmap: {e}")
+                await interaction.followup.send("Failed to render the activity heatmap.", ephemeral=True)
+                return
+            self.heatmap_cache[key] = (time.monotonic() + HEATMAP_CACHE_SECONDS, png, peaks, members)
+
+        embed = discord.Embed(
+            title="📊 Activity Heatmap",
+            description=f"Based on {members} member{'s' if members != 1 else ''} with tracked activity"
+                        f"{f' in {role.mention}' if role else ''}.",
+            color=discord.Color.blurple()
+        )
+        if peaks:
+            embed.add_field(
+                name="Peak Times (UTC)",
+                value="\n".join(f"{WEEKDAY_NAMES[d]} {h:02d}:00" for d, h in peaks),
+                inline=False
+            )
+        embed.set_image(url="attachment://activity_heatmap.png")
+        embed.set_footer(text="Refreshed at most once per hour")
+        file = discord.File(io.BytesIO(png), filename="activity_heatmap.png")
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed, file=file)
+        else:
+            await interaction.response.send_message(embed=embed, file=file)
+
     # Removed on_presence_update listener - now tracking based on messages only
 
     @commands.Cog.listener()
@@ -348,25 +386,25 @@ class AFK(commands.Cog):
         if message.guild:
             self.record_message_activity(message.author.id)
 
-        # If someone is mentioned and is AFK, respond with their AFK message (no pings)
-        mentioned_ids = {user.id for user in message.mentions if not user.bot}
-        for user_id in mentioned_ids:
-            if user_id in self.afk_messages:
-                afk_text, timestamp = self.afk_messages[user_id]
-                embed = discord.Embed(
-                    title="💤 AFK Notice",
-                    description=f"**That user is currently AFK:**\n> {afk_text}",
-                    color=discord.Color.blurple()
-                )
-                try:
-                    usually_active = self.get_usually_active_time(user_id)
-                    if usually_active:
-                        embed.add_field(name="Usually Active", value=usually_active, inline=False)
-                except Exception as e:
-                    # Silently fail if there's an error calculating usually active time
-                    print(f"Error getting usually active time for user {user_id}: {e}")
-                embed.set_footer(text="They will see your message when they return.")
-                await message.channel.send(embed=embed)
+        # If someone is mentioned and is AFK, respond with their AFK message (no pings).
+        # raw_mentions is parsed from the content, so messages with no mentions cost nothing here.
+        afk_mentioned = self.afk_messages.keys() & message.raw_mentions if self.afk_messages else ()
+        for user_id in afk_mentioned:
+            afk_text, timestamp = self.afk_messages[user_id]
+            embed = discord.Embed(
+                title="💤 AFK Notice",
+                description=f"**That user is currently AFK:**\n> {afk_text}",
+                color=discord.Color.blurple()
+            )
+            try:
+                usually_active = self.get_usually_active_time(user_id)
+                if usually_active:
+                    embed.add_field(name="Usually Active", value=usually_active, inline=False)
+            except Exception as e:
+                # Silently fail if there's an error calculating usually active time
+                print(f"Error getting usually active time for user {user_id}: {e}")
+            embed.set_footer(text="They will see your message when they return.")
+            await message.channel.send(embed=embed)
 
         # If the author is AFK and sends a message, remove their AFK (but not if they're using the afk command)
         if message.author.id in self.afk_messages and not message.content.lower().startswith("!afk") and not message.content.lower().startswith("/afk"):
@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiosqlite
 import os
 import re
 import datetime
@@ -76,7 +75,7 @@ class DateModal(discord.ui.Modal, title="Enter Date"):
             return
 
         db_path = os.path.join(os.getcwd(), "data", "Archive.db")
-        async with aiosqlite.connect(db_path) as db:
+        async with self.bot.db.connection(db_path) as db:
             async with db.execute(
                 "SELECT Name, Message FROM Archive WHERE Date = ?", (date_value,)
             ) as cursor:
@@ -136,7 +135,7 @@ class LogMessage(commands.Cog):
         db_path = os.path.join(os.getcwd(), "data", "Archive.db")
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         try:
-            async with aiosqlite.connect(db_path) as db:
+            async with self.bot.db.connection(db_path) as db:
                 await db.execute(
                     "CREATE TABLE IF NOT EXISTS Archive (Date TEXT, Name TEXT, Message TEXT)"
                 )
@@ -154,7 +153,7 @@ class LogMessage(commands.Cog):
     @commands.command(name="viewallarchives")
     async def viewallarchives(self, ctx):
         db_path = os.path.join(os.getcwd(), "data", "Archive.db")
-        async with aiosqlite.connect(db_path) as db:
+        async with self.bot.db.connection(db_path) as db:
             async with db.execute(
                 "SELECT Date, Name FROM Archive ORDER BY Date DESC"
             ) as cursor:
@@ -180,7 +179,7 @@ class LogMessage(commands.Cog):
     @app_commands.command(name="archive-viewall", description="View all archive entries (date and name).")
     async def archive_viewall_slash(self, interaction: discord.Interaction):
         db_path = os.path.join(os.getcwd(), "data", "Archive.db")
-        async with aiosqlite.connect(db_path) as db:
+        async with self.bot.db.connection(db_path) as db:
             async with db.execute(
                 "SELECT Date, Name FROM Archive ORDER BY Date DESC"
             ) as cursor:
@@ -224,7 +223,7 @@ class LogMessage(commands.Cog):
         db_path = os.path.join(os.getcwd(), "data", "Archive.db")
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         try:
-            async with aiosqlite.connect(db_path) as db:
+            async with self.bot.db.connection(db_path) as db:
                 await db.execute(
                     "CREATE TABLE IF NOT EXISTS Archive (Date TEXT, Name TEXT, Message TEXT)"
                 )
@@ -13,42 +13,17 @@ AUTOMOD_LOG_FILE = os.path.join("logs", "automod_protection.log")
 LOG_CHANNEL_ID = 1329910577375482068
 BOT_IDS = [1403146651543015445, 1387175664649506847]
 
-INFRACTION_PATTERNS = [    r"\b[s$5z]+[\W_]*[h#]+[\W_]*[i1!|l]+[\W_]*[t7+]+[a-z0-9$#@!*+_-]*\b",
-    r"\b[n]+[\W_]*[i1!l|]+[\W_]*[gq9]+[\W_]*[gq9]+[\W_]*[ea4r3]*[a-z0-9]*\b",
-    r"\b[n][i|1|!][g|9]{2,}[e|3]r\b",
-    r"\b[n][!|1][g|9]{2,}[a|@]\b",
-    r"\b[fph@][\W_]*[u*o0v]+[\W_]*[c(kq)(ck)*x]+[\W_]*[kq]+(ing|er|ed|s|in'?|a)?\b",
-    r"\b[fF]+[uU*0]+[cC*k]+[kK]+(ing|er|ed|s)?\b",
-    r"\b[fFph@]+[\W_]*[uU*0]+[\W_]*[cCckkqx]+[\W_]*[kKqx]+(ing|er|ed|s)?\b",
-    r"\b(f+|ph)(y|i|u)?(c+|k+|q+)(y|k|n)?\b",
-    r"\b(f+|ph)([a*u*y*i]*)(c+|k+|q+|z+|w+|\*+)([u*c*k*q*z*w]*)(k+|c+|\*)(e+r+|i+n+g+|e+d+)?\b",
-    r"\b[s$5z]+[\W_]*[h#]+[\W_]*[i1!|l]+[\W_]*[t7+]+s*\b",]
-MUTE_PATTERNS = [    r"\b[s$5z]+[\W_]*[h#]+[\W_]*[i1!|l]+[\W_]*[t7+]+[a-z0-9$#@!*+_-]*\b",
-    r"\b[n]+[\W_]*[i1!l|]+[\W_]*[gq9]+[\W_]*[gq9]+[\W_]*[ea4r3]*[a-z0-9]*\b",
-    r"\b[n][i|1|!][g|9]{2,}[e|3]r\b",
-    r"\b[n][!|1][g|9]{2,}[a|@]\b",
-    r"\b[fph@][\W_]*[u*o0v]+[\W_]*[c(kq)(ck)*x]+[\W_]*[kq]+(ing|er|ed|s|in'?|a)?\b",
-    r"\b[fF]+[uU*0]+[cC*k]+[kK]+(ing|er|ed|s)?\b",
-    r"\b[fFph@]+[\W_]*[uU*0]+[\W_]*[cCckkqx]+[\W_]*[kKqx]+(ing|er|ed|s)?\b",
-    r"\b(f+|ph)(y|i|u)?(c+|k+|q+)(y|k|n)?\b",
-    r"\b(f+|ph)([a*u*y*i]*)(c+|k+|q+|z+|w+|\*+)([u*c*k*q*z*w]*)(k+|c+|\*)(e+r+|i+n+g+|e+d+)?\b",
-    r"\b[s$5z]+[\W_]*[h#]+[\W_]*[i1!|l]+[\W_]*[t7+]+s*\b",]
-QUARANTINE_PATTERNS = [
-]
-BAN_PATTERNS = [
-
-]
-
-COMPILED_INFRACTION = [re.compile(p, re.IGNORECASE) for p in INFRACTION_PATTERNS]
-COMPILED_MUTE = [re.compile(p, re.IGNORECASE) for p in MUTE_PATTERNS]
-COMPILED_QUARANTINE = [re.compile(p, re.IGNORECASE) for p in QUARANTINE_PATTERNS]
-COMPILED_BAN = [re.compile(p, re.IGNORECASE) for p in BAN_PATTERNS]
+from utils.automod_patterns import (
+    BLOCKED_WORDS_FILE,
+    find_matches,
+    load_blocked_words,
+)
+from utils.role_updates import apply_role_changes
 
 MUTE_DURATION_MINUTES = 60
 QUARANTINE_DURATION_SECONDS = 172800
 INFRACT_THRESHOLD = MUTE_THRESHOLD = QUARANTINE_THRESHOLD = BAN_THRESHOLD = 1
 MODERATION_TRACKING_FILE = os.path.join("data", "moderation_tracking.json")
-BLOCKED_WORDS_FILE = os.path.join("data", "blocked_words.json")
 PERSONNEL_ROLE_ID = 1329910329701830686
 ADMIN_ROLE_ID = 1355842403134603275
 automodbypass = [911072161349918720, 840949634071658507, 735167992966676530]
@@ -119,14 +94,7 @@ async def collect_context_proof(message: discord.Message, limit: int = 3) -> tup
 
 def is_blocked_word(word: str) -> bool:
     """Check if word is blocked."""
-    try:
-        if os.path.exists(BLOCKED_WORDS_FILE):
-            with open(BLOCKED_WORDS_FILE, "r", encoding="utf-8") as f:
-                blocked = json.load(f)
-                return word in blocked.get("blocked_words", [])
-    except Exception:
-        pass
-    return False
+    return word in load_blocked_words(BLOCKED_WORDS_FILE)
 
 
 async def update_tracking(user_id: int, event: Dict[str, Any]):
@@ -312,22 +280,11 @@ class Automod(commands.Cog):
                 STRIKE_1_ROLE_ID, STRIKE_2_ROLE_ID, STRIKE_3_ROLE_ID, SUSPENDED_ROLE_ID
             ]
         
-        # Apply role changes
-        for rid in roles_to_remove:
-            role = guild.get_role(rid)
-            if role and role in member.roles:
-                try:
-                    await member.remove_roles(role, reason="Infraction system discipline update")
-                except Exception as e:
-                    logger.error(f"Could not remove role {rid}: {e}")
-        
-        for rid in roles_to_add:
-            role = guild.get_role(rid)
-            if role and role not in member.roles:
-                try:
-                    await member.add_roles(role, reason="Infraction system discipline update")
-                except Exception as e:
-                    logger.error(f"Could not add role {rid}: {e}")
+        # Apply role changes in a single edit
+        try:
+            await apply_role_changes(member, add=roles_to_add, remove=roles_to_remove, reason="Infraction system discipline update")
+        except Exception as e:
+            logger.error(f"Could not update roles (add {roles_to_add}, remove {roles_to_remove}): {e}")
         
         return None
 
@@ -569,10 +526,11 @@ class Automod(commands.Cog):
             return
 
         # Check for matches
-        ban_matches = [m.group(0) for p in COMPILED_BAN for m in p.finditer(content) if m.group(0)]
-        quarantine_matches = [m.group(0) for p in COMPILED_QUARANTINE for m in p.finditer(content) if m.group(0)]
-        mute_matches = [m.group(0) for p in COMPILED_MUTE for m in p.finditer(content) if m.group(0)]
-        infraction_matches = [m.group(0) for p in COMPILED_INFRACTION for m in p.finditer(content) if m.group(0)]
+        matches = find_matches(content)
+        ban_matches = matches["ban"]
+        quarantine_matches = matches["quarantine"]
+        mute_matches = matches["mute"]
+        infraction_matches = matches["infraction"]
 
         all_matches = ban_matches + quarantine_matches + mute_matches + infraction_matches
 
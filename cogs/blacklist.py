@@ -2,10 +2,11 @@ import os
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiosqlite
 import datetime
 import uuid
 from typing import Optional
+from utils.fts_index import ensure_fts_index, ensure_keyed_table
+from utils.keyset_pages import KeysetPageView, fts_match_query, keyset_clause
 
 BLACKLIST_DB = "data/blacklist.db"
 BLACKLIST_LOG_FILE = "logs/blacklist_command.log"
@@ -14,6 +15,7 @@ BLACKLIST_VIEW_CHANNEL_ID = 1329910470332649536
 BLACKLIST_LOG_CHANNEL_ID = 1343686645815181382  # Use your logging channel ID here
 BLACKLIST_ROLE_ID = 1355842403134603275
 BLACKLISTED_ROLE_ID = 1329910361347854388
+LIST_PAGE_SIZE = 5
 
 EMOJI_MCNG = "<:MCNG:1409463907294384169>"
 EMOJI_MEMBER = "<:Member:1343945679390904330>"
@@ -38,16 +40,33 @@ def log_command_to_txt(command_name, user, channel, **fields):
             f.write(f"  {k}: {v}\n")
         f.write("\n")
 
+def add_blacklist_field(embed, row, show_user=False):
+    date, _, blacklist_id, user_name, reason, mcng_wide, ban, voided, void_reason = row
+    value = f"{EMOJI_MEMBER} **User:** {user_name}\n" if show_user else ""
+    value += (
+        f"{EMOJI_REASON} **Reason:** {reason}\n"
+        f"**Date:** {date}\n"
+        f"{EMOJI_ID} **ID:** `{blacklist_id}`\n"
+        f"{EMOJI_PERMISSION} **mcng-wide:** {'Yes' if mcng_wide else 'No'}\n"
+        f"{EMOJI_PERMISSION} **Banned:** {'Yes' if ban else 'No'}\n"
+    )
+    if voided:
+        value += f"**VOIDED**: {void_reason or 'No reason provided.'}\n"
+    embed.add_field(name="\u200b", value=value, inline=False)
+
 class Blacklist(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_path = BLACKLIST_DB
+        # User ids with at least one non-voided blacklist; on-join screening never touches the DB for a miss
+        self.active_ids = set()
 
     async def cog_load(self):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS blacklist (
-                    blacklist_id TEXT PRIMARY KEY,
+        async with self.bot.db.connection(self.db_path) as db:
+            # Explicit integer key for the search index and keyset cursors; older tables are rebuilt with it
+            await ensure_keyed_table(db, "blacklist", """
+                    id INTEGER PRIMARY KEY,
+                    blacklist_id TEXT NOT NULL UNIQUE,
                     user_id INTEGER,
                     user_name TEXT,
                     moderator_id INTEGER,
@@ -60,20 +79,116 @@ class Blacklist(commands.Cog):
                     ban INTEGER DEFAULT 0,
                     voided INTEGER DEFAULT 0,
                     void_reason TEXT
-                )
             """)
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_blacklist_user_date ON blacklist(user_id, date)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_blacklist_voided_date ON blacklist(voided, date)")
+            # External-content search index over reason/proof, kept in step by triggers
+            await ensure_fts_index(db, "blacklist", ["reason", "proof"])
             await db.commit()
+            cursor = await db.execute("SELECT DISTINCT user_id FROM blacklist WHERE voided = 0 AND user_id IS NOT NULL")
+            self.active_ids = {row[0] for row in await cursor.fetchall()}
+
+    async def fetch_blacklists(self, cursor, limit, user_id=None, match=None):
+        """One keyset page of blacklists, newest first. Rows start with (date, id)."""
+        after, params = keyset_clause(cursor, "b")
+        where = []
+        args = []
+        if match:
+            where.append("blacklist_fts MATCH ?")
+            args.append(match)
+        if user_id is not None:
+            where.append("b.user_id = ?")
+            args.append(user_id)
+        source = "blacklist_fts f JOIN blacklist b ON b.id = f.rowid" if match else "blacklist b"
+        async with self.bot.db.connection(self.db_path) as db:
+            result = await db.execute(
+                f"SELECT b.date, b.id, b.blacklist_id, b.user_name, b.reason, b.mcng_wide, b.ban, b.voided, b.void_reason "
+                f"FROM {source} WHERE {' AND '.join(where) or '1'}{after} ORDER BY b.date DESC, b.id DESC LIMIT ?",
+                (*args, *params, limit)
+            )
+            return await result.fetchall()
 
-    async def add_blacklist(self, blacklist_id, user, issued_by, reason, proof, message_id=None, mcng_wide=False, ban=False):
+    async def add_blacklist(self, blacklist_id, user, issued_by, reason, proof, message_id=None, mcng_wide=False, ban=False, user_name=None):
         now = datetime.datetime.utcnow().isoformat()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.bot.db.connection(self.db_path) as db:
             await db.execute("""
                 INSERT INTO blacklist (
                     blacklist_id, user_id, user_name, moderator_id, moderator_name,
                     reason, proof, date, message_id, mcng_wide, ban, voided, void_reason
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, NULL)
-            """, (blacklist_id, user.id, str(user), issued_by.id, str(issued_by), reason, proof, now, message_id, int(mcng_wide), int(ban)))
+            """, (blacklist_id, user.id, user_name or str(user), issued_by.id, str(issued_by), reason, proof, now, message_id, int(mcng_wide), int(ban)))
             await db.commit()
+        self.active_ids.add(user.id)
+
+    async def refresh_active(self, user_id):
+        """Re-check one user after a void; they stay flagged while any other blacklist is active."""
+        async with self.bot.db.connection(self.db_path) as db:
+            cursor = await db.execute(
+                "SELECT 1 FROM blacklist WHERE user_id = ? AND voided = 0 LIMIT 1",
+                (user_id,)
+            )
+            active = await cursor.fetchone() is not None
+        if active:
+            self.active_ids.add(user_id)
+        else:
+            self.active_ids.discard(user_id)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        # O(1) set lookup; the database is only read for actual blacklisted joins
+        if member.id not in self.active_ids:
+            return
+        try:
+            async with self.bot.db.connection(self.db_path) as db:
+                cursor = await db.execute(
+                    "SELECT blacklist_id, reason, ban FROM blacklist WHERE user_id = ? AND voided = 0 ORDER BY date DESC",
+                    (member.id,)
+                )
+                rows = await cursor.fetchall()
+        except Exception as e:
+            print(f"Error checking blacklist for {member.id}: {e}")
+            return
+        if not rows:
+            self.active_ids.discard(member.id)
+            return
+        blacklist_id, reason, _ = rows[0]
+        ban = any(row[2] for row in rows)
+
+        action = "Flagged"
+        if ban:
+            try:
+                await member.send(f"You are blacklisted from **{member.guild.name}** and have been banned.")
+            except Exception:
+                pass
+            try:
+                await member.ban(reason=f"Blacklisted: {reason}")
+                action = "Banned"
+            except Exception as e:
+                print(f"Failed to ban blacklisted user {member.id}: {e}")
+        if action != "Banned":
+            try:
+                role = member.guild.get_role(BLACKLISTED_ROLE_ID)
+                if role and role not in member.roles:
+                    await member.add_roles(role, reason="MCNG Blacklisted (rejoined)")
+            except Exception as e:
+                print(f"Failed to flag blacklisted user {member.id}: {e}")
+
+        log_channel = member.guild.get_channel(BLACKLIST_LOG_CHANNEL_ID)
+        if log_channel:
+            log_embed = discord.Embed(
+                title=f"Blacklisted User Joined ({action})",
+                color=discord.Color.dark_red(),
+                timestamp=datetime.datetime.utcnow()
+            )
+            log_embed.add_field(name="User", value=f"{member} ({member.id})", inline=False)
+            log_embed.add_field(name="Reason", value=reason, inline=False)
+            log_embed.add_field(name="Blacklist ID", value=blacklist_id, inline=False)
+            log_embed.add_field(name="Active Blacklists", value=str(len(rows)), inline=True)
+            log_embed.set_footer(text=f"Logged at {datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}")
+            try:
+                await log_channel.send(embed=log_embed)
+            except Exception:
+                pass
 
     
 
@@ -204,7 +319,7 @@ class Blacklist(commands.Cog):
                 await interaction.response.send_message("You do not have permission to void blacklists.", ephemeral=True)
                 return
 
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.bot.db.connection(self.db_path) as db:
                 cursor = await db.execute(
                     "SELECT user_id, user_name, moderator_id, moderator_name, reason, proof, date, message_id, mcng_wide, ban, voided FROM blacklist WHERE blacklist_id = ?",
                     (blacklist_id,)
@@ -224,6 +339,7 @@ class Blacklist(commands.Cog):
                     (reason, blacklist_id)
                 )
                 await db.commit()
+            await self.refresh_active(user_id)
 
             try:
                 member = interaction.guild.get_member(user_id)
@@ -299,7 +415,7 @@ class Blacklist(commands.Cog):
     @app_commands.command(name="blacklist-view", description="View all details of a specific blacklist by its ID.")
     @app_commands.describe(blacklist_id="The blacklist ID to view")
     async def blacklist_view(self, interaction: discord.Interaction, blacklist_id: str):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.bot.db.connection(self.db_path) as db:
             cursor = await db.execute(
                 "SELECT blacklist_id, user_id, user_name, moderator_id, moderator_name, reason, proof, date, mcng_wide, ban, voided, void_reason FROM blacklist WHERE blacklist_id = ?",
                 (blacklist_id,)
@@ -318,43 +434,64 @@ class Blacklist(commands.Cog):
     @app_commands.command(name="blacklist-list", description="List all blacklists for a user, paginated.")
     @app_commands.describe(user="The user to list blacklists for", page="Page number (default 1)")
     async def blacklist_list(self, interaction: discord.Interaction, user: discord.Member, page: Optional[int] = 1):
-        PAGE_SIZE = 5
-        offset = (page - 1) * PAGE_SIZE
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                "SELECT blacklist_id, reason, date, mcng_wide, ban, voided, void_reason FROM blacklist WHERE user_id = ? ORDER BY date DESC LIMIT ? OFFSET ?",
-                (user.id, PAGE_SIZE, offset)
-            )
-            rows = await cursor.fetchall()
+        async with self.bot.db.connection(self.db_path) as db:
             count_cursor = await db.execute(
                 "SELECT COUNT(*) FROM blacklist WHERE user_id = ?",
                 (user.id,)
             )
             total = (await count_cursor.fetchone())[0]
+        total_pages = max(1, (total + LIST_PAGE_SIZE - 1) // LIST_PAGE_SIZE)
+        now_utc = datetime.datetime.utcnow().strftime("UTC %Y-%m-%d %H:%M:%S")
 
-        if not rows:
-            await interaction.response.send_message("No blacklists found for this user on this page.", ephemeral=True)
+        async def fetch(cursor, limit):
+            return await self.fetch_blacklists(cursor, limit, user_id=user.id)
+
+        def render(rows, page):
+            embed = discord.Embed(
+                title=f"{EMOJI_MCNG} // Blacklists for {user} (Page {page}/{total_pages})",
+                color=discord.Color.dark_red()
+            )
+            for row in rows:
+                add_blacklist_field(embed, row)
+            embed.set_footer(text=f"Generated: {now_utc}")
+            return embed
+
+        view = KeysetPageView(fetch, render, page_size=LIST_PAGE_SIZE)
+        embed = await view.start(page or 1)
+        if embed is None:
+            await interaction.response.send_message("No blacklists found for this user.", ephemeral=True)
             return
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
-        embed = discord.Embed(
-            title=f"{EMOJI_MCNG} // Blacklists for {user} (Page {page}/{(total + PAGE_SIZE - 1)//PAGE_SIZE})",
-            color=discord.Color.dark_red()
-        )
-        for row in rows:
-            blacklist_id, reason, date, mcng_wide, ban, voided, void_reason = row
-            value = (
-                f"{EMOJI_REASON} **Reason:** {reason}\n"
-                f"**Date:** {date}\n"
-                f"{EMOJI_ID} **ID:** `{blacklist_id}`\n"
-                f"{EMOJI_PERMISSION} **mcng-wide:** {'Yes' if mcng_wide else 'No'}\n"
-                f"{EMOJI_PERMISSION} **Banned:** {'Yes' if ban else 'No'}\n"
+    @app_commands.command(name="blacklist-search", description="Search blacklist reasons and proof by keyword.")
+    @app_commands.describe(query="Keywords to search for")
+    async def blacklist_search(self, interaction: discord.Interaction, query: str):
+        if not any(r.id == BLACKLIST_ROLE_ID for r in getattr(interaction.user, "roles", [])):
+            await interaction.response.send_message("You do not have permission to search blacklists.", ephemeral=True)
+            return
+        match = fts_match_query(query)
+        if not match:
+            await interaction.response.send_message("Please enter at least one keyword.", ephemeral=True)
+            return
+
+        async def fetch(cursor, limit):
+            return await self.fetch_blacklists(cursor, limit, match=match)
+
+        def render(rows, page):
+            embed = discord.Embed(
+                title=f"{EMOJI_MCNG} // Blacklist Search: {query} (Page {page})",
+                color=discord.Color.dark_red()
             )
-            if voided:
-                value += f"**VOIDED**: {void_reason or 'No reason provided.'}\n"
-            embed.add_field(name="\u200b", value=value, inline=False)
-        now_utc = datetime.datetime.utcnow().strftime("UTC %Y-%m-%d %H:%M:%S")
-        embed.set_footer(text=f"Generated: {now_utc}")
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+            for row in rows:
+                add_blacklist_field(embed, row, show_user=True)
+            return embed
+
+        view = KeysetPageView(fetch, render, page_size=LIST_PAGE_SIZE)
+        embed = await view.start()
+        if embed is None:
+            await interaction.response.send_message("No blacklists matched your search.", ephemeral=True)
+            return
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
     @app_commands.command(name="blacklist-by-id", description="Blacklist a user from MCNG by user ID (useful if they're not in the server).")
     @app_commands.describe(
@@ -457,7 +594,8 @@ class Blacklist(commands.Cog):
             pass
 
         await self.add_blacklist(
-            blacklist_id, user_display, interaction.user, reason, proof_url, msg.id, mcng_wide, ban
+            blacklist_id, user_obj or discord.Object(id=int(user_id)), interaction.user, reason, proof_url, msg.id, mcng_wide, ban,
+            user_name=user_display
         )
 
         log_to_file(
@@ -520,9 +658,9 @@ class Blacklist(commands.Cog):
     async def blacklist_info_command(self, interaction: discord.Interaction):
         try:
             user_id = interaction.user.id
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.bot.db.connection(self.db_path) as db:
                 cursor = await db.execute(
-                    "SELECT blacklist_id, reason, date, mcng_wide, ban, voided, void_reason FROM blacklist WHERE user_id = ? ORDER BY date DESC",
+                    "SELECT blacklist_id, reason, date, mcng_wide, ban, voided, void_reason FROM blacklist WHERE user_id = ? ORDER BY date DESC, id DESC",
                     (user_id,)
                 )
                 rows = await cursor.fetchall()
@@ -3,7 +3,9 @@ from discord.ext import commands
 from discord import app_commands
 import os
 import re
+import time
 import asyncio
+from utils.worker_pool import run_rate_limited
 
 CALLSIGN_FILE = os.path.join(os.path.dirname(__file__), "../data/callsigns.txt")
 ADMIN_ID = 840949634071658507
@@ -20,6 +22,9 @@ ROLE_CALLSIGN_MAP = {
     1329910298525696041: ("E", "J"),
 }
 PROMOTION_CHANNEL_ID = 1329910502205427806
+PROMOTION_EDIT_CONCURRENCY = 4
+PROMOTION_EDITS_PER_SECOND = 5
+MEMBER_QUERY_LIMIT = 100  # Discord's cap on user ids per query_members request
 
 EMBED_COLOUR = 0xd0b47b
 EMBED1_IMAGE = "https://cdn.discordapp.com/attachments/1465844086480310342/1465854159294169212/CALLSIGNS.png?ex=697a9e91&is=69794d11&hm=ef03cfaf17bb670a8219dae6b01b0c79fd8177441a238f07e77c326c418521a4&"
@@ -33,53 +38,148 @@ ALLOWED_CHANNELS = [1329910474581479495, 1329910518659551272]
 LOGS_DIR = os.path.join(os.path.dirname(__file__), "../logs")
 LOG_FILE = os.path.join(LOGS_DIR, "callsign_commands.txt")
 
-def ensure_callsign_file():
-    os.makedirs(os.path.dirname(CALLSIGN_FILE), exist_ok=True)
-    if not os.path.exists(CALLSIGN_FILE):
-        with open(CALLSIGN_FILE, "w", encoding="utf-8") as f:
+def ensure_callsign_file(path=CALLSIGN_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
             f.write("")
 
-def load_callsigns():
-    ensure_callsign_file()
-    callsigns = {}
-    with open(CALLSIGN_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or "|" not in line:
-                continue
-            user_id, callsign = line.split("|", 1)
-            callsigns[int(user_id)] = callsign
-    return callsigns
-
-def save_callsigns(callsigns):
-    ensure_callsign_file()
-    with open(CALLSIGN_FILE, "w", encoding="utf-8") as f:
-        for user_id, callsign in callsigns.items():
-            f.write(f"{user_id}|{callsign}\n")
+CALLSIGN_RE = re.compile(r"(CO|WO|E)-(G|S|J|W|N)(\d{2})")
+FIRST_ORDER = {"CO": 0, "WO": 1, "E": 2}
+SECOND_ORDER = {
+    "CO": {"G": 0, "S": 1, "J": 2},
+    "WO": {"W": 0},
+    "E": {"S": 0, "N": 1, "J": 2}
+}
+NUMBER_MASK = ((1 << 100) - 1) & ~1  # callsign numbers 01-99
 
 def is_valid_callsign(callsign):
     return bool(re.fullmatch(r"(CO|WO|E)-(G|S|J|W|N)[0-9]{2}", callsign))
 
-def callsign_sort_key(item):
-    cs = item[1]
-    first_order = {"CO": 0, "WO": 1, "E": 2}
-    second_order = {
-        "CO": {"G": 0, "S": 1, "J": 2},
-        "WO": {"W": 0},
-        "E": {"S": 0, "N": 1, "J": 2}
-    }
-    m = re.fullmatch(r"(CO|WO|E)-(G|S|J|W|N)(\d{2})", cs)
-    if m:
-        first = m.group(1)
-        second = m.group(2)
-        num = int(m.group(3))
+def parse_callsign(callsign):
+    m = CALLSIGN_RE.fullmatch(callsign)
+    if not m:
+        return None
+    return (m.group(1), m.group(2), m.group(3))
+
+def callsign_sort_key(parsed):
+    if parsed:
+        first, second, num = parsed
         return (
-            first_order.get(first, 99),
-            second_order.get(first, {}).get(second, 99),
-            num
+            FIRST_ORDER.get(first, 99),
+            SECOND_ORDER.get(first, {}).get(second, 99),
+            int(num)
         )
     return (99, 99, 999)
 
+def _lowest_free(bits):
+    free = ~bits & NUMBER_MASK
+    if not free:
+        return None
+    return f"{(free & -free).bit_length() - 1:02d}"
+
+class CallsignRegistry:
+    """All callsigns, parsed once and held in memory.
+
+    Keeps user -> callsign and callsign -> user maps, the parsed parts and sort
+    key of every callsign, and a bitmap of used numbers per prefix (plus one
+    across all prefixes) so the lowest free number is a couple of bit operations.
+    Mutations only touch memory; `save()` writes the file atomically.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.by_user = {}
+        self.by_callsign = {}
+        self._parsed = {}  # user_id -> (first, second, "NN") or None
+        self._counts = {}  # (first, second) -> [users per number]; None for the all-prefix count
+        self._bits = {}  # same keys -> bitmap of numbers in use
+        self._sorted = None
+        self.load()
+
+    def load(self):
+        ensure_callsign_file(self.path)
+        self.by_user.clear()
+        self.by_callsign.clear()
+        self._parsed.clear()
+        self._counts.clear()
+        self._bits.clear()
+        self._sorted = None
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or "|" not in line:
+                    continue
+                user_id, callsign = line.split("|", 1)
+                self.set(int(user_id), callsign)
+
+    def _count(self, key, num, delta):
+        counts = self._counts.setdefault(key, [0] * 100)
+        counts[num] += delta
+        if counts[num] > 0:
+            self._bits[key] = self._bits.get(key, 0) | (1 << num)
+        else:
+            self._bits[key] = self._bits.get(key, 0) & ~(1 << num)
+
+    def _track(self, parsed, delta):
+        if parsed:
+            first, second, num = parsed
+            self._count((first, second), int(num), delta)
+            self._count(None, int(num), delta)
+
+    def get(self, user_id, default=None):
+        return self.by_user.get(user_id, default)
+
+    def parsed(self, user_id):
+        return self._parsed.get(user_id)
+
+    def owner(self, callsign):
+        return self.by_callsign.get(callsign)
+
+    def is_taken(self, callsign):
+        return callsign in self.by_callsign
+
+    def set(self, user_id, callsign):
+        self.remove(user_id)
+        parsed = parse_callsign(callsign)
+        self.by_user[user_id] = callsign
+        self.by_callsign[callsign] = user_id
+        self._parsed[user_id] = parsed
+        self._track(parsed, 1)
+        self._sorted = None
+
+    def remove(self, user_id):
+        callsign = self.by_user.pop(user_id, None)
+        if callsign is None:
+            return None
+        if self.by_callsign.get(callsign) == user_id:
+            del self.by_callsign[callsign]
+        self._track(self._parsed.pop(user_id, None), -1)
+        self._sorted = None
+        return callsign
+
+    def allocate(self, first=None, second=None):
+        """Lowest free number for a prefix, or across every prefix when none is given."""
+        key = (first, second) if first else None
+        return _lowest_free(self._bits.get(key, 0))
+
+    def sorted_items(self):
+        """(user_id, callsign) pairs in rank order; cached until the next mutation."""
+        if self._sorted is None:
+            self._sorted = sorted(self.by_user.items(), key=lambda item: callsign_sort_key(self._parsed[item[0]]))
+        return self._sorted
+
+    def _write(self, payload):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+    async def save(self):
+        # Snapshot on the loop, write temp file + rename in a thread
+        payload = "".join(f"{user_id}|{callsign}\n" for user_id, callsign in self.by_user.items())
+        await asyncio.to_thread(self._write, payload)
+
 def log_command(user, command, detail=""):
     os.makedirs(LOGS_DIR, exist_ok=True)
     with open(LOG_FILE, "a", encoding="utf-8") as f:
@@ -109,10 +209,37 @@ def callsign_group_title(first, second):
     else:
         return "**__General Officers__**"
 
+def format_all_callsigns(registry):
+    callsigns = registry.sorted_items()
+    if not callsigns:
+        return "No callsigns assigned."
+    lines = []
+    last_first = None
+    last_second = None
+    for uid, cs in callsigns:
+        first, second, _ = registry.parsed(uid) or ("CO", "G", None)
+        if first != last_first:
+            if last_first is not None:
+                lines.append("")
+            if first == "CO":
+                lines.append("=== Commissioned Officers ===")
+            elif first == "WO":
+                lines.append("=== Warrant Officers ===")
+            elif first == "E":
+                lines.append("=== Enlisted Personnel ===")
+            last_first = first
+            last_second = None
+        if second != last_second:
+            lines.append(callsign_group_title(first, second))
+            last_second = second
+        lines.append(f"<@{uid}>: **{cs}**")
+    return "\n".join(lines) + "\n"
+
 class CallsignCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.callsign_lock = asyncio.Lock()
+        self.registry = CallsignRegistry(CALLSIGN_FILE)
         # pending promotions: guild_id -> set(user_id)
         self._promotion_pending = {}
         self._promotion_task = None
@@ -132,7 +259,6 @@ class CallsignCog(commands.Cog):
 
     async def handle_callsign(self, ctx_or_interaction, user: discord.Member = None):
         author = ctx_or_interaction.user if isinstance(ctx_or_interaction, discord.Interaction) else ctx_or_interaction.author
-        callsigns = load_callsigns()
         is_admin = author.id == ADMIN_ID or any(r.id == 1355842403134603275 for r in getattr(author, "roles", []))
         admin_menu_roles = {1355842403134603275, 1329910280834252903, 1394667511374680105}
         has_admin_menu = is_admin or any(r.id in admin_menu_roles for r in getattr(author, "roles", []))
@@ -141,7 +267,7 @@ class CallsignCog(commands.Cog):
         if user:
             embed = discord.Embed(
                 title="Callsign Lookup",
-                description=f"{user.mention}'s callsign: **{callsigns.get(user.id, 'None')}**",
+                description=f"{user.mention}'s callsign: **{self.registry.get(user.id, 'None')}**",
                 color=EMBED_COLOUR
             )
             embed.set_image(url=EMBED1_IMAGE)
@@ -177,13 +303,13 @@ class CallsignCog(commands.Cog):
             await ctx_or_interaction.send(embed=embed, ephemeral=True)
 
     async def add_callsign(self, user: discord.Member, callsign: str):
-        callsigns = load_callsigns()
         if not is_valid_callsign(callsign):
             return False, "Invalid callsign format."
-        if callsign in callsigns.values():
-            return False, "This callsign is already taken."
-        callsigns[user.id] = callsign
-        save_callsigns(callsigns)
+        async with self.callsign_lock:
+            if self.registry.is_taken(callsign):
+                return False, "This callsign is already taken."
+            self.registry.set(user.id, callsign)
+            await self.registry.save()
         try:
             await user.send(f"You have been assigned the callsign: **{callsign}**.")
         except Exception:
@@ -191,12 +317,11 @@ class CallsignCog(commands.Cog):
         return True, f"Callsign {callsign} assigned to {user.mention}."
 
     async def remove_callsign(self, user: discord.Member):
-        callsigns = load_callsigns()
-        if user.id not in callsigns:
-            return False, "User does not have a callsign."
-        removed = callsigns[user.id]
-        del callsigns[user.id]
-        save_callsigns(callsigns)
+        async with self.callsign_lock:
+            removed = self.registry.remove(user.id)
+            if removed is None:
+                return False, "User does not have a callsign."
+            await self.registry.save()
         try:
             await user.send(f"Your callsign **{removed}** has been removed.")
         except Exception:
@@ -204,17 +329,13 @@ class CallsignCog(commands.Cog):
         return True, f"Callsign removed from {user.mention}."
 
     async def view_callsign(self, user: discord.Member):
-        callsigns = load_callsigns()
-        return callsigns.get(user.id, "None")
+        return self.registry.get(user.id, "None")
 
     async def view_all_callsigns(self):
-        callsigns = load_callsigns()
-        sorted_items = sorted(callsigns.items(), key=callsign_sort_key)
-        return sorted_items
+        return self.registry.sorted_items()
 
     async def request_callsign(self, user: discord.Member):
         async with self.callsign_lock:
-            callsigns = load_callsigns()
             if user.id != ADMIN_ID and not any(r.id == REQUEST_ROLE for r in getattr(user, "roles", [])):
                 return False, "You do not have permission to request a callsign."
             eligible = None
@@ -225,21 +346,15 @@ class CallsignCog(commands.Cog):
             if not eligible:
                 return False, "You do not have a role eligible for a callsign or all are taken."
             x, y = eligible
-            used = set()
-            for cs in callsigns.values():
-                m = re.search(r"(\d{2})$", cs)
-                if m:
-                    used.add(m.group(1))
-            for zz in range(1, 100):
-                zz_str = f"{zz:02d}"
-                if zz_str in used:
-                    continue
+            # Numbers are unique across every prefix for requested callsigns
+            zz_str = self.registry.allocate()
+            if zz_str is not None:
                 new_callsign = f"{x}-{y}{zz_str}"
-                current_callsign = callsigns.get(user.id)
+                current_callsign = self.registry.get(user.id)
                 if current_callsign == new_callsign:
                     return False, f"Your callsign is already up to date: **{current_callsign}**"
-                callsigns[user.id] = new_callsign
-                save_callsigns(callsigns)
+                self.registry.set(user.id, new_callsign)
+                await self.registry.save()
                 # Always remove the role when callsign is requested
                 role = user.guild.get_role(1371198982340083712)
                 if role:
@@ -268,10 +383,7 @@ class CallsignCog(commands.Cog):
             return False, "No available callsign numbers left."
 
     def _parse_callsign(self, callsign: str):
-        m = re.fullmatch(r"(CO|WO|E)-(G|S|J|W|N)(\d{2})", callsign)
-        if not m:
-            return None
-        return (m.group(1), m.group(2), m.group(3))
+        return parse_callsign(callsign)
 
     def _find_prefix_for_member(self, member: discord.Member):
         # Find a ROLE_CALLSIGN_MAP entry matching any of the member's roles
@@ -280,70 +392,64 @@ class CallsignCog(commands.Cog):
                 return (first, second)
         return None
 
-    def _allocate_number_for_prefix(self, first: str, second: str, callsigns: dict):
-        # Find lowest available two-digit number for given prefix
-        used = set()
-        for cs in callsigns.values():
-            m = re.fullmatch(rf"{first}-{second}(\d{{2}})", cs)
-            if m:
-                used.add(m.group(1))
-        for i in range(1, 100):
-            s = f"{i:02d}"
-            if s not in used:
-                return s
-        return None
+    def _allocate_number_for_prefix(self, first: str, second: str):
+        # Lowest available two-digit number for the given prefix
+        return self.registry.allocate(first, second)
 
-    async def _auto_promote_if_needed(self, member: discord.Member):
-        callsigns = load_callsigns()
-        current = callsigns.get(member.id)
+    def _plan_promotion(self, member: discord.Member):
+        """Work out and record a member's promoted callsign in the registry (not saved).
+
+        Returns (promoted, info, previous callsign); info is the new callsign or the reason for no change.
+        """
+        current = self.registry.get(member.id)
         if not current:
-            return False, "no_callsign"
-        parsed = self._parse_callsign(current)
+            return False, "no_callsign", current
+        parsed = self.registry.parsed(member.id)
         if not parsed:
-            return False, "invalid_callsign"
+            return False, "invalid_callsign", current
         cur_first, cur_second, cur_num = parsed
 
         target = self._find_prefix_for_member(member)
         if not target:
-            return False, "no_target_role"
+            return False, "no_target_role", current
         target_first, target_second = target
 
         if (cur_first, cur_second) == (target_first, target_second):
-            return False, "no_change"
+            return False, "no_change", current
 
-        new_num = cur_num or self._allocate_number_for_prefix(target_first, target_second, callsigns)
+        new_num = cur_num or self._allocate_number_for_prefix(target_first, target_second)
         if not new_num:
-            return False, "no_number"
+            return False, "no_number", current
         new_callsign = f"{target_first}-{target_second}{new_num}"
 
-        if new_callsign in callsigns.values():
+        if self.registry.is_taken(new_callsign):
             # If collision, allocate a different number
-            alt = self._allocate_number_for_prefix(target_first, target_second, callsigns)
+            alt = self._allocate_number_for_prefix(target_first, target_second)
             if not alt:
-                return False, "no_number"
+                return False, "no_number", current
             new_callsign = f"{target_first}-{target_second}{alt}"
 
-        callsigns[member.id] = new_callsign
-        save_callsigns(callsigns)
-
+        self.registry.set(member.id, new_callsign)
+        return True, new_callsign, current
+
+    async def _apply_promotion(self, member: discord.Member, current: str, new_callsign: str):
+        """Update the nickname and DM the member. Returns False if the nickname could not be changed."""
+        nick_ok = True
+        display = member.display_name
+        # Pattern for existing callsign occurrences
+        display_new = re.sub(r"(\[?)(CO|WO|E)-(G|S|J|W|N)(\d{2})(\]?)", new_callsign, display)
+        if display_new == display:
+            # Prepend if not found
+            display_new = f"{new_callsign} {display}"
+        # Truncate to Discord nickname limit (32)
+        if len(display_new) > 32:
+            display_new = display_new[:32]
         try:
-            display = member.display_name
-            # Pattern for existing callsign occurrences
-            display_new = re.sub(r"(\[?)(CO|WO|E)-(G|S|J|W|N)(\d{2})(\]?)", new_callsign, display)
-            if display_new == display:
-                # Prepend if not found
-                display_new = f"{new_callsign} {display}"
-            # Truncate to Discord nickname limit (32)
-            if len(display_new) > 32:
-                display_new = display_new[:32]
-            try:
-                if member.nick != display_new:
-                    await member.edit(nick=display_new, reason="Callsign auto-updated due to promotion")
-            except Exception:
-                # Lack of permission or hierarchy; ignore but proceed
-                pass
+            if member.nick != display_new:
+                await member.edit(nick=display_new, reason="Callsign auto-updated due to promotion")
         except Exception:
-            pass
+            # Lack of permission or hierarchy; ignore but proceed
+            nick_ok = False
 
         # Notify the user via DM
         try:
@@ -352,7 +458,67 @@ class CallsignCog(commands.Cog):
             pass
 
         log_command(member, "auto_promote_callsign", f"{current} -> {new_callsign}")
-        return True, new_callsign
+        return nick_ok
+
+    async def _auto_promote_if_needed(self, member: discord.Member):
+        async with self.callsign_lock:
+            promoted, info, current = self._plan_promotion(member)
+            if not promoted:
+                return False, info
+            await self.registry.save()
+        await self._apply_promotion(member, current, info)
+        return True, info
+
+    async def promote_batch(self, members):
+        """Promote a wave of members: plan every callsign in memory, save once, then fan out the edits.
+
+        Returns (updates, nickname failures, members skipped) where updates is [(member, old, new)].
+        """
+        updates = []
+        skipped = 0
+        async with self.callsign_lock:
+            for member in members:
+                promoted, info, current = self._plan_promotion(member)
+                if promoted:
+                    updates.append((member, current, info))
+                else:
+                    skipped += 1
+            if updates:
+                await self.registry.save()
+
+        results = await run_rate_limited(
+            updates,
+            lambda update: self._apply_promotion(*update),
+            concurrency=PROMOTION_EDIT_CONCURRENCY,
+            per_second=PROMOTION_EDITS_PER_SECOND
+        )
+        nick_failures = sum(1 for _, ok in results if ok is not True)
+        return updates, nick_failures, skipped
+
+    async def _resolve_members(self, guild: discord.Guild, user_ids):
+        """Members from the cache in one pass; stragglers are fetched with gateway queries of up to 100 ids.
+
+        Returns (members, ids that could not be resolved).
+        """
+        members = []
+        missing = []
+        for uid in user_ids:
+            member = guild.get_member(uid)
+            if member:
+                members.append(member)
+            else:
+                missing.append(uid)
+        for i in range(0, len(missing), MEMBER_QUERY_LIMIT):
+            chunk = missing[i:i + MEMBER_QUERY_LIMIT]
+            try:
+                members.extend(await guild.query_members(user_ids=chunk, cache=True))
+            except Exception as e:
+                print(f"⚠️ Could not look up {len(chunk)} members for callsign promotion: {e}")
+        resolved = {m.id for m in members}
+        unresolved = [uid for uid in missing if uid not in resolved]
+        if unresolved:
+            print(f"⚠️ Callsign promotion skipped unresolved members: {', '.join(map(str, unresolved))}")
+        return members, unresolved
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -390,34 +556,33 @@ class CallsignCog(commands.Cog):
                 guild = self.bot.get_guild(guild_id)
                 if not guild:
                     continue
-                updates = []
-                # Process sequentially with small delay to avoid rate limits
-                for uid in list(user_ids):
-                    try:
-                        member = guild.get_member(uid) or await guild.fetch_member(uid)
-                    except Exception:
-                        continue
-                    try:
-                        promoted, info = await self._auto_promote_if_needed(member)
-                        if promoted:
-                            updates.append((member, info))
-                    except Exception:
-                        continue
-                    await asyncio.sleep(0.25)
-                # If any updates, announce in channel and then delete after 10s
-                if updates:
+                start = time.perf_counter()
+                members, unresolved = await self._resolve_members(guild, list(user_ids))
+                updates, nick_failures, skipped = await self.promote_batch(members)
+                # If anything changed or failed, post a summary in the channel and then delete after 10s
+                if updates or unresolved:
                     ch = guild.get_channel(PROMOTION_CHANNEL_ID)
                     if ch:
-                        lines = [f"{m.mention} -> **{cs}**" for m, cs in updates]
+                        lines = [f"{m.mention}: {old} -> **{new}**" for m, old, new in updates]
+                        embed = discord.Embed(
+                            title="Updated callsigns",
+                            description="\n".join(lines)[:4000] or "No callsigns were updated.",
+                            color=EMBED_COLOUR
+                        )
+                        embed.add_field(name="Updated", value=str(len(updates)), inline=True)
+                        embed.add_field(name="Unchanged", value=str(skipped), inline=True)
+                        if nick_failures:
+                            embed.add_field(name="Nickname not changed", value=str(nick_failures), inline=True)
+                        if unresolved:
+                            embed.add_field(
+                                name=f"Not found ({len(unresolved)})",
+                                value=" ".join(f"<@{uid}>" for uid in unresolved[:40]) + (" …" if len(unresolved) > 40 else ""),
+                                inline=False
+                            )
+                        embed.set_footer(text=f"{EMBED_FOOTER} • {time.perf_counter() - start:.1f}s", icon_url=EMBED_ICON)
                         try:
-                            content = "@silent\nUpdated callsigns:\n" + "\n".join(lines)
                             allowed = discord.AllowedMentions(users=False, roles=False, everyone=False)
-                            sent = await ch.send(content, allowed_mentions=allowed)
-                            await asyncio.sleep(10)
-                            try:
-                                await sent.delete()
-                            except Exception:
-                                pass
+                            await ch.send(embed=embed, allowed_mentions=allowed, silent=True, delete_after=10)
                         except Exception:
                             pass
         except Exception:
@@ -463,34 +628,7 @@ class CallsignBasicView(discord.ui.View):
 
     @discord.ui.button(label="View All Callsigns", style=discord.ButtonStyle.blurple)
     async def view_all_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
-        callsigns = await self.cog.view_all_callsigns()
-        if not callsigns:
-            desc = "No callsigns assigned."
-        else:
-            desc = ""
-            last_first = None
-            last_second = None
-            for uid, cs in callsigns:
-                m = re.fullmatch(r"(CO|WO|E)-(G|S|J|W|N)(\d{2})", cs)
-                if m:
-                    first, second, num = m.group(1), m.group(2), m.group(3)
-                else:
-                    first, second = "CO", "G"
-                if first != last_first:
-                    if last_first is not None:
-                        desc += "\n"
-                    if first == "CO":
-                        desc += "=== Commissioned Officers ===\n"
-                    elif first == "WO":
-                        desc += "=== Warrant Officers ===\n"
-                    elif first == "E":
-                        desc += "=== Enlisted Personnel ===\n"
-                    last_first = first
-                    last_second = None
-                if second != last_second:
-                    desc += f"{callsign_group_title(first, second)}\n"
-                    last_second = second
-                desc += f"<@{uid}>: **{cs}**\n"
+        desc = format_all_callsigns(self.cog.registry)
         embed = discord.Embed(title="All Callsigns", description=desc, color=EMBED_COLOUR)
         embed.set_footer(text=EMBED_FOOTER, icon_url=EMBED_ICON)
         await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -553,34 +691,7 @@ class CallsignAdminView(discord.ui.View):
 
     @discord.ui.button(label="View All Callsigns", style=discord.ButtonStyle.blurple)
     async def view_all_btn(self, interaction: discord.Interaction, button: discord.ui.Button):
-        callsigns = await self.cog.view_all_callsigns()
-        if not callsigns:
-            desc = "No callsigns assigned."
-        else:
-            desc = ""
-            last_first = None
-            last_second = None
-            for uid, cs in callsigns:
-                m = re.fullmatch(r"(CO|WO|E)-(G|S|J|W|N)(\d{2})", cs)
-                if m:
-                    first, second, num = m.group(1), m.group(2), m.group(3)
-                else:
-                    first, second = "CO", "G"
-                if first != last_first:
-                    if last_first is not None:
-                        desc += "\n"
-                    if first == "CO":
-                        desc += "=== Commissioned Officers ===\n"
-                    elif first == "WO":
-                        desc += "=== Warrant Officers ===\n"
-                    elif first == "E":
-                        desc += "=== Enlisted Personnel ===\n"
-                    last_first = first
-                    last_second = None
-                if second != last_second:
-                    desc += f"{callsign_group_title(first, second)}\n"
-                    last_second = second
-                desc += f"<@{uid}>: **{cs}**\n"
+        desc = format_all_callsigns(self.cog.registry)
         embed = discord.Embed(title="All Callsigns", description=desc, color=EMBED_COLOUR)
         embed.set_footer(text=EMBED_FOOTER, icon_url=EMBED_ICON)
         await interaction.response.send_message(embed=embed, ephemeral=True)
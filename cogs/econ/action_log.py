@@ -0,0 +1,149 @@
+"""
+Economy action log
+
+Buffered JSONL writer for economy events. `log()` only enqueues a record; a
+background task drains the queue in batches and appends them to one file per
+UTC day (logs/economy/economy-YYYY-MM-DD.jsonl) from a worker thread, so
+commands never wait on file I/O.
+
+Usage:
+    econ_log.start()                      # cog_load
+    econ_log.log("buy", user, amount=50, item="banana")
+    records = await econ_log.recent_for_user(user_id, limit=15)
+    await econ_log.close()                # cog_unload, flushes pending records
+"""
+
+import asyncio
+import glob
+import json
+import os
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+LOG_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "logs", "economy")
+FLUSH_SECONDS = float(os.getenv("ECON_LOG_FLUSH_SECONDS", 2))
+BATCH_SIZE = 500
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def read_lines_reversed(path: str, block_size: int = READ_BLOCK_SIZE) -> Iterator[str]:
+    """Yield a file's lines last-to-first, reading fixed-size blocks from the end."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        remainder = b""
+        while pos > 0:
+            size = min(block_size, pos)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + remainder).split(b"\n")
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line.decode("utf-8", errors="replace")
+        if remainder.strip():
+            yield remainder.decode("utf-8", errors="replace")
+
+
+class EconActionLog:
+    """Queue-backed JSONL log with batched writes and daily rotation."""
+
+    def __init__(self, log_dir: str = LOG_DIR):
+        self.log_dir = log_dir
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def path_for(self, day: str) -> str:
+        return os.path.join(self.log_dir, f"economy-{day}.jsonl")
+
+    def log(self, command: str, user, amount: int = None, item: str = None, extra: str = ""):
+        record = {
+            "ts": datetime.utcnow().isoformat(timespec="seconds"),
+            "user_id": user.id,
+            "user": str(user),
+            "command": command,
+        }
+        if amount is not None:
+            record["amount"] = amount
+        if item:
+            record["item"] = item
+        if extra:
+            record["extra"] = extra
+        self._queue.put_nowait(record)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def flush(self):
+        """Write everything currently queued."""
+        while not self._queue.empty():
+            await self._write_batch(self._drain())
+
+    def _drain(self, first: Optional[dict] = None) -> List[dict]:
+        batch = [first] if first is not None else []
+        while len(batch) < BATCH_SIZE and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self):
+        while True:
+            first = await self._queue.get()
+            try:
+                # Let a burst of actions accumulate so they share one file open/write
+                await asyncio.sleep(FLUSH_SECONDS)
+            except asyncio.CancelledError:
+                # Requeue so close() can still flush it
+                self._queue.put_nowait(first)
+                raise
+            # Shielded: a write already handed to the worker thread must not be requeued
+            await asyncio.shield(self._write_batch(self._drain(first)))
+
+    async def _write_batch(self, batch: List[dict]):
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self._write, batch)
+        except Exception as e:
+            print(f"⚠️ Failed to write {len(batch)} economy log records: {e}")
+
+    def _write(self, batch: List[dict]):
+        os.makedirs(self.log_dir, exist_ok=True)
+        by_day = {}
+        for record in batch:
+            by_day.setdefault(record["ts"][:10], []).append(record)
+        for day, records in by_day.items():
+            with open(self.path_for(day), "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+
+    def _scan_user(self, user_id: int, limit: int) -> List[dict]:
+        results = []
+        for path in sorted(glob.glob(os.path.join(self.log_dir, "economy-*.jsonl")), reverse=True):
+            for line in read_lines_reversed(path):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("user_id") == user_id:
+                    results.append(record)
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    async def recent_for_user(self, user_id: int, limit: int = 15) -> List[dict]:
+        """Most recent records for a user, newest first, scanning files backwards from today."""
+        await self.flush()
+        return await asyncio.to_thread(self._scan_user, user_id, limit)
+
+
+econ_log = EconActionLog()
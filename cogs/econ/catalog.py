@@ -0,0 +1,85 @@
+"""
+Shop catalog
+
+Shop items parsed once from items.txt and kept in memory. The file's mtime is
+checked at most every SHOP_RELOAD_CHECK_SECONDS, so edits to items.txt are
+picked up without a restart and without reading the file on every command.
+
+Usage:
+    SHOP_CATALOG = ShopCatalog()
+    if item in SHOP_CATALOG.items:
+        price = SHOP_CATALOG.items[item]["price"]
+    SHOP_CATALOG.complete("fi")   # -> ["fishing rod", ...]
+"""
+
+import os
+import time
+from bisect import bisect_left
+from typing import Dict, List
+
+ITEMS_FILE = os.path.join(os.path.dirname(__file__), "items.txt")
+SHOP_RELOAD_CHECK_SECONDS = float(os.getenv("SHOP_RELOAD_CHECK_SECONDS", 10))
+
+
+def load_shop_items(path: str = ITEMS_FILE) -> Dict[str, dict]:
+    items = {}
+    if not os.path.exists(path):
+        return items
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                name, price, desc = line.split("|", 2)
+                items[name.lower()] = {"price": int(price), "desc": desc}
+            except Exception:
+                continue
+    return items
+
+
+def prefix_matches(sorted_names: List[str], prefix: str, limit: int = 25) -> List[str]:
+    """Names from a sorted list that start with `prefix` (binary search, no full scan)."""
+    prefix = prefix.lower()
+    matches = []
+    for i in range(bisect_left(sorted_names, prefix), len(sorted_names)):
+        if not sorted_names[i].startswith(prefix) or len(matches) >= limit:
+            break
+        matches.append(sorted_names[i])
+    return matches
+
+
+class ShopCatalog:
+    """In-memory shop items with file-change reload and a sorted name index."""
+
+    def __init__(self, path: str = ITEMS_FILE, check_interval: float = SHOP_RELOAD_CHECK_SECONDS):
+        self.path = path
+        self.check_interval = check_interval
+        self._items: Dict[str, dict] = {}
+        self._names: List[str] = []
+        self._mtime = None
+        self._next_check = 0.0
+        self._refresh(force=True)
+
+    def _refresh(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return
+        self._next_check = now + self.check_interval
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            mtime = None
+        if force or mtime != self._mtime:
+            self._mtime = mtime
+            self._items = load_shop_items(self.path)
+            self._names = sorted(self._items)
+
+    @property
+    def items(self) -> Dict[str, dict]:
+        self._refresh()
+        return self._items
+
+    def complete(self, prefix: str, limit: int = 25) -> List[str]:
+        self._refresh()
+        return prefix_matches(self._names, prefix, limit)
@@ -0,0 +1,178 @@
+"""
+Economy ledger
+
+Single-transaction balance operations for the Economy cog. Every money
+movement is applied with a relative `UPDATE ... SET col = col + ?` guarded in
+SQL (no read-modify-write in Python outside the write lock), and recorded in
+the append-only `ledger` table inside the same transaction.
+
+Usage:
+    ledger = EconomyLedger(bot.db, DB_PATH)
+    new_balance = await ledger.credit(user_id, 250, "daily")
+
+    async with ledger.transaction() as tx:      # several steps, one commit
+        if await tx.debit_if_sufficient(user_id, cost, "buy") is not None:
+            await tx.db.execute("INSERT INTO inventory ...")
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Optional, Tuple
+
+ACCOUNTS = ("balance", "bank")
+
+
+class LedgerTransaction:
+    """Balance operations bound to one open connection/transaction."""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def ensure_account(self, user_id: int):
+        await self.db.execute(
+            "INSERT OR IGNORE INTO users (user_id, balance, last_daily, last_work, bank) VALUES (?, 0, NULL, NULL, 0)",
+            (user_id,)
+        )
+
+    async def get_account(self, user_id: int) -> dict:
+        """Read an account without creating it; a missing user reads as empty.
+        The mutating operations below create the row when they first need it."""
+        cursor = await self.db.execute(
+            "SELECT balance, last_daily, last_work, bank FROM users WHERE user_id = ?", (user_id,)
+        )
+        row = await cursor.fetchone() or (0, None, None, 0)
+        return {
+            "balance": row[0] or 0,
+            "last_daily": row[1],
+            "last_work": row[2],
+            "bank": row[3] or 0,
+        }
+
+    async def log(self, user_id: int, kind: str, account: str, delta: int, balance_after: Optional[int],
+                  counterparty_id: Optional[int] = None, memo: Optional[str] = None):
+        await self.db.execute(
+            "INSERT INTO ledger (ts, user_id, counterparty_id, kind, account, delta, balance_after, memo) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (datetime.utcnow().isoformat(), user_id, counterparty_id, kind, account, delta, balance_after, memo)
+        )
+
+    async def credit(self, user_id: int, amount: int, kind: str, account: str = "balance",
+                     counterparty_id: Optional[int] = None, memo: Optional[str] = None, **stamps) -> int:
+        """Add `amount` to an account and return the new value. `stamps` sets last_daily/last_work."""
+        _check_account(account)
+        await self.ensure_account(user_id)
+        sets = [f"{account} = {account} + ?"]
+        params = [amount]
+        for column, value in stamps.items():
+            if column not in ("last_daily", "last_work"):
+                raise ValueError(f"Unknown column: {column}")
+            sets.append(f"{column} = ?")
+            params.append(value)
+        cursor = await self.db.execute(
+            f"UPDATE users SET {', '.join(sets)} WHERE user_id = ? RETURNING {account}",
+            (*params, user_id)
+        )
+        row = await cursor.fetchone()
+        await self.log(user_id, kind, account, amount, row[0], counterparty_id, memo)
+        return row[0]
+
+    async def debit_if_sufficient(self, user_id: int, amount: int, kind: str, account: str = "balance",
+                                  counterparty_id: Optional[int] = None, memo: Optional[str] = None) -> Optional[int]:
+        """Subtract `amount` only if the account covers it. Returns the new value, or None if insufficient."""
+        _check_account(account)
+        await self.ensure_account(user_id)
+        cursor = await self.db.execute(
+            f"UPDATE users SET {account} = {account} - ? WHERE user_id = ? AND {account} >= ? RETURNING {account}",
+            (amount, user_id, amount)
+        )
+        row = await cursor.fetchone()
+        if row is None:
+            return None
+        await self.log(user_id, kind, account, -amount, row[0], counterparty_id, memo)
+        return row[0]
+
+    async def debit_up_to(self, user_id: int, amount: int, kind: str, account: str = "balance",
+                          counterparty_id: Optional[int] = None, memo: Optional[str] = None) -> Tuple[int, int]:
+        """Subtract up to `amount`, never going below zero. Returns (amount_taken, new_value)."""
+        _check_account(account)
+        await self.ensure_account(user_id)
+        # Safe read-then-write: transactions are opened with BEGIN IMMEDIATE (write lock held)
+        cursor = await self.db.execute(f"SELECT {account} FROM users WHERE user_id = ?", (user_id,))
+        taken = min(max((await cursor.fetchone())[0] or 0, 0), amount)
+        cursor = await self.db.execute(
+            f"UPDATE users SET {account} = {account} - ? WHERE user_id = ? RETURNING {account}",
+            (taken, user_id)
+        )
+        new_value = (await cursor.fetchone())[0]
+        await self.log(user_id, kind, account, -taken, new_value, counterparty_id, memo)
+        return taken, new_value
+
+    async def transfer(self, from_id: int, to_id: int, amount: int, kind: str,
+                       from_account: str = "balance", to_account: str = "balance",
+                       memo: Optional[str] = None) -> Optional[Tuple[int, int]]:
+        """Move `amount` between accounts if the source covers it. Returns (from_new, to_new) or None."""
+        from_new = await self.debit_if_sufficient(from_id, amount, kind, from_account, counterparty_id=to_id, memo=memo)
+        if from_new is None:
+            return None
+        to_new = await self.credit(to_id, amount, kind, to_account, counterparty_id=from_id, memo=memo)
+        return from_new, to_new
+
+
+class EconomyLedger:
+    """Entry point: each method is one pooled connection; every write is one committed transaction."""
+
+    def __init__(self, database, db_path: str):
+        self.database = database
+        self.db_path = db_path
+
+    async def initialize(self):
+        async with self.database.connection(self.db_path) as db:
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS ledger (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ts TEXT NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    counterparty_id INTEGER,
+                    kind TEXT NOT NULL,
+                    account TEXT NOT NULL,
+                    delta INTEGER NOT NULL,
+                    balance_after INTEGER,
+                    memo TEXT
+                )
+            """)
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_ledger_user ON ledger(user_id, id)")
+            await db.commit()
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Open a write transaction; commits on success, rolls back on error."""
+        async with self.database.connection(self.db_path) as db:
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                yield LedgerTransaction(db)
+            except BaseException:
+                await db.rollback()
+                raise
+            await db.commit()
+
+    async def get_account(self, user_id: int) -> dict:
+        # Plain read: no write lock, so balance/profile views never queue behind (or block) writers
+        async with self.database.connection(self.db_path) as db:
+            return await LedgerTransaction(db).get_account(user_id)
+
+    async def credit(self, user_id: int, amount: int, kind: str, account: str = "balance", **kwargs) -> int:
+        async with self.transaction() as tx:
+            return await tx.credit(user_id, amount, kind, account, **kwargs)
+
+    async def debit_if_sufficient(self, user_id: int, amount: int, kind: str, account: str = "balance", **kwargs) -> Optional[int]:
+        async with self.transaction() as tx:
+            return await tx.debit_if_sufficient(user_id, amount, kind, account, **kwargs)
+
+    async def transfer(self, from_id: int, to_id: int, amount: int, kind: str, **kwargs) -> Optional[Tuple[int, int]]:
+        async with self.transaction() as tx:
+            return await tx.transfer(from_id, to_id, amount, kind, **kwargs)
+
+
+def _check_account(account: str):
+    if account not in ACCOUNTS:
+        raise ValueError(f"Unknown account: {account}")
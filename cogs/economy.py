@@ -1,12 +1,15 @@
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-import aiosqlite
 import os
 import random
+import time
 from datetime import datetime, timedelta
 import math
 from discord.ext.commands import cooldown, BucketType, CommandOnCooldown
+from cogs.econ.action_log import econ_log
+from cogs.econ.catalog import ShopCatalog, prefix_matches
+from cogs.econ.ledger import EconomyLedger
 
 DB_PATH = os.getenv("ECONOMY_DB_FILE", "data/economy.db")
 DAILY_AMOUNT = int(os.getenv("DAILY_AMOUNT", 250))
@@ -17,26 +20,12 @@ BANK_ROLE_TIERS = [
 ]
 
 SHOP_ITEMS_PER_PAGE = 5
+LEADERBOARD_PAGE_SIZE = 10
+LEADERBOARD_CACHE_SECONDS = int(os.getenv("ECON_LEADERBOARD_CACHE_SECONDS", 30))
+INVENTORY_CACHE_SIZE = 1000
 ECONOMY_CHANNEL_ID = 1329910482194141185
 
-def load_shop_items():
-    items = {}
-    items_file = os.path.join(os.path.dirname(__file__), "econ", "items.txt")
-    if not os.path.exists(items_file):
-        return items
-    with open(items_file, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            try:
-                name, price, desc = line.split("|", 2)
-                items[name.lower()] = {"price": int(price), "desc": desc}
-            except Exception:
-                continue
-    return items
-
-SHOP_ITEMS = load_shop_items()
+SHOP_CATALOG = ShopCatalog()
 
 FISH_TYPES = [
     "salmon", "trout", "bass", "catfish", "carp", "goldfish", "pike", "perch", "sturgeon", "eel",
@@ -113,20 +102,8 @@ CRIME_REWARDS = [
 ]
 
 def log_econ_action(command: str, user: discord.User, amount: int = None, item: str = None, extra: str = ""):
-    log_dir = os.path.join(os.path.dirname(__file__), "../logs")
-    os.makedirs(log_dir, exist_ok=True)
-    log_file = os.path.join(log_dir, "economy_actions.txt")
-    timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-    user_str = f"{user} ({user.id})"
-    parts = [f"[{timestamp}]", f"User: {user_str}", f"Command: {command}"]
-    if amount is not None:
-        parts.append(f"Amount: {amount}")
-    if item:
-        parts.append(f"Item: {item}")
-    if extra:
-        parts.append(f"Extra: {extra}")
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(" | ".join(parts) + "\n")
+    # Queued; written in batches to logs/economy/economy-YYYY-MM-DD.jsonl by the background writer
+    econ_log.log(command, user, amount=amount, item=item, extra=extra)
 
 def economy_channel_only():
     async def predicate(ctx_or_interaction):
@@ -142,6 +119,14 @@ def economy_channel_only():
 class Economy(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.ledger = EconomyLedger(bot.db, DB_PATH)
+        # One window per LEADERBOARD_CACHE_SECONDS: (expires_at, total_pages, {shown page: embed dict}).
+        # A new window replaces the old one wholesale, so expired pages never pile up.
+        self._leaderboard_cache = None
+        # user_id -> [(item, count)] sorted by item; dropped whenever the inventory changes
+        self._inventory_cache = {}
+        # user_id -> bumped on every invalidation, so a read that raced a change is not cached
+        self._inventory_generation = {}
         self.apply_bank_interest.start()
         # Initialize the database synchronously in __init__ (wrapped in asyncio)
         try:
@@ -156,11 +141,17 @@ class Economy(commands.Cog):
         except Exception as e:
             print(f"Warning: Failed to initialize economy DB in __init__: {e}")
 
+    async def cog_load(self):
+        econ_log.start()
+
+    async def cog_unload(self):
+        await econ_log.close()
+
     async def _initialize_db(self):
         """Initialize the database tables."""
         try:
             os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with self.bot.db.connection(DB_PATH) as db:
                 await db.execute("""
                     CREATE TABLE IF NOT EXISTS users (
                         user_id INTEGER PRIMARY KEY,
@@ -179,64 +170,131 @@ class Economy(commands.Cog):
                         -- No PRIMARY KEY here; SQLite will use implicit rowid
                     )
                 """)
+                await self._compact_inventory(db)
+                await self._add_net_worth_column(db)
                 await db.commit()
+            await self.ledger.initialize()
         except Exception as e:
             print(f"Error initializing economy DB: {e}")
 
-    async def get_user(self, user_id):
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute("SELECT balance, last_daily, last_work, bank FROM users WHERE user_id = ?", (user_id,))
-            row = await cursor.fetchone()
-            if row:
-                return {
-                    "balance": row[0],
-                    "last_daily": row[1],
-                    "last_work": row[2],
-                    "bank": row[3] if row[3] is not None else 0
-                }
-            else:
-                await db.execute("INSERT INTO users (user_id, balance, last_daily, last_work, bank) VALUES (?, ?, ?, ?, ?)", (user_id, 0, None, None, 0))
-                await db.commit()
-                return {"balance": 0, "last_daily": None, "last_work": None, "bank": 0}
-
-    async def update_user(self, user_id, balance=None, last_daily=None, last_work=None, bank=None):
-        user = await self.get_user(user_id)
-        balance = balance if balance is not None else user["balance"]
-        last_daily = last_daily if last_daily is not None else user["last_daily"]
-        last_work = last_work if last_work is not None else user["last_work"]
-        bank = bank if bank is not None else user["bank"]
-        async with aiosqlite.connect(DB_PATH) as db:
+    async def _add_net_worth_column(self, db):
+        """Generated wallet + bank total, indexed so the leaderboard can ORDER BY/LIMIT in SQL."""
+        cursor = await db.execute("PRAGMA table_xinfo(users)")
+        columns = {row[1] for row in await cursor.fetchall()}
+        if "net_worth" not in columns:
             await db.execute(
-                "UPDATE users SET balance = ?, last_daily = ?, last_work = ?, bank = ? WHERE user_id = ?",
-                (balance, last_daily, last_work, bank, user_id)
+                "ALTER TABLE users ADD COLUMN net_worth INTEGER "
+                "GENERATED ALWAYS AS (COALESCE(balance, 0) + COALESCE(bank, 0)) VIRTUAL"
             )
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_users_net_worth ON users(net_worth)")
+
+    async def _compact_inventory(self, db):
+        """One-time migration: collapse one-row-per-catch fish/junk into (user, item, value) buckets."""
+        cursor = await db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_inventory_bucket'"
+        )
+        if await cursor.fetchone():
+            return
+        # One explicit transaction, so a failure leaves neither a half-compacted
+        # inventory nor a leftover temp table on the pooled connection.
+        await db.execute("BEGIN")
+        try:
+            await db.execute("DROP TABLE IF EXISTS temp.inventory_compact")
+            await db.execute("""
+                CREATE TEMP TABLE inventory_compact AS
+                SELECT user_id, item, SUM(amount) AS amount, value
+                FROM inventory
+                GROUP BY user_id, item, value
+                HAVING SUM(amount) > 0
+            """)
+            await db.execute("DELETE FROM inventory")
+            await db.execute("INSERT INTO inventory (user_id, item, amount, value) SELECT user_id, item, amount, value FROM inventory_compact")
+            await db.execute("DROP TABLE inventory_compact")
+            # Valued rows are unique per (user, item, value) so catches can be upserted;
+            # the (user_id, item) prefix serves every per-user/per-item lookup.
+            await db.execute("CREATE UNIQUE INDEX idx_inventory_bucket ON inventory(user_id, item, value)")
             await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+    async def get_user(self, user_id):
+        return await self.ledger.get_account(user_id)
 
     async def add_item(self, user_id, item, amount, value=None):
-        async with aiosqlite.connect(DB_PATH) as db:
-            # For fish/junk, store each instance with its value
-            if value is not None:
-                for _ in range(amount):
-                    await db.execute(
-                        "INSERT INTO inventory (user_id, item, amount, value) VALUES (?, ?, ?, ?)",
-                        (user_id, item, 1, value)
-                    )
-            else:
-                # For normal items, just update amount (value is NULL)
-                cursor = await db.execute("SELECT rowid, amount FROM inventory WHERE user_id = ? AND item = ? AND value IS NULL", (user_id, item))
-                row = await cursor.fetchone()
-                if row:
-                    await db.execute("UPDATE inventory SET amount = amount + ? WHERE rowid = ?", (amount, row[0]))
-                else:
-                    await db.execute("INSERT INTO inventory (user_id, item, amount, value) VALUES (?, ?, ?, NULL)", (user_id, item, amount))
+        async with self.bot.db.connection(DB_PATH) as db:
+            await self._insert_item(db, user_id, item, amount, value)
             await db.commit()
+        self.invalidate_inventory(user_id)
+
+    async def _insert_item(self, db, user_id, item, amount, value=None):
+        if value is not None:
+            await self._insert_valued_items(db, user_id, [(item, value, amount)])
+        else:
+            # For normal items, just update amount (value is NULL)
+            cursor = await db.execute("SELECT rowid, amount FROM inventory WHERE user_id = ? AND item = ? AND value IS NULL", (user_id, item))
+            row = await cursor.fetchone()
+            if row:
+                await db.execute("UPDATE inventory SET amount = amount + ? WHERE rowid = ?", (amount, row[0]))
+            else:
+                await db.execute("INSERT INTO inventory (user_id, item, amount, value) VALUES (?, ?, ?, NULL)", (user_id, item, amount))
+
+    async def _insert_valued_items(self, db, user_id, entries):
+        """Add fish/junk as (item, value, count) buckets; one row per distinct value, not per catch."""
+        await db.executemany(
+            "INSERT INTO inventory (user_id, item, amount, value) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(user_id, item, value) DO UPDATE SET amount = amount + excluded.amount",
+            [(user_id, item, count, value) for item, value, count in entries]
+        )
+
+    async def _sell_valued_items(self, db, user_id, items):
+        """Delete all fish/junk of the given kinds. Returns [(item, count, earned)]."""
+        items = list(items)
+        if not items:
+            return []
+        placeholders = ", ".join("?" for _ in items)
+        cursor = await db.execute(
+            f"SELECT item, SUM(amount), SUM(amount * value) FROM inventory "
+            f"WHERE user_id = ? AND value IS NOT NULL AND item IN ({placeholders}) GROUP BY item ORDER BY item",
+            (user_id, *items)
+        )
+        rows = await cursor.fetchall()
+        if rows:
+            await db.execute(
+                f"DELETE FROM inventory WHERE user_id = ? AND value IS NOT NULL AND item IN ({placeholders})",
+                (user_id, *items)
+            )
+        return rows
 
     async def get_inventory(self, user_id):
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with self.bot.db.connection(DB_PATH) as db:
             cursor = await db.execute("SELECT rowid, item, amount, value FROM inventory WHERE user_id = ?", (user_id,))
             rows = await cursor.fetchall()
             return rows
 
+    async def get_item_counts(self, user_id):
+        """Total owned per item as [(item, count)] sorted by item, normal items and fish/junk alike."""
+        cached = self._inventory_cache.get(user_id)
+        if cached is not None:
+            return cached
+        generation = self._inventory_generation.get(user_id, 0)
+        async with self.bot.db.connection(DB_PATH) as db:
+            cursor = await db.execute(
+                "SELECT item, SUM(amount) FROM inventory WHERE user_id = ? GROUP BY item HAVING SUM(amount) > 0 ORDER BY item",
+                (user_id,)
+            )
+            rows = await cursor.fetchall()
+        if self._inventory_generation.get(user_id, 0) != generation:
+            return rows  # inventory changed while we were reading; the rows may be stale
+        if len(self._inventory_cache) >= INVENTORY_CACHE_SIZE:
+            self._inventory_cache.pop(next(iter(self._inventory_cache)))
+        self._inventory_cache[user_id] = rows
+        return rows
+
+    def invalidate_inventory(self, user_id):
+        self._inventory_generation[user_id] = self._inventory_generation.get(user_id, 0) + 1
+        self._inventory_cache.pop(user_id, None)
+
     def get_daily_amount(self, member):
         for role_id, amount in [
             (1329910391840702515, 1000),
@@ -259,25 +317,27 @@ class Economy(commands.Cog):
         await self._daily(interaction.user, interaction)
 
     async def _daily(self, user, destination):
-        data = await self.get_user(user.id)
         now = datetime.utcnow()
-        last_daily = data["last_daily"]
-        if last_daily:
-            last_daily_dt = datetime.fromisoformat(last_daily)
-            if now - last_daily_dt < timedelta(days=1):
-                next_time = last_daily_dt + timedelta(days=1)
-                seconds = int((next_time - now).total_seconds())
-                hours, remainder = divmod(seconds, 3600)
-                minutes, seconds = divmod(remainder, 60)
-                msg = f"⏳ You have already claimed your daily. Try again in {hours}h {minutes}m {seconds}s."
-                if hasattr(destination, "response"):
-                    await destination.response.send_message(msg, ephemeral=True)
-                else:
-                    await destination.send(msg)
-                return
         amount = self.get_daily_amount(user)
-        new_balance = data["balance"] + amount
-        await self.update_user(user.id, balance=new_balance, last_daily=now.isoformat())
+        next_time = None
+        # Check and stamp last_daily in the same transaction so two claims can't both pass
+        async with self.ledger.transaction() as tx:
+            data = await tx.get_account(user.id)
+            last_daily = data["last_daily"]
+            if last_daily and now - datetime.fromisoformat(last_daily) < timedelta(days=1):
+                next_time = datetime.fromisoformat(last_daily) + timedelta(days=1)
+            else:
+                await tx.credit(user.id, amount, "daily", last_daily=now.isoformat())
+        if next_time:
+            seconds = int((next_time - now).total_seconds())
+            hours, remainder = divmod(seconds, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            msg = f"⏳ You have already claimed your daily. Try again in {hours}h {minutes}m {seconds}s."
+            if hasattr(destination, "response"):
+                await destination.response.send_message(msg, ephemeral=True)
+            else:
+                await destination.send(msg)
+            return
         embed = discord.Embed(
             title="Daily Reward",
             description=f"You claimed your daily reward of **{amount}** coins!",
@@ -295,24 +355,93 @@ class Economy(commands.Cog):
                 return interest
         return 0.0
 
+    def collect_interest_tiers(self):
+        """Map user_id -> daily interest rate from cached guild roles (highest tier wins)."""
+        tiers = {}
+        for guild in self.bot.guilds:
+            for role_id, interest in BANK_ROLE_TIERS:
+                role = guild.get_role(role_id)
+                if not role:
+                    continue
+                for member in role.members:
+                    if interest > tiers.get(member.id, 0.0):
+                        tiers[member.id] = interest
+        return tiers
+
+    async def run_bank_interest(self, dry_run=False):
+        """Apply interest to every tiered account with one set-based UPDATE. Returns a summary dict."""
+        start = time.perf_counter()
+        tiers = self.collect_interest_tiers()
+        # Same truncation as int(bank * rate); accounts that would earn 0 are skipped
+        interest_expr = "CAST(users.bank * t.rate AS INTEGER)"
+        if dry_run:
+            # Read-only preview: a plain pooled connection with a deferred read, never the write lock.
+            # The staging table lives in the temp schema, and under WAL the read does not block writers.
+            async with self.bot.db.connection(DB_PATH) as db:
+                accounts, total = await self._stage_interest_tiers(db, tiers, interest_expr)
+                await db.execute("DROP TABLE interest_tiers")
+                await db.commit()
+        else:
+            async with self.ledger.transaction() as tx:
+                db = tx.db
+                accounts, total = await self._stage_interest_tiers(db, tiers, interest_expr)
+                if accounts:
+                    await db.execute(
+                        f"INSERT INTO ledger (ts, user_id, kind, account, delta, balance_after) "
+                        f"SELECT ?, users.user_id, 'interest', 'bank', {interest_expr}, users.bank + {interest_expr} "
+                        f"FROM users JOIN interest_tiers t ON t.user_id = users.user_id WHERE {interest_expr} > 0",
+                        (datetime.utcnow().isoformat(),)
+                    )
+                    await db.execute(
+                        f"UPDATE users SET bank = bank + {interest_expr} FROM interest_tiers t "
+                        f"WHERE t.user_id = users.user_id AND {interest_expr} > 0"
+                    )
+                await db.execute("DROP TABLE interest_tiers")
+        return {
+            "members": len(tiers),
+            "accounts": accounts,
+            "total": total,
+            "elapsed": time.perf_counter() - start,
+            "dry_run": dry_run,
+        }
+
+    async def _stage_interest_tiers(self, db, tiers, interest_expr):
+        """Load the tier rates into a temp table and return (accounts, total interest) they would earn."""
+        await db.execute("CREATE TEMP TABLE IF NOT EXISTS interest_tiers (user_id INTEGER PRIMARY KEY, rate REAL NOT NULL)")
+        await db.execute("DELETE FROM interest_tiers")
+        await db.executemany("INSERT INTO interest_tiers (user_id, rate) VALUES (?, ?)", tiers.items())
+        cursor = await db.execute(
+            f"SELECT COUNT(*), COALESCE(SUM({interest_expr}), 0) FROM users "
+            f"JOIN interest_tiers t ON t.user_id = users.user_id WHERE {interest_expr} > 0"
+        )
+        return await cursor.fetchone()
+
     @tasks.loop(hours=24)
     async def apply_bank_interest(self):
         await self.bot.wait_until_ready()
-        async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute("SELECT user_id, bank FROM users") as cursor:
-                async for row in cursor:
-                    user_id, bank = row
-                    member = self.bot.get_user(user_id)
-                    if not member:
-                        try:
-                            member = await self.bot.fetch_user(user_id)
-                        except Exception:
-                            continue
-                    interest = self.get_bank_interest(member)
-                    if interest > 0 and bank > 0:
-                        interest_amount = int(bank * interest)
-                        await db.execute("UPDATE users SET bank = bank + ? WHERE user_id = ?", (interest_amount, user_id))
-            await db.commit()
+        try:
+            result = await self.run_bank_interest()
+            print(f"🏦 Bank interest: {result['total']} coins to {result['accounts']} accounts "
+                  f"({result['members']} tiered members) in {result['elapsed'] * 1000:.1f}ms")
+        except Exception as e:
+            print(f"Error applying bank interest: {e}")
+
+    @commands.command(name="interestpreview")
+    @commands.has_permissions(administrator=True)
+    async def interest_preview_command(self, ctx):
+        """Dry run of the daily bank interest job."""
+        result = await self.run_bank_interest(dry_run=True)
+        embed = discord.Embed(
+            title="Bank Interest (dry run)",
+            description=(
+                f"👥 **Tiered members:** {result['members']}\n"
+                f"🏦 **Accounts credited:** {result['accounts']}\n"
+                f"💸 **Total interest:** {result['total']} coins\n"
+                f"⏱️ **Computed in:** {result['elapsed'] * 1000:.1f}ms"
+            ),
+            color=0x00bfae
+        )
+        await ctx.send(embed=embed)
 
     @commands.command(name="bal", aliases=["balance"])
     async def balance_command(self, ctx):
@@ -348,30 +477,21 @@ class Economy(commands.Cog):
 
     async def sell_all(self, user, destination):
         # Sell everything: both normal items (value IS NULL) and fish/junk (value NOT NULL)
-        rows = await self.get_inventory(user.id)
-        if not rows:
-            embed = discord.Embed(
-                title="Sell All",
-                description="You have no items to sell.",
-                color=0xd0b47b
-            )
-            if isinstance(destination, discord.Interaction):
-                await destination.response.send_message(embed=embed)
-            else:
-                await destination.send(embed=embed)
-            return
-
         total_earned = 0
         sold_items = {}
-        async with aiosqlite.connect(DB_PATH) as db:
-            # Group fish/junk by item and collect rowids for deletion
-            fish_types = set(FISH_TYPES + JUNK_TYPES)
+        # Logged only after the sale commits
+        pending_logs = []
+        async with self.ledger.transaction() as tx:
+            db = tx.db
+            # Read inside the transaction so a concurrent sell can't be paid twice
+            cursor = await db.execute("SELECT rowid, item, amount, value FROM inventory WHERE user_id = ?", (user.id,))
+            rows = await cursor.fetchall()
             normal_accum = {}
-            fish_rows_by_item = {}
+            fish_items = set()
 
             for rowid, item, amount, value in rows:
                 if value is not None:
-                    fish_rows_by_item.setdefault(item, []).append((rowid, value))
+                    fish_items.add(item)
                 else:
                     normal_accum[item] = normal_accum.get(item, 0) + (amount or 0)
 
@@ -379,33 +499,28 @@ class Economy(commands.Cog):
             for item, amt in normal_accum.items():
                 if amt <= 0:
                     continue
-                if item in SHOP_ITEMS:
-                    price = SHOP_ITEMS[item]["price"]
+                if item in SHOP_CATALOG.items:
+                    price = SHOP_CATALOG.items[item]["price"]
                     earned = price * amt
-                    await db.execute("UPDATE inventory SET amount = amount - ? WHERE user_id = ? AND item = ? AND value IS NULL", (amt, user.id, item))
+                    await db.execute("DELETE FROM inventory WHERE user_id = ? AND item = ? AND value IS NULL", (user.id, item))
                     total_earned += earned
                     sold_items[item] = sold_items.get(item, 0) + amt
-                    log_econ_action("sellall", user, amount=earned, item=item, extra=f"Quantity: {amt}")
+                    pending_logs.append(("sellall", earned, item, amt))
                 else:
                     # item not in shop - skip
                     continue
 
             # Sell fish/junk (by stored value)
-            for item, rlist in fish_rows_by_item.items():
-                if not rlist:
-                    continue
-                earned = sum(v for (_, v) in rlist)
-                rowids = [rid for (rid, _) in rlist]
-                for rid in rowids:
-                    await db.execute("DELETE FROM inventory WHERE rowid = ?", (rid,))
+            for item, count, earned in await self._sell_valued_items(db, user.id, fish_items):
                 total_earned += earned
-                sold_items[item] = sold_items.get(item, 0) + len(rlist)
-                log_econ_action("sellall_fish", user, amount=earned, item=item, extra=f"Quantity: {len(rlist)}")
+                sold_items[item] = sold_items.get(item, 0) + count
+                pending_logs.append(("sellall_fish", earned, item, count))
 
-            await db.commit()
             if total_earned > 0:
-                data = await self.get_user(user.id)
-                await self.update_user(user.id, balance=data["balance"] + total_earned)
+                await tx.credit(user.id, total_earned, "sellall")
+        self.invalidate_inventory(user.id)
+        for command, earned, item, qty in pending_logs:
+            log_econ_action(command, user, amount=earned, item=item, extra=f"Quantity: {qty}")
 
         if sold_items:
             desc_lines = []
@@ -426,48 +541,97 @@ class Economy(commands.Cog):
             await destination.send(embed=embed)
 
     @commands.command(name="eclb", aliases=["econlb", "econleaderboard"])
-    async def eclb_command(self, ctx):
-        await self.econ_leaderboard(ctx)
+    async def eclb_command(self, ctx, page: int = 1):
+        await self.econ_leaderboard(ctx, page)
 
-    @app_commands.command(name="econleaderboard", description="Show the top 10 richest users (wallet + bank).")
-    async def eclb_slash(self, interaction: discord.Interaction):
-        await self.econ_leaderboard(interaction)
-
-    async def econ_leaderboard(self, destination):
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute("SELECT user_id, balance, bank FROM users")
+    @app_commands.command(name="econleaderboard", description="Show the richest users (wallet + bank).")
+    @app_commands.describe(page="Page number")
+    async def eclb_slash(self, interaction: discord.Interaction, page: int = 1):
+        await self.econ_leaderboard(interaction, page)
+
+    @commands.command(name="econrank", aliases=["eclbme"])
+    async def econrank_command(self, ctx):
+        await self.econ_leaderboard(ctx, user=ctx.author)
+
+    @app_commands.command(name="econrank", description="Show your position on the economy leaderboard.")
+    async def econrank_slash(self, interaction: discord.Interaction):
+        await self.econ_leaderboard(interaction, user=interaction.user)
+
+    async def get_leaderboard_page(self, page=1):
+        """Return (embed, page, total_pages) for a leaderboard page; rendered pages are cached briefly."""
+        now = time.monotonic()
+        window = self._leaderboard_cache
+        if window is not None and window[0] > now:
+            total_pages, pages = window[1], window[2]
+            shown = max(1, min(page, total_pages))
+            cached = pages.get(shown)
+            if cached is not None:
+                return discord.Embed.from_dict(cached), shown, total_pages
+
+        async with self.bot.db.connection(DB_PATH) as db:
+            if window is None or window[0] <= now:
+                cursor = await db.execute("SELECT COUNT(*) FROM users")
+                total_pages = max(1, math.ceil((await cursor.fetchone())[0] / LEADERBOARD_PAGE_SIZE))
+                pages = {}
+                self._leaderboard_cache = (now + LEADERBOARD_CACHE_SECONDS, total_pages, pages)
+            shown = max(1, min(page, total_pages))
+            cursor = await db.execute(
+                "SELECT user_id, balance, bank, net_worth FROM users ORDER BY net_worth DESC LIMIT ? OFFSET ?",
+                (LEADERBOARD_PAGE_SIZE, (shown - 1) * LEADERBOARD_PAGE_SIZE)
+            )
             rows = await cursor.fetchall()
-        leaderboard = sorted(rows, key=lambda r: (r[1] or 0) + (r[2] or 0), reverse=True)[:10]
-        place_emojis = ["🥇", "🥈", "🥉"] + ["🏅"] * 7
 
+        place_emojis = ["🥇", "🥈", "🥉"]
         embed = discord.Embed(
             title="Economy Leaderboard",
-            description="Top 10 users by wallet + bank",
+            description=f"Top users by wallet + bank (Page {shown}/{total_pages})",
             color=0xd0b47b
         )
-
-        if not leaderboard:
+        if not rows:
             embed.description = "No users found."
         else:
             lines = []
-            guild = None
-            if hasattr(destination, "guild") and destination.guild:
-                guild = destination.guild
-            elif hasattr(destination, "user") and hasattr(destination, "guild_id"):
-                guild = self.bot.get_guild(destination.guild_id)
-            for idx, (user_id, balance, bank) in enumerate(leaderboard, start=1):
-                member = guild.get_member(user_id) if guild else None
-                name = member.mention if member else f"<@{user_id}>"
+            start = (shown - 1) * LEADERBOARD_PAGE_SIZE + 1
+            for idx, (user_id, balance, bank, net_worth) in enumerate(rows, start=start):
                 emoji = place_emojis[idx - 1] if idx <= len(place_emojis) else "🏅"
                 lines.append(
-                    f"{emoji} **#{idx}** {name}\nWallet: **{balance}** | Bank: **{bank}** | Total: **{balance + bank}**"
+                    f"{emoji} **#{idx}** <@{user_id}>\nWallet: **{balance}** | Bank: **{bank or 0}** | Total: **{net_worth}**"
                 )
             embed.add_field(name="Ranks", value="\n".join(lines), inline=False)
 
+        pages[shown] = embed.to_dict()
+        return embed, shown, total_pages
+
+    async def get_position(self, user_id):
+        """Return (rank, net_worth) for a user, or None if they have no account."""
+        async with self.bot.db.connection(DB_PATH) as db:
+            cursor = await db.execute(
+                "SELECT (SELECT COUNT(*) FROM users WHERE net_worth > u.net_worth) + 1, u.net_worth FROM users u WHERE u.user_id = ?",
+                (user_id,)
+            )
+            return await cursor.fetchone()
+
+    async def build_leaderboard(self, page=1, user=None):
+        """Leaderboard embed and view; with `user`, jump to the page holding their position."""
+        position = None
+        if user is not None:
+            position = await self.get_position(user.id)
+            if position:
+                page = (position[0] - 1) // LEADERBOARD_PAGE_SIZE + 1
+        embed, page, total_pages = await self.get_leaderboard_page(page)
+        if user is not None:
+            if position:
+                embed.set_footer(text=f"{user.name}: #{position[0]} with {position[1]} coins")
+            else:
+                embed.set_footer(text=f"{user.name} has no coins yet.")
+        return embed, LeaderboardView(self, page=page, total_pages=total_pages)
+
+    async def econ_leaderboard(self, destination, page=1, user=None):
+        embed, view = await self.build_leaderboard(page, user)
         if hasattr(destination, "response"):
-            await destination.response.send_message(embed=embed)
+            await destination.response.send_message(embed=embed, view=view)
         else:
-            await destination.send(embed=embed)
+            await destination.send(embed=embed, view=view)
 
     @commands.command(name="work")
     @cooldown(1, 120, BucketType.user)
@@ -479,11 +643,9 @@ class Economy(commands.Cog):
         await self._work(interaction.user, interaction)
 
     async def _work(self, user, destination):
-        data = await self.get_user(user.id)
         amount = round(random.randint(5, 500) / 5) * 5
         job_response = random.choice(WORK_RESPONSES)
-        new_balance = data["balance"] + amount
-        await self.update_user(user.id, balance=new_balance, last_work=datetime.utcnow().isoformat())
+        await self.ledger.credit(user.id, amount, "work", last_work=datetime.utcnow().isoformat())
         embed = discord.Embed(
             title="Work",
             description=f"{job_response} **{amount}** coins!",
@@ -506,9 +668,7 @@ class Economy(commands.Cog):
     async def garage(self, user, destination):
         jobs = 20
         amount = jobs * 1
-        data = await self.get_user(user.id)
-        new_balance = data["balance"] + amount
-        await self.update_user(user.id, balance=new_balance)
+        await self.ledger.credit(user.id, amount, "garage")
         embed = discord.Embed(
             title="Garage Jobs",
             description=f"You completed {jobs} garage jobs and earned **{amount}** coins!",
@@ -573,36 +733,47 @@ class Economy(commands.Cog):
 
         # If item is fish/junk (valued instances)
         if item in fish_junk:
-            async with aiosqlite.connect(DB_PATH) as db:
-                cursor = await db.execute(
-                    "SELECT rowid, value FROM inventory WHERE user_id = ? AND item = ? AND value IS NOT NULL LIMIT ?",
-                    (user.id, item, amount)
+            sold = total = 0
+            async with self.ledger.transaction() as tx:
+                cursor = await tx.db.execute(
+                    "SELECT rowid, amount, value FROM inventory WHERE user_id = ? AND item = ? AND value IS NOT NULL ORDER BY rowid",
+                    (user.id, item)
                 )
-                rows = await cursor.fetchall()
-                if not rows:
-                    embed = discord.Embed(
-                        title="Sell",
-                        description=f"You don't have any **{item.title()}** to sell.",
-                        color=0xd0b47b
-                    )
-                    log_econ_action("sell_fail", user, item=item, extra="No items")
-                else:
-                    total = sum(r[1] for r in rows)
-                    rowids = [r[0] for r in rows]
-                    for rid in rowids:
-                        await db.execute("DELETE FROM inventory WHERE rowid = ?", (rid,))
-                    await db.commit()
-                    data = await self.get_user(user.id)
-                    await self.update_user(user.id, balance=data["balance"] + total)
-                    embed = discord.Embed(
-                        title="Sell",
-                        description=f"You sold **{len(rows)} {item.title()}** for **{total}** coins!",
-                        color=0xd0b47b
+                emptied = []
+                for rid, count, value in await cursor.fetchall():
+                    take = min(count, amount - sold)
+                    if take <= 0:
+                        break
+                    sold += take
+                    total += take * value
+                    if take == count:
+                        emptied.append(rid)
+                    else:
+                        await tx.db.execute("UPDATE inventory SET amount = amount - ? WHERE rowid = ?", (take, rid))
+                if emptied:
+                    await tx.db.execute(
+                        f"DELETE FROM inventory WHERE rowid IN ({', '.join('?' for _ in emptied)})", emptied
                     )
-                    log_econ_action("sell", user, amount=total, item=item, extra=f"Quantity: {len(rows)}")
+                if sold:
+                    await tx.credit(user.id, total, "sell", memo=f"{item} x{sold}")
+            self.invalidate_inventory(user.id)
+            if not sold:
+                embed = discord.Embed(
+                    title="Sell",
+                    description=f"You don't have any **{item.title()}** to sell.",
+                    color=0xd0b47b
+                )
+                log_econ_action("sell_fail", user, item=item, extra="No items")
+            else:
+                embed = discord.Embed(
+                    title="Sell",
+                    description=f"You sold **{sold} {item.title()}** for **{total}** coins!",
+                    color=0xd0b47b
+                )
+                log_econ_action("sell", user, amount=total, item=item, extra=f"Quantity: {sold}")
         else:
             # Normal shop item
-            if item not in SHOP_ITEMS:
+            if item not in SHOP_CATALOG.items:
                 embed = discord.Embed(
                     title="Sell",
                     description="That item doesn't exist.",
@@ -610,31 +781,35 @@ class Economy(commands.Cog):
                 )
                 log_econ_action("sell_fail", user, item=item, extra="Not in shop")
             else:
-                async with aiosqlite.connect(DB_PATH) as db:
-                    cursor = await db.execute("SELECT rowid, amount FROM inventory WHERE user_id = ? AND item = ? AND value IS NULL", (user.id, item))
+                sell_amount = 0
+                price = SHOP_CATALOG.items[item]["price"]
+                async with self.ledger.transaction() as tx:
+                    cursor = await tx.db.execute("SELECT rowid, amount FROM inventory WHERE user_id = ? AND item = ? AND value IS NULL", (user.id, item))
                     row = await cursor.fetchone()
                     owned = row[1] if row else 0
-                    if owned <= 0:
-                        embed = discord.Embed(
-                            title="Sell",
-                            description=f"You don't have any **{item.title()}** to sell.",
-                            color=0xd0b47b
-                        )
-                        log_econ_action("sell_fail", user, item=item, extra="No items")
-                    else:
+                    if owned > 0:
                         sell_amount = min(amount, owned)
-                        price = SHOP_ITEMS[item]["price"]
-                        total = price * sell_amount
-                        await db.execute("UPDATE inventory SET amount = amount - ? WHERE rowid = ?", (sell_amount, row[0]))
-                        await db.commit()
-                        data = await self.get_user(user.id)
-                        await self.update_user(user.id, balance=data["balance"] + total)
-                        embed = discord.Embed(
-                            title="Sell",
-                            description=f"You sold **{sell_amount} {item.title()}** for **{total}** coins!",
-                            color=0xd0b47b
-                        )
-                        log_econ_action("sell", user, amount=total, item=item, extra=f"Quantity: {sell_amount}")
+                        if sell_amount == owned:
+                            await tx.db.execute("DELETE FROM inventory WHERE rowid = ?", (row[0],))
+                        else:
+                            await tx.db.execute("UPDATE inventory SET amount = amount - ? WHERE rowid = ?", (sell_amount, row[0]))
+                        await tx.credit(user.id, price * sell_amount, "sell", memo=f"{item} x{sell_amount}")
+                self.invalidate_inventory(user.id)
+                if sell_amount <= 0:
+                    embed = discord.Embed(
+                        title="Sell",
+                        description=f"You don't have any **{item.title()}** to sell.",
+                        color=0xd0b47b
+                    )
+                    log_econ_action("sell_fail", user, item=item, extra="No items")
+                else:
+                    total = price * sell_amount
+                    embed = discord.Embed(
+                        title="Sell",
+                        description=f"You sold **{sell_amount} {item.title()}** for **{total}** coins!",
+                        color=0xd0b47b
+                    )
+                    log_econ_action("sell", user, amount=total, item=item, extra=f"Quantity: {sell_amount}")
 
         if isinstance(destination, discord.Interaction):
             await destination.response.send_message(embed=embed)
@@ -650,16 +825,7 @@ class Economy(commands.Cog):
         await self.show_inventory(interaction.user, interaction)
 
     async def show_inventory(self, user, destination):
-        rows = await self.get_inventory(user.id)
-        # Group by item, show total count (fish/junk and normal)
-        item_counts = {}
-        for rowid, item, amount, value in rows:
-            if value is None:
-                item_counts[item] = item_counts.get(item, 0) + (amount or 0)
-            else:
-                # each valued row represents one instance
-                item_counts[item] = item_counts.get(item, 0) + 1
-        nonzero_items = [(item, amt) for item, amt in item_counts.items() if amt > 0]
+        nonzero_items = await self.get_item_counts(user.id)
         if not nonzero_items:
             desc = "Your inventory is empty."
         else:
@@ -676,25 +842,15 @@ class Economy(commands.Cog):
 
     @sell_slash.autocomplete("item")
     async def sell_item_autocomplete(self, interaction: discord.Interaction, current: str):
-        inventory = await self.get_inventory(interaction.user.id)
-        item_counts = {}
-        # get_inventory returns rows as (rowid, item, amount, value)
-        for rowid, item, amount, value in inventory:
-            if value is None:
-                # normal items store an amount column
-                item_counts[item] = item_counts.get(item, 0) + (amount or 0)
-            else:
-                # valued items (fish/junk) store one row per instance
-                item_counts[item] = item_counts.get(item, 0) + 1
-        choices = [
+        item_counts = await self.get_item_counts(interaction.user.id)
+        counts = dict(item_counts)
+        return [
             app_commands.Choice(
-                name=f"{item.title()} ({amt})",
+                name=f"{item.title()} ({counts[item]})",
                 value=item
             )
-            for item, amt in item_counts.items()
-            if amt > 0
+            for item in prefix_matches([item for item, _ in item_counts], current)
         ]
-        return choices[:25]
 
     @commands.command(name="sellallfish")
     async def sellallfish_command(self, ctx):
@@ -716,28 +872,17 @@ class Economy(commands.Cog):
                     pass
 
     async def sell_all_fish(self, user, destination):
-        # inventory isn't needed here; we query per-item below
-        fish_types = FISH_TYPES + JUNK_TYPES
         total_earned = 0
         sold_items = []
-        async with aiosqlite.connect(DB_PATH) as db:
-            for item in fish_types:
-                cursor = await db.execute(
-                    "SELECT rowid, value FROM inventory WHERE user_id = ? AND item = ? AND value IS NOT NULL",
-                    (user.id, item)
-                )
-                rows = await cursor.fetchall()
-                if rows:
-                    earned = sum(row[1] for row in rows)
-                    for rid, _ in rows:
-                        await db.execute("DELETE FROM inventory WHERE rowid = ?", (rid,))
-                    await db.commit()
-                    data = await self.get_user(user.id)
-                    await self.update_user(user.id, balance=data["balance"] + earned)
-                    total_earned += earned
-                    sold_items.append(f"**{item.title()}** x{len(rows)} (**{earned}** coins)")
-                    log_econ_action("sell-all-fish", user, amount=earned, item=item, extra=f"Quantity: {len(rows)}")
-            await db.commit()
+        async with self.ledger.transaction() as tx:
+            sold = await self._sell_valued_items(tx.db, user.id, FISH_TYPES + JUNK_TYPES)
+            total_earned = sum(earned for _, _, earned in sold)
+            if total_earned > 0:
+                await tx.credit(user.id, total_earned, "sellallfish")
+        self.invalidate_inventory(user.id)
+        for item, count, earned in sold:
+            sold_items.append(f"**{item.title()}** x{count} (**{earned}** coins)")
+            log_econ_action("sell-all-fish", user, amount=earned, item=item, extra=f"Quantity: {count}")
 
         if sold_items:
             desc = "You sold:\n" + "\n".join(sold_items) + f"\n\nTotal earned: **{total_earned}** coins!"
@@ -788,8 +933,10 @@ class Economy(commands.Cog):
         await self.deposit(interaction.user, amount, interaction)
 
     async def deposit(self, user, amount, destination):
-        data = await self.get_user(user.id)
-        if amount <= 0 or data["balance"] < amount:
+        moved = None
+        if amount > 0:
+            moved = await self.ledger.transfer(user.id, user.id, amount, "deposit", from_account="balance", to_account="bank")
+        if moved is None:
             embed = discord.Embed(
                 title="Deposit",
                 description="Invalid amount or insufficient wallet funds.",
@@ -797,7 +944,6 @@ class Economy(commands.Cog):
             )
             log_econ_action("deposit_fail", user, amount=amount)
         else:
-            await self.update_user(user.id, balance=data["balance"] - amount, bank=data["bank"] + amount)
             embed = discord.Embed(
                 title="Deposit",
                 description=f"You deposited **{amount}** coins from your wallet to your bank.",
@@ -828,9 +974,19 @@ class Economy(commands.Cog):
             )
             log_econ_action("rob_fail", user, extra="Tried to rob self")
         else:
-            user_data = await self.get_user(user.id)
-            target_data = await self.get_user(target.id)
-            if target_data["balance"] < 100:
+            too_poor = False
+            success = random.random() < 0.5
+            stolen = loss = 0
+            async with self.ledger.transaction() as tx:
+                target_data = await tx.get_account(target.id)
+                if target_data["balance"] < 100:
+                    too_poor = True
+                elif success:
+                    stolen = random.randint(50, min(500, target_data["balance"]))
+                    await tx.transfer(target.id, user.id, stolen, "rob")
+                else:
+                    loss, _ = await tx.debit_up_to(user.id, random.randint(20, 100), "rob_fine", counterparty_id=target.id)
+            if too_poor:
                 embed = discord.Embed(
                     title="Rob",
                     description="Target doesn't have enough coins in their wallet to rob!",
@@ -838,11 +994,7 @@ class Economy(commands.Cog):
                 )
                 log_econ_action("rob_fail", user, extra=f"Target {target} ({target.id}) too poor")
             else:
-                success = random.random() < 0.5
                 if success:
-                    stolen = random.randint(50, min(500, target_data["balance"]))
-                    await self.update_user(user.id, balance=user_data["balance"] + stolen)
-                    await self.update_user(target.id, balance=target_data["balance"] - stolen)
                     embed = discord.Embed(
                         title="Rob",
                         description=f"You robbed {target.mention} and stole **{stolen}** coins from their wallet!",
@@ -850,8 +1002,6 @@ class Economy(commands.Cog):
                     )
                     log_econ_action("rob", user, amount=stolen, extra=f"target={target} ({target.id})")
                 else:
-                    loss = random.randint(20, 100)
-                    await self.update_user(user.id, balance=max(0, user_data["balance"] - loss))
                     embed = discord.Embed(
                         title="Rob",
                         description=f"You got caught and lost **{loss}** coins!",
@@ -898,29 +1048,30 @@ class Economy(commands.Cog):
                 color=0xd0b47b
             )
         else:
-            data = await self.get_user(user.id)
-            if amount > data["balance"] or amount <= 0:
+            win_color = random.choices(
+                population=["red", "black", "green"],
+                weights=[18, 18, 2],
+                k=1
+            )[0]
+            winnings = amount * ROULETTE_COLORS[color]
+            staked = False
+            if amount > 0:
+                async with self.ledger.transaction() as tx:
+                    # The stake must be covered up front; a win pays it back plus the winnings
+                    staked = await tx.debit_if_sufficient(user.id, amount, "roulette") is not None
+                    if staked and color == win_color:
+                        await tx.credit(user.id, amount + winnings, "roulette")
+            if not staked:
                 embed = discord.Embed(
                     title="Roulette",
                     description="Invalid bet amount.",
                     color=0xd0b47b
                 )
             else:
-                win_color = random.choices(
-                    population=["red", "black", "green"],
-                    weights=[18, 18, 2],
-                    k=1
-                )[0]
                 if color == win_color:
-                    multiplier = ROULETTE_COLORS[color]
-                    winnings = amount * multiplier
-                    new_balance = data["balance"] + winnings
                     result = f"You won! The ball landed on **{win_color}**. You won **{winnings}** coins!"
                 else:
-                    winnings = -amount
-                    new_balance = data["balance"] + winnings
                     result = f"You lost! The ball landed on **{win_color}**. You lost **{amount}** coins."
-                await self.update_user(user.id, balance=new_balance)
                 embed = discord.Embed(
                     title="Roulette",
                     description=result,
@@ -941,10 +1092,12 @@ class Economy(commands.Cog):
         await self.crime(interaction.user, interaction)
 
     async def crime(self, user, destination):
-        data = await self.get_user(user.id)
         result = random.choice(CRIME_REWARDS)
-        new_balance = max(0, data["balance"] + result["amount"])
-        await self.update_user(user.id, balance=new_balance)
+        if result["amount"] > 0:
+            await self.ledger.credit(user.id, result["amount"], "crime", memo=result["desc"])
+        else:
+            async with self.ledger.transaction() as tx:
+                await tx.debit_up_to(user.id, -result["amount"], "crime", memo=result["desc"])
         embed = discord.Embed(
             title="Crime",
             description=f"{result['desc']} {'You gained' if result['amount'] > 0 else 'You lost'} **{abs(result['amount'])}** coins!",
@@ -967,8 +1120,14 @@ class Economy(commands.Cog):
         await self.bankheist(interaction.user, amount, interaction)
 
     async def bankheist(self, user, amount, destination):
-        data = await self.get_user(user.id)
-        if amount <= 0 or data["bank"] < amount:
+        success = random.random() < 0.3  # 30% chance to succeed
+        staked = False
+        if amount > 0:
+            async with self.ledger.transaction() as tx:
+                staked = await tx.debit_if_sufficient(user.id, amount, "bankheist", account="bank") is not None
+                if staked and success:
+                    await tx.credit(user.id, amount * 2, "bankheist")
+        if not staked:
             embed = discord.Embed(
                 title="Bank Heist",
                 description="Invalid amount or insufficient bank funds.",
@@ -976,10 +1135,8 @@ class Economy(commands.Cog):
             )
             log_econ_action("bankheist_fail", user, amount=amount)
         else:
-            success = random.random() < 0.3  # 30% chance to succeed
             if success:
                 winnings = amount * 2
-                await self.update_user(user.id, bank=data["bank"] - amount, balance=data["balance"] + winnings)
                 embed = discord.Embed(
                     title="Bank Heist",
                     description=f"You pulled off the heist and got **{winnings}** coins!",
@@ -987,7 +1144,6 @@ class Economy(commands.Cog):
                 )
                 log_econ_action("bankheist", user, amount=winnings)
             else:
-                await self.update_user(user.id, bank=data["bank"] - amount)
                 embed = discord.Embed(
                     title="Bank Heist",
                     description=f"You got caught! You lost **{amount}** coins from your bank.",
@@ -1016,6 +1172,47 @@ class Economy(commands.Cog):
         else:
             raise error
 
+    @commands.command(name="econaudit")
+    @commands.has_guild_permissions(administrator=True)
+    async def econaudit_command(self, ctx, user: discord.Member, limit: int = 15):
+        await self.econ_audit(user, limit, ctx)
+
+    @app_commands.command(name="econ_audit", description="Show a user's recent economy actions (admin only).")
+    @app_commands.describe(user="User to audit", limit="How many actions to show (max 25)")
+    async def econaudit_slash(self, interaction: discord.Interaction, user: discord.Member, limit: int = 15):
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+            return
+        await self.econ_audit(user, limit, interaction)
+
+    async def econ_audit(self, user, limit, destination):
+        limit = max(1, min(limit, 25))
+        records = await econ_log.recent_for_user(user.id, limit)
+        if records:
+            lines = []
+            for r in records:
+                line = f"`{r['ts'].replace('T', ' ')}` **{r['command']}**"
+                if "amount" in r:
+                    line += f" {r['amount']}"
+                if "item" in r:
+                    line += f" · {r['item']}"
+                if "extra" in r:
+                    line += f" · {r['extra']}"
+                lines.append(line[:200])
+            desc = "\n".join(lines)
+        else:
+            desc = "No economy actions logged for this user."
+        embed = discord.Embed(
+            title=f"Economy Audit: {user}",
+            description=desc[:4096],
+            color=0xd0b47b
+        )
+        embed.set_footer(text=f"Newest first · {len(records)} shown")
+        if isinstance(destination, discord.Interaction):
+            await destination.response.send_message(embed=embed, ephemeral=True)
+        else:
+            await destination.send(embed=embed)
+
     @commands.command(name="buy")
     async def buy_command(self, ctx, item: str, amount: int = 1):
         await self.buy(ctx.author, item.lower(), amount, ctx)
@@ -1025,8 +1222,16 @@ class Economy(commands.Cog):
     async def buy_slash(self, interaction: discord.Interaction, item: str, amount: int = 1):
         await self.buy(interaction.user, item.lower(), amount, interaction)
 
+    @buy_slash.autocomplete("item")
+    async def buy_item_autocomplete(self, interaction: discord.Interaction, current: str):
+        items = SHOP_CATALOG.items
+        return [
+            app_commands.Choice(name=f"{item.title()} ({items[item]['price']} coins)", value=item)
+            for item in SHOP_CATALOG.complete(current)
+        ]
+
     async def buy(self, user, item, amount, destination):
-        if item not in SHOP_ITEMS:
+        if item not in SHOP_CATALOG.items:
             embed = discord.Embed(
                 title="Buy",
                 description="That item doesn't exist in the shop.",
@@ -1041,10 +1246,14 @@ class Economy(commands.Cog):
             )
             log_econ_action("buy_fail", user, item=item, extra="Invalid amount")
         else:
-            price = SHOP_ITEMS[item]["price"]
+            price = SHOP_CATALOG.items[item]["price"]
             total_cost = price * amount
-            data = await self.get_user(user.id)
-            if data["balance"] < total_cost:
+            async with self.ledger.transaction() as tx:
+                paid = await tx.debit_if_sufficient(user.id, total_cost, "buy", memo=f"{item} x{amount}") is not None
+                if paid:
+                    await self._insert_item(tx.db, user.id, item, amount)
+            self.invalidate_inventory(user.id)
+            if not paid:
                 embed = discord.Embed(
                     title="Buy",
                     description=f"You don't have enough coins. You need **{total_cost}** coins.",
@@ -1052,8 +1261,6 @@ class Economy(commands.Cog):
                 )
                 log_econ_action("buy_fail", user, item=item, amount=total_cost, extra="Insufficient funds")
             else:
-                await self.update_user(user.id, balance=data["balance"] - total_cost)
-                await self.add_item(user.id, item, amount)
                 embed = discord.Embed(
                     title="Buy",
                     description=f"You bought **{amount} {item.title()}** for **{total_cost}** coins!",
@@ -1075,8 +1282,10 @@ class Economy(commands.Cog):
         await self.withdraw(interaction.user, amount, interaction)
 
     async def withdraw(self, user, amount, destination):
-        data = await self.get_user(user.id)
-        if amount <= 0 or data["bank"] < amount:
+        moved = None
+        if amount > 0:
+            moved = await self.ledger.transfer(user.id, user.id, amount, "withdraw", from_account="bank", to_account="balance")
+        if moved is None:
             embed = discord.Embed(
                 title="Withdraw",
                 description="Invalid amount or insufficient bank funds.",
@@ -1084,7 +1293,6 @@ class Economy(commands.Cog):
             )
             log_econ_action("withdraw_fail", user, amount=amount)
         else:
-            await self.update_user(user.id, balance=data["balance"] + amount, bank=data["bank"] - amount)
             embed = discord.Embed(
                 title="Withdraw",
                 description=f"You withdrew **{amount}** coins from your bank to your wallet.",
@@ -1100,7 +1308,7 @@ class Economy(commands.Cog):
     # No changes needed if you already use data["balance"] for all spending checks and updates.
 
 def get_shop_embed(page=1):
-    items = list(SHOP_ITEMS.items())
+    items = list(SHOP_CATALOG.items.items())
     total_pages = max(1, math.ceil(len(items) / SHOP_ITEMS_PER_PAGE))
     page = max(1, min(page, total_pages))
     start = (page - 1) * SHOP_ITEMS_PER_PAGE
@@ -1134,7 +1342,7 @@ class ShopView(discord.ui.View):
 
     @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
     async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
-        items = list(SHOP_ITEMS.items())
+        items = list(SHOP_CATALOG.items.items())
         total_pages = max(1, math.ceil(len(items) / SHOP_ITEMS_PER_PAGE))
         if self.page < total_pages:
             self.page += 1
@@ -1143,5 +1351,34 @@ class ShopView(discord.ui.View):
         else:
             await interaction.response.defer()
 
+class LeaderboardView(discord.ui.View):
+    def __init__(self, cog, page=1, total_pages=1):
+        super().__init__(timeout=60)
+        self.cog = cog
+        self.page = page
+        self.total_pages = total_pages
+
+    async def show(self, interaction: discord.Interaction, page=1, user=None):
+        embed, view = await self.cog.build_leaderboard(page, user)
+        await interaction.response.edit_message(embed=embed, view=view)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.page > 1:
+            await self.show(interaction, self.page - 1)
+        else:
+            await interaction.response.defer()
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.page < self.total_pages:
+            await self.show(interaction, self.page + 1)
+        else:
+            await interaction.response.defer()
+
+    @discord.ui.button(label="My Position", style=discord.ButtonStyle.primary)
+    async def my_position(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show(interaction, user=interaction.user)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(Economy(bot))
\ No newline at end of file
@@ -1,17 +1,26 @@
 import os
+import io
+import asyncio
+import tempfile
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiosqlite
 import datetime
 import uuid
 from typing import Optional
+from utils.role_updates import apply_role_changes
+from utils.fts_index import ensure_fts_index, ensure_keyed_table
+from utils.keyset_pages import KeysetPageView, fts_match_query, keyset_clause
+from utils.event_log import TombstoneLog
 
 INFRACTION_DB = "data/infractions.db"
 LOG_FILE = "logs/infraction_command.log"
 
-INFRACTION_LOG_TEXT = os.path.join("logs", "infraction.txt")
+# Append-only issue/void events; the human-readable text is generated from it on demand
+INFRACTION_EVENT_LOG = os.path.join("logs", "infraction_events.jsonl")
 INFRACTION_VIEW_CHANNEL_ID = 1343686645815181382
+LIST_PAGE_SIZE = 5
+LOG_PAGE_SIZE = 10
 
 INFRACTION_CHANNEL_ID = int(os.getenv("INFRACTION_CHANNEL_ID"))
 INFRACTION_LOG_CHANNEL_ID = int(os.getenv("INFRACTION_LOG_CHANNEL_ID"))
@@ -37,8 +46,59 @@ def log_to_file(user_id, channel_id, message, embed=False):
     now = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
     with open(LOG_FILE, "a", encoding="utf-8") as f:
         f.write(f"[{now}] User: {user_id} | Channel: {channel_id} | Embed: {embed} | Message: {message}\n")
-    with open(INFRACTION_LOG_TEXT, "a", encoding="utf-8") as f:
-        f.write(f"[{now}] User: {user_id} | Channel: {channel_id} | {message}\n")
+
+def format_infraction_event(record):
+    line = (
+        f"[{record['ts']}] {record.get('user')} ({record.get('user_id')}) | "
+        f"By: {record.get('moderator')} ({record.get('moderator_id')}) | {record.get('action')} | "
+        f"Reason: {record.get('reason')} | Proof: {record.get('proof') or 'None'} | "
+        f"Infraction ID: {record.get('infraction_id')}"
+    )
+    if record.get("voided_by"):
+        line += f" | VOIDED by {record['voided_by']}: {record.get('void_reason') or 'No reason provided.'}"
+    return line + "\n"
+
+def write_infraction_export(events, out, include_voided=False):
+    """Stream the event log as text into the file-like `out`; returns the number of infractions written."""
+    voids = {}
+    if include_voided:
+        voids = {r["infraction_id"]: r for r in events.records() if r.get("event") == "void"}
+    count = 0
+    for record in events.live(include_tombstoned=include_voided):
+        void = voids.get(record.get("infraction_id"))
+        if void:
+            record = {**record, "voided_by": void.get("by"), "void_reason": void.get("reason")}
+        out.write(format_infraction_event(record))
+        count += 1
+    return count
+
+def build_infraction_export(events, include_voided=False):
+    """Stream an export into its own anonymous temp file, so concurrent exports never share one.
+
+    Returns (binary file positioned at the start, count); the caller closes the file.
+    """
+    out = tempfile.TemporaryFile()
+    text = io.TextIOWrapper(out, encoding="utf-8")
+    try:
+        count = write_infraction_export(events, text, include_voided)
+        text.flush()
+    except Exception:
+        text.close()
+        raise
+    text.detach()
+    out.seek(0)
+    return out, count
+
+def backfill_event_records(rows):
+    """Issue (and void) events for infractions recorded in the database before the event log existed."""
+    for (infraction_id, user_id, user_name, moderator_id, moderator_name,
+         action, reason, proof, date, voided, void_reason) in rows:
+        yield {
+            "ts": date, "event": "issue", "infraction_id": infraction_id, "user_id": user_id, "user": user_name,
+            "moderator_id": moderator_id, "moderator": moderator_name, "action": action, "reason": reason, "proof": proof
+        }
+        if voided:
+            yield {"ts": date, "event": "void", "infraction_id": infraction_id, "by": "Unknown (backfilled)", "reason": void_reason}
 
 def log_command_to_txt(command_name, user, channel, **fields):
     log_path = os.path.join("logs", f"{command_name}.txt")
@@ -49,6 +109,19 @@ def log_command_to_txt(command_name, user, channel, **fields):
             f.write(f"  {k}: {v}\n")
         f.write("\n")
 
+def add_infraction_field(embed, row, show_user=False):
+    date, _, infraction_id, user_name, moderator_name, action, reason, proof, voided, void_reason = row
+    value = f"**User:** {user_name}\n" if show_user else ""
+    value += (
+        f"**Type:** {action}\n"
+        f"**Reason:** {reason}\n"
+        f"**Date:** {date}\n"
+        f"**ID:** `{infraction_id}`\n"
+    )
+    if voided:
+        value += f"**VOIDED**: {void_reason or 'No reason provided.'}\n"
+    embed.add_field(name="\u200b", value=value, inline=False)
+
 class ConfirmView(discord.ui.View):
     def __init__(self):
         super().__init__(timeout=30)
@@ -146,12 +219,14 @@ class Infraction(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_path = INFRACTION_DB
+        self.events = TombstoneLog(INFRACTION_EVENT_LOG, key="infraction_id")
 
     async def cog_load(self):
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS infractions (
-                    infraction_id TEXT PRIMARY KEY,
+        async with self.bot.db.connection(self.db_path) as db:
+            # Explicit integer key for the search index and keyset cursors; older tables are rebuilt with it
+            await ensure_keyed_table(db, "infractions", """
+                    id INTEGER PRIMARY KEY,
+                    infraction_id TEXT NOT NULL UNIQUE,
                     user_id INTEGER,
                     user_name TEXT,
                     moderator_id INTEGER,
@@ -163,13 +238,56 @@ class Infraction(commands.Cog):
                     message_id INTEGER,
                     voided INTEGER DEFAULT 0,
                     void_reason TEXT
-                )
             """)
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_infractions_user_date ON infractions(user_id, date)")
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_infractions_voided_date ON infractions(voided, date)")
+            # External-content search index over reason/proof, kept in step by triggers
+            await ensure_fts_index(db, "infractions", ["reason", "proof"])
             await db.commit()
+            rows = []
+            if not self.events.is_backfilled() and not self.events.is_empty():
+                # Log predates the marker, so its import already happened
+                self.events.mark_backfilled()
+            if not self.events.is_backfilled():
+                cursor = await db.execute(
+                    "SELECT infraction_id, user_id, user_name, moderator_id, moderator_name, action, reason, proof, "
+                    "date, voided, void_reason FROM infractions ORDER BY date, id"
+                )
+                rows = await cursor.fetchall()
+        if rows:
+            # One-time import of infractions issued before the event log existed
+            count = await asyncio.to_thread(self.events.append_many, backfill_event_records(rows))
+            print(f"Backfilled {count} infraction events into {INFRACTION_EVENT_LOG}")
+        if not self.events.is_backfilled():
+            self.events.mark_backfilled()
+
+    async def fetch_infractions(self, cursor, limit, user_id=None, voided=None, match=None):
+        """One keyset page of infractions, newest first. Rows start with (date, id)."""
+        after, params = keyset_clause(cursor, "i")
+        where = []
+        args = []
+        if match:
+            where.append("infractions_fts MATCH ?")
+            args.append(match)
+        if user_id is not None:
+            where.append("i.user_id = ?")
+            args.append(user_id)
+        if voided is not None:
+            where.append("i.voided = ?")
+            args.append(int(voided))
+        source = "infractions_fts f JOIN infractions i ON i.id = f.rowid" if match else "infractions i"
+        async with self.bot.db.connection(self.db_path) as db:
+            result = await db.execute(
+                f"SELECT i.date, i.id, i.infraction_id, i.user_name, i.moderator_name, i.action, i.reason, i.proof, "
+                f"i.voided, i.void_reason FROM {source} WHERE {' AND '.join(where) or '1'}{after} "
+                f"ORDER BY i.date DESC, i.id DESC LIMIT ?",
+                (*args, *params, limit)
+            )
+            return await result.fetchall()
 
     async def add_infraction(self, infraction_id, user, issued_by, action, reason, proof, message_id=None):
         now = datetime.datetime.utcnow().isoformat()
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.bot.db.connection(self.db_path) as db:
             await db.execute("""
                 INSERT INTO infractions (
                     infraction_id, user_id, user_name, moderator_id, moderator_name,
@@ -177,8 +295,10 @@ class Infraction(commands.Cog):
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, NULL)
             """, (infraction_id, user.id, str(user), issued_by.id, str(issued_by), action, reason, proof, now, message_id))
             await db.commit()
-        with open(INFRACTION_LOG_TEXT, "a", encoding="utf-8") as f:
-            f.write(f"[{now}] {user} ({user.id}) | By: {issued_by} ({issued_by.id}) | {action} | Reason: {reason} | Proof: {proof or 'None'} | Infraction ID: {infraction_id}\n")
+        self.events.append(
+            "issue", infraction_id=infraction_id, user_id=user.id, user=str(user),
+            moderator_id=issued_by.id, moderator=str(issued_by), action=action, reason=reason, proof=proof
+        )
 
     def get_infraction_embed(self, infraction_id, user, issued_by, action, reason, proof, date):
         color = INFRACTION_TYPES.get(action, {}).get("color", discord.Color.default())
@@ -248,14 +368,7 @@ class Infraction(commands.Cog):
                 WARNING_1_ROLE_ID, WARNING_2_ROLE_ID,
                 STRIKE_1_ROLE_ID, STRIKE_2_ROLE_ID, STRIKE_3_ROLE_ID, SUSPENDED_ROLE_ID
             ]
-        for rid in roles_to_remove:
-            role = guild.get_role(rid)
-            if role and role in member.roles:
-                await member.remove_roles(role, reason="Infraction system discipline update")
-        for rid in roles_to_add:
-            role = guild.get_role(rid)
-            if role and role not in member.roles:
-                await member.add_roles(role, reason="Infraction system discipline update")
+        await apply_role_changes(member, add=roles_to_add, remove=roles_to_remove, reason="Infraction system discipline update")
         return None
 
     @app_commands.command(name="infraction-issue", description="Issue an infraction to personnel.")
@@ -308,6 +421,9 @@ class Infraction(commands.Cog):
         has_susp = any(r.id == SUSPENDED_ROLE_ID for r in personnel.roles)
 
         # Track what discipline action is being taken
+        roles_to_add = []
+        roles_to_remove = []
+        reasons = []
         discipline_action = None
         termination_required = False
         suspension_required = False
@@ -321,11 +437,8 @@ class Infraction(commands.Cog):
             elif not has_w2:
                 discipline_action = "warning2"
             else:
-                await personnel.remove_roles(
-                    interaction.guild.get_role(WARNING_1_ROLE_ID),
-                    interaction.guild.get_role(WARNING_2_ROLE_ID),
-                    reason="Escalated to strike"
-                )
+                roles_to_remove += [WARNING_1_ROLE_ID, WARNING_2_ROLE_ID]
+                reasons.append("Escalated to strike")
                 if not has_s1 and not has_s2 and not has_s3:
                     discipline_action = "strike1"
                 elif has_s1 and not has_s2 and not has_s3:
@@ -358,42 +471,35 @@ class Infraction(commands.Cog):
         elif action == "Termination":
             termination_required = True
 
-        # Apply discipline roles
+        # Apply discipline roles in a single edit
+        discipline_roles = {
+            "warning1": (WARNING_1_ROLE_ID, "Issued Warning 1"),
+            "warning2": (WARNING_2_ROLE_ID, "Issued Warning 2"),
+            "strike1": (STRIKE_1_ROLE_ID, "Issued Strike 1"),
+            "strike2": (STRIKE_2_ROLE_ID, "Issued Strike 2"),
+            "strike3": (STRIKE_3_ROLE_ID, "Issued Strike 3"),
+        }
+        current_role_ids = {r.id for r in personnel.roles}
         if not termination_required:
-            if discipline_action == "warning1":
-                await personnel.add_roles(interaction.guild.get_role(WARNING_1_ROLE_ID), reason="Issued Warning 1")
-            elif discipline_action == "warning2":
-                await personnel.add_roles(interaction.guild.get_role(WARNING_2_ROLE_ID), reason="Issued Warning 2")
-            elif discipline_action == "strike1":
-                await personnel.add_roles(interaction.guild.get_role(STRIKE_1_ROLE_ID), reason="Issued Strike 1")
-            elif discipline_action == "strike2":
-                await personnel.add_roles(interaction.guild.get_role(STRIKE_2_ROLE_ID), reason="Issued Strike 2")
-            elif discipline_action == "strike3":
-                await personnel.add_roles(interaction.guild.get_role(STRIKE_3_ROLE_ID), reason="Issued Strike 3")
+            if discipline_action in discipline_roles:
+                rid, why = discipline_roles[discipline_action]
+                roles_to_add.append(rid)
+                reasons.append(why)
             if suspension_required:
-                await personnel.add_roles(interaction.guild.get_role(SUSPENDED_ROLE_ID), reason="Issued Suspension")
-                await personnel.remove_roles(
-                    *(role for role in [
-                        interaction.guild.get_role(WARNING_1_ROLE_ID),
-                        interaction.guild.get_role(WARNING_2_ROLE_ID),
-                        interaction.guild.get_role(STRIKE_1_ROLE_ID),
-                        interaction.guild.get_role(STRIKE_2_ROLE_ID),
-                        interaction.guild.get_role(STRIKE_3_ROLE_ID)
-                    ] if role in personnel.roles),
-                    reason="Suspension issued"
-                )
+                roles_to_add.append(SUSPENDED_ROLE_ID)
+                roles_to_remove += [
+                    rid for rid in (WARNING_1_ROLE_ID, WARNING_2_ROLE_ID, STRIKE_1_ROLE_ID, STRIKE_2_ROLE_ID, STRIKE_3_ROLE_ID)
+                    if rid in current_role_ids
+                ]
+                reasons.append("Issued Suspension")
         if termination_required:
-            await personnel.remove_roles(
-                *(role for role in [
-                    interaction.guild.get_role(WARNING_1_ROLE_ID),
-                    interaction.guild.get_role(WARNING_2_ROLE_ID),
-                    interaction.guild.get_role(STRIKE_1_ROLE_ID),
-                    interaction.guild.get_role(STRIKE_2_ROLE_ID),
-                    interaction.guild.get_role(STRIKE_3_ROLE_ID),
-                    interaction.guild.get_role(SUSPENDED_ROLE_ID)
-                ] if role in personnel.roles),
-                reason="Termination issued"
-            )
+            roles_to_add = []
+            roles_to_remove += [
+                WARNING_1_ROLE_ID, WARNING_2_ROLE_ID,
+                STRIKE_1_ROLE_ID, STRIKE_2_ROLE_ID, STRIKE_3_ROLE_ID, SUSPENDED_ROLE_ID
+            ]
+            reasons.append("Termination issued")
+        await apply_role_changes(personnel, add=roles_to_add, remove=roles_to_remove, reason="; ".join(reasons) or None)
 
         # Issue infraction
         infraction_id = str(uuid.uuid4())
@@ -485,28 +591,22 @@ class Infraction(commands.Cog):
             for action in actions if current.lower() in action.lower()
         ][:25]
 
-    @app_commands.command(name="infraction-log", description="View the infraction log (last 10 entries).")
+    @app_commands.command(name="infraction-log", description="View the infraction log (10 entries per page).")
     async def infraction_log(self, interaction: discord.Interaction):
-        """Show the last 10 non-voided infractions in an embed."""
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                "SELECT infraction_id, user_name, moderator_name, action, reason, proof, date, voided, void_reason FROM infractions WHERE voided = 0 ORDER BY date DESC LIMIT 10"
-            )
-            rows = await cursor.fetchall()
-        if not rows:
-            embed = discord.Embed(
-                title="Infraction Log",
-                description="No infractions found.",
-                color=discord.Color.orange()
-            )
-        else:
+        """Show non-voided infractions, newest first, 10 per page."""
+        now_utc = datetime.datetime.utcnow().strftime("UTC %Y-%m-%d %H:%M")
+
+        async def fetch(cursor, limit):
+            return await self.fetch_infractions(cursor, limit, voided=False)
+
+        def render(rows, page):
             embed = discord.Embed(
                 title="Recent Infractions",
-                description="Last 10 infractions issued.",
+                description=f"Page {page} of infractions issued.",
                 color=discord.Color.orange()
             )
             for row in rows:
-                infraction_id, user_name, moderator_name, action, reason, proof, date, voided, void_reason = row
+                date, _, infraction_id, user_name, moderator_name, action, reason, proof, voided, void_reason = row
                 date_fmt = datetime.datetime.fromisoformat(date).strftime("%Y-%m-%d %H:%M")
                 value = (
                     f"**User:** {user_name}\n"
@@ -517,12 +617,21 @@ class Infraction(commands.Cog):
                     f"**Date:** {date_fmt}\n"
                     f"**ID:** `{infraction_id}`\n"
                 )
-                if voided:
-                    value += f"**VOIDED**: {void_reason or 'No reason provided.'}\n"
                 embed.add_field(name="\u200b", value=value, inline=False)
-            now_utc = datetime.datetime.utcnow().strftime("UTC %Y-%m-%d %H:%M")
             embed.set_footer(text=f"Generated: {now_utc}")
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+            return embed
+
+        view = KeysetPageView(fetch, render, page_size=LOG_PAGE_SIZE)
+        embed = await view.start()
+        if embed is None:
+            embed = discord.Embed(
+                title="Infraction Log",
+                description="No infractions found.",
+                color=discord.Color.orange()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
     @commands.command(name="infractionlog")
     async def infractionlog_command(self, ctx):
@@ -531,9 +640,9 @@ class Infraction(commands.Cog):
         if not channel:
             await ctx.send("Log channel not found.")
             return
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.bot.db.connection(self.db_path) as db:
             cursor = await db.execute(
-                "SELECT infraction_id, user_name, moderator_name, action, reason, proof, date FROM infractions WHERE voided = 0 ORDER BY date DESC LIMIT 10"
+                "SELECT infraction_id, user_name, moderator_name, action, reason, proof, date FROM infractions WHERE voided = 0 ORDER BY date DESC, id DESC LIMIT 10"
             )
             rows = await cursor.fetchall()
         if not rows:
@@ -574,7 +683,7 @@ class Infraction(commands.Cog):
                 await interaction.response.send_message("You do not have permission to void infractions.", ephemeral=True)
                 return
 
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self.bot.db.connection(self.db_path) as db:
                 cursor = await db.execute(
                     "SELECT user_id, user_name, action, reason, date, message_id, voided FROM infractions WHERE infraction_id = ?",
                     (infraction_id,)
@@ -596,14 +705,7 @@ class Infraction(commands.Cog):
                 )
                 await db.commit()
 
-            log_file = os.path.join("logs", "infraction.txt")
-            if os.path.exists(log_file):
-                with open(log_file, "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                with open(log_file, "w", encoding="utf-8") as f:
-                    for line in lines:
-                        if infraction_id not in line:
-                            f.write(line)
+            self.events.tombstone(infraction_id, by=f"{interaction.user} ({interaction.user.id})", reason=reason)
 
             # Edit the original infraction message to show voided status
             inf_channel = interaction.guild.get_channel(INFRACTION_CHANNEL_ID)
@@ -644,28 +746,14 @@ class Infraction(commands.Cog):
                 now_utc = datetime.datetime.utcnow().strftime("UTC %Y-%m-%d %H:%M")
                 dm_embed.set_footer(text=f"Voided: {now_utc}")
                 await user.send(embed=dm_embed)
-                member = user
-                guild = interaction.guild
-                if action == "Warning":
-                    for rid in [WARNING_1_ROLE_ID, WARNING_2_ROLE_ID]:
-                        role = guild.get_role(rid)
-                        if role and role in member.roles:
-                            await member.remove_roles(role, reason="Infraction voided")
-                elif action == "Strike":
-                    for rid in [STRIKE_1_ROLE_ID, STRIKE_2_ROLE_ID, STRIKE_3_ROLE_ID, SUSPENDED_ROLE_ID]:
-                        role = guild.get_role(rid)
-                        if role and role in member.roles:
-                            await member.remove_roles(role, reason="Infraction voided")
-                elif action == "Suspension":
-                    role = guild.get_role(SUSPENDED_ROLE_ID)
-                    if role and role in member.roles:
-                        await member.remove_roles(role, reason="Infraction voided")
-                elif action == "Termination":
-                    for rid in [WARNING_1_ROLE_ID, WARNING_2_ROLE_ID, STRIKE_1_ROLE_ID, STRIKE_2_ROLE_ID, STRIKE_3_ROLE_ID, SUSPENDED_ROLE_ID]:
-                        role = guild.get_role(rid)
-                        if role and role in member.roles:
-                            await member.remove_roles(role, reason="Infraction voided")
+                void_roles = {
+                    "Warning": [WARNING_1_ROLE_ID, WARNING_2_ROLE_ID],
+                    "Strike": [STRIKE_1_ROLE_ID, STRIKE_2_ROLE_ID, STRIKE_3_ROLE_ID, SUSPENDED_ROLE_ID],
+                    "Suspension": [SUSPENDED_ROLE_ID],
+                    "Termination": [WARNING_1_ROLE_ID, WARNING_2_ROLE_ID, STRIKE_1_ROLE_ID, STRIKE_2_ROLE_ID, STRIKE_3_ROLE_ID, SUSPENDED_ROLE_ID],
+                }
                 # Demotion: no roles to remove
+                await apply_role_changes(user, remove=void_roles.get(action, []), reason="Infraction voided")
             except Exception:
                 pass
 
@@ -730,7 +818,7 @@ class Infraction(commands.Cog):
     @app_commands.command(name="infraction-view", description="View all details of a specific infraction by its ID.")
     @app_commands.describe(infraction_id="The infraction ID to view")
     async def infraction_view(self, interaction: discord.Interaction, infraction_id: str):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self.bot.db.connection(self.db_path) as db:
             cursor = await db.execute(
                 "SELECT infraction_id, user_id, user_name, moderator_id, moderator_name, action, reason, proof, date, voided, void_reason FROM infractions WHERE infraction_id = ?",
                 (infraction_id,)
@@ -760,42 +848,95 @@ class Infraction(commands.Cog):
     @app_commands.command(name="infraction-list", description="List all infractions for a user, paginated.")
     @app_commands.describe(user="The user to list infractions for", page="Page number (default 1)")
     async def infraction_list(self, interaction: discord.Interaction, user: discord.Member, page: Optional[int] = 1):
-        PAGE_SIZE = 5
-        offset = (page - 1) * PAGE_SIZE
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                "SELECT infraction_id, action, reason, date, voided, void_reason FROM infractions WHERE user_id = ? ORDER BY date DESC LIMIT ? OFFSET ?",
-                (user.id, PAGE_SIZE, offset)
-            )
-            rows = await cursor.fetchall()
-            # For total count
+        async with self.bot.db.connection(self.db_path) as db:
             count_cursor = await db.execute(
                 "SELECT COUNT(*) FROM infractions WHERE user_id = ?",
                 (user.id,)
             )
             total = (await count_cursor.fetchone())[0]
+        total_pages = max(1, (total + LIST_PAGE_SIZE - 1) // LIST_PAGE_SIZE)
 
-        if not rows:
-            await interaction.response.send_message("No infractions found for this user on this page.", ephemeral=True)
+        async def fetch(cursor, limit):
+            return await self.fetch_infractions(cursor, limit, user_id=user.id)
+
+        def render(rows, page):
+            embed = discord.Embed(
+                title=f"Infractions for {user} (Page {page}/{total_pages})",
+                color=discord.Color.orange()
+            )
+            for row in rows:
+                add_infraction_field(embed, row)
+            embed.set_footer(text=f"Total Infractions: {total}")
+            return embed
+
+        view = KeysetPageView(fetch, render, page_size=LIST_PAGE_SIZE)
+        embed = await view.start(page or 1)
+        if embed is None:
+            await interaction.response.send_message("No infractions found for this user.", ephemeral=True)
             return
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
-        embed = discord.Embed(
-            title=f"Infractions for {user} (Page {page}/{(total + PAGE_SIZE - 1)//PAGE_SIZE})",
-            color=discord.Color.orange()
-        )
-        for row in rows:
-            infraction_id, action, reason, date, voided, void_reason = row
-            value = (
-                f"**Type:** {action}\n"
-                f"**Reason:** {reason}\n"
-                f"**Date:** {date}\n"
-                f"**ID:** `{infraction_id}`\n"
+    @app_commands.command(name="infraction-search", description="Search infraction reasons and proof by keyword.")
+    @app_commands.describe(query="Keywords to search for", user="Only search this user's infractions")
+    async def infraction_search(self, interaction: discord.Interaction, query: str, user: Optional[discord.Member] = None):
+        if not any(r.id == INFRACTION_PERMISSIONS_ROLE_ID for r in getattr(interaction.user, "roles", [])):
+            await interaction.response.send_message("You do not have permission to search infractions.", ephemeral=True)
+            return
+        match = fts_match_query(query)
+        if not match:
+            await interaction.response.send_message("Please enter at least one keyword.", ephemeral=True)
+            return
+
+        async def fetch(cursor, limit):
+            return await self.fetch_infractions(cursor, limit, user_id=user.id if user else None, match=match)
+
+        def render(rows, page):
+            embed = discord.Embed(
+                title=f"Infraction Search: {query} (Page {page})",
+                color=discord.Color.orange()
             )
-            if voided:
-                value += f"**VOIDED**: {void_reason or 'No reason provided.'}\n"
-            embed.add_field(name="\u200b", value=value, inline=False)
-        embed.set_footer(text=f"Total Infractions: {total}")
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+            for row in rows:
+                add_infraction_field(embed, row, show_user=True)
+            if user:
+                embed.set_footer(text=f"Filtered to {user}")
+            return embed
+
+        view = KeysetPageView(fetch, render, page_size=LIST_PAGE_SIZE)
+        embed = await view.start()
+        if embed is None:
+            await interaction.response.send_message("No infractions matched your search.", ephemeral=True)
+            return
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+
+    @app_commands.command(name="infraction-export", description="Export the infraction log as a text file.")
+    @app_commands.describe(include_voided="Include voided infractions (marked as voided)")
+    async def infraction_export(self, interaction: discord.Interaction, include_voided: bool = False):
+        if not any(r.id == INFRACTION_PERMISSIONS_ROLE_ID for r in getattr(interaction.user, "roles", [])):
+            await interaction.response.send_message("You do not have permission to export infractions.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True)
+        export, count = await asyncio.to_thread(build_infraction_export, self.events, include_voided)
+        try:
+            if not count:
+                await interaction.followup.send("No infractions to export.", ephemeral=True)
+                return
+            await interaction.followup.send(
+                f"Exported {count} infractions.",
+                file=discord.File(export, filename="infractions.txt"),
+                ephemeral=True
+            )
+        finally:
+            export.close()
+
+    @app_commands.command(name="infraction-log-compact", description="Drop voided infractions from the infraction event log (admin only).")
+    async def infraction_log_compact(self, interaction: discord.Interaction):
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("You need administrator permissions to use this command.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True)
+        kept, dropped = await self.events.compact()
+        log_command_to_txt("infraction-log-compact", interaction.user, interaction.channel, kept=kept, dropped=dropped)
+        await interaction.followup.send(f"Infraction event log compacted: kept {kept} records, dropped {dropped}.", ephemeral=True)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(Infraction(bot))
\ No newline at end of file
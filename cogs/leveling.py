@@ -1,14 +1,35 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-import aiosqlite
 import asyncio
+import bisect
 import os
+from utils.role_updates import apply_role_changes
 
 XP_PER_MESSAGE = int(os.getenv("XP_PER_MESSAGE", 10))
 XP_INCREMENT = int(os.getenv("XP_INCREMENT_PER_LEVEL", 25))
 XP_BASE = int(os.getenv("XP_BASE_REQUIREMENT", 100))
 DB_PATH = os.getenv("DB_FILE", "data/leveling.db")
+XP_FLUSH_SECONDS = int(os.getenv("XP_FLUSH_SECONDS", 5))
+
+# Precomputed cumulative XP thresholds: XP_THRESHOLDS[level] is the XP needed to leave `level`
+XP_THRESHOLD_LEVELS = 1000
+
+
+def required_xp_for_level(level):
+    # Closed form of XP_BASE + sum(XP_BASE + XP_INCREMENT * (i-1) for i in 1..level)
+    return XP_BASE * (level + 1) + XP_INCREMENT * level * (level - 1) // 2
+
+
+XP_THRESHOLDS = [required_xp_for_level(lvl) for lvl in range(XP_THRESHOLD_LEVELS)]
+
+
+def level_for_xp(xp):
+    """Return the level reached with `xp` total XP (O(log n) via bisect)."""
+    while xp >= XP_THRESHOLDS[-1]:
+        XP_THRESHOLDS.extend(required_xp_for_level(lvl) for lvl in range(len(XP_THRESHOLDS), len(XP_THRESHOLDS) * 2))
+    return bisect.bisect_right(XP_THRESHOLDS, xp)
+
 
 LEVEL_ROLES = {
     5: 1368257473546551369,
@@ -30,10 +51,13 @@ class Leveling(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db_lock = asyncio.Lock()
+        # In-memory XP state; dirty user ids are written back in batches by flush_xp
+        self.xp_cache = {}
+        self.dirty_users = set()
 
     async def cog_load(self):
         os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with self.bot.db.connection(DB_PATH) as db:
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS users (
                     user_id INTEGER PRIMARY KEY,
@@ -41,43 +65,74 @@ class Leveling(commands.Cog):
                     level INTEGER NOT NULL
                 )
             """)
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_users_xp ON users(xp)")
             await db.commit()
+        self.flush_xp.start()
+
+    async def cog_unload(self):
+        self.flush_xp.cancel()
+        await self.flush()
+
+    @tasks.loop(seconds=XP_FLUSH_SECONDS)
+    async def flush_xp(self):
+        await self.flush()
+
+    async def flush(self):
+        """Write all buffered XP changes in a single transaction."""
+        if not self.dirty_users:
+            return
+        async with self.db_lock:
+            user_ids = list(self.dirty_users)
+            self.dirty_users.clear()
+            rows = [(uid, self.xp_cache[uid]["xp"], self.xp_cache[uid]["level"]) for uid in user_ids]
+            try:
+                async with self.bot.db.connection(DB_PATH) as db:
+                    await db.executemany("""
+                        INSERT INTO users (user_id, xp, level) VALUES (?, ?, ?)
+                        ON CONFLICT(user_id) DO UPDATE SET xp = excluded.xp, level = excluded.level
+                    """, rows)
+                    await db.commit()
+            except Exception as e:
+                self.dirty_users.update(user_ids)
+                print(f"Failed to flush XP for {len(rows)} users: {e}")
 
     def calculate_required_xp(self, level):
         # Progressive XP: Each level requires previous + XP_BASE + (XP_INCREMENT * (level-1))
-        if level == 0:
-            return XP_BASE
-        xp = XP_BASE
-        for i in range(1, level + 1):
-            xp += XP_BASE + XP_INCREMENT * (i - 1)
-        return xp
+        if level < len(XP_THRESHOLDS):
+            return XP_THRESHOLDS[level]
+        return required_xp_for_level(level)
 
     async def get_user_data(self, user_id):
-        async with self.db_lock:
-            async with aiosqlite.connect(DB_PATH) as db:
-                cursor = await db.execute("SELECT xp, level FROM users WHERE user_id = ?", (user_id,))
-                row = await cursor.fetchone()
+        cached = self.xp_cache.get(user_id)
+        if cached is None:
+            async with self.db_lock:
+                async with self.bot.db.connection(DB_PATH) as db:
+                    cursor = await db.execute("SELECT xp, level FROM users WHERE user_id = ?", (user_id,))
+                    row = await cursor.fetchone()
+            # Another message may have populated the cache while we awaited the DB
+            cached = self.xp_cache.get(user_id)
+            if cached is None:
                 if row:
-                    return {"xp": row[0], "level": row[1]}
+                    cached = {"xp": row[0], "level": row[1]}
                 else:
-                    await db.execute("INSERT INTO users (user_id, xp, level) VALUES (?, ?, ?)", (user_id, 0, 0))
-                    await db.commit()
-                    return {"xp": 0, "level": 0}
+                    cached = {"xp": 0, "level": 0}
+                    self.dirty_users.add(user_id)
+                self.xp_cache[user_id] = cached
+        return dict(cached)
 
     async def update_user_data(self, user_id, xp, level):
-        async with self.db_lock:
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute("UPDATE users SET xp = ?, level = ? WHERE user_id = ?", (xp, level, user_id))
-                await db.commit()
+        self.xp_cache[user_id] = {"xp": xp, "level": level}
+        self.dirty_users.add(user_id)
 
     async def get_rank(self, user_id):
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute("SELECT user_id, xp FROM users ORDER BY xp DESC")
-            users = await cursor.fetchall()
-            for index, (uid, _) in enumerate(users, start=1):
-                if uid == user_id:
-                    return index
-        return None
+        await self.flush()
+        async with self.bot.db.connection(DB_PATH) as db:
+            cursor = await db.execute(
+                "SELECT (SELECT COUNT(*) FROM users WHERE xp > u.xp) + 1 FROM users u WHERE u.user_id = ?",
+                (user_id,)
+            )
+            row = await cursor.fetchone()
+        return row[0] if row else None
 
     async def handle_role_rewards(self, member: discord.Member, level: int):
         awarded_role_id = LEVEL_ROLES.get(level)
@@ -88,9 +143,8 @@ class Leveling(commands.Cog):
         if not awarded_role:
             return None
 
-        roles_to_remove = [member.guild.get_role(rid) for lvl, rid in LEVEL_ROLES.items() if lvl < level]
-        await member.remove_roles(*filter(None, roles_to_remove))
-        await member.add_roles(awarded_role)
+        roles_to_remove = [rid for lvl, rid in LEVEL_ROLES.items() if lvl < level]
+        await apply_role_changes(member, add=[awarded_role], remove=roles_to_remove, reason=f"Reached level {level}")
         return awarded_role
 
     @commands.Cog.listener()
@@ -102,11 +156,9 @@ class Leveling(commands.Cog):
         data = await self.get_user_data(user_id)
         data["xp"] += XP_PER_MESSAGE
 
-        leveled_up = False
         old_level = data["level"]
-        while data["xp"] >= self.calculate_required_xp(data["level"]):
-            data["level"] += 1
-            leveled_up = True
+        data["level"] = max(old_level, level_for_xp(data["xp"]))
+        leveled_up = data["level"] > old_level
 
         await self.update_user_data(user_id, data["xp"], data["level"])
 
@@ -170,7 +222,8 @@ class Leveling(commands.Cog):
         await self.send_leaderboard_embed(interaction)
 
     async def send_leaderboard_embed(self, destination):
-        async with aiosqlite.connect(DB_PATH) as db:
+        await self.flush()
+        async with self.bot.db.connection(DB_PATH) as db:
             cursor = await db.execute(
                 "SELECT user_id, xp, level FROM users ORDER BY xp DESC LIMIT 10"
             )
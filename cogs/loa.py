@@ -1,8 +1,13 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
+import asyncio
+import bisect
+import heapq
 import json
 import os
 from datetime import datetime, timedelta, timezone
+from utils.json_writer import DebouncedJsonWriter
+from utils.role_updates import apply_role_changes
 
 LOA_REQUEST_ROLE = 1329910329701830686
 LOA_REVIEW_CHANNEL = 1329910521058558035
@@ -14,6 +19,8 @@ LOA_DATA_FILE = os.path.join(DATA_DIR, "loa_requests.json")
 LOA_LOG_FILE = os.path.join(LOGS_DIR, "loa.log")
 ACTIVE_LOAS_FILE = os.path.join(DATA_DIR, "active_loas.json")
 GUILD_ID = 1329908357812981882  # <-- Replace with your actual guild/server ID
+LOA_SAVE_DELAY_SECONDS = 1  # mutations within this window share one save
+LOA_HISTORY_PAGE_SIZE = 10
 
 def ensure_dirs():
     os.makedirs(DATA_DIR, exist_ok=True)
@@ -24,61 +31,148 @@ def log_loa_action(msg):
     with open(LOA_LOG_FILE, "a", encoding="utf-8") as f:
         f.write(f"[{datetime.now(timezone.utc).isoformat()}] {msg}\n")
 
-def save_loa_request(request):
-    ensure_dirs()
+def parse_iso_utc(s):
     try:
-        if os.path.exists(LOA_DATA_FILE):
-            with open(LOA_DATA_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        else:
-            data = []
+        d = datetime.fromisoformat(s)
+        if d.tzinfo is None:
+            return d.replace(tzinfo=timezone.utc)
+        return d.astimezone(timezone.utc)
     except Exception:
-        data = []
-    data.append(request)
-    with open(LOA_DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+        return None
 
-def update_loa_status(user_id, status):
-    ensure_dirs()
-    try:
-        with open(LOA_DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception:
-        data = []
-    for req in data:
-        if req["user_id"] == user_id and req["status"] == "Pending":
-            req["status"] = status
-    with open(LOA_DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-
-def add_active_loa(user_id, end_date):
-    ensure_dirs()
+def _load_json(path, default):
     try:
-        if os.path.exists(ACTIVE_LOAS_FILE):
-            with open(ACTIVE_LOAS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        else:
-            data = {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
     except Exception:
-        data = {}
-    data[str(user_id)] = end_date
-    with open(ACTIVE_LOAS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+        return default
 
-def remove_active_loa(user_id):
-    ensure_dirs()
-    try:
-        if os.path.exists(ACTIVE_LOAS_FILE):
-            with open(ACTIVE_LOAS_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        else:
-            data = {}
-    except Exception:
-        data = {}
-    if str(user_id) in data:
-        del data[str(user_id)]
-    with open(ACTIVE_LOAS_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+class LOARegistry:
+    """LOA requests and active LOAs held in memory.
+
+    Active LOA end dates are parsed once and kept in a min-heap so the next
+    expiry is known without scanning. Each file is saved by a DebouncedJsonWriter,
+    so a burst of mutations costs one atomic write.
+    """
+
+    def __init__(self):
+        ensure_dirs()
+        # Set up before anything is scheduled: _schedule() signals `changed`
+        self.changed = asyncio.Event()
+        self.requests = _load_json(LOA_DATA_FILE, [])
+        self.active = _load_json(ACTIVE_LOAS_FILE, {})  # str(user_id) -> end_date ISO string
+        self._writers = {
+            "requests": DebouncedJsonWriter(LOA_DATA_FILE, lambda: self.requests, LOA_SAVE_DELAY_SECONDS),
+            "active": DebouncedJsonWriter(ACTIVE_LOAS_FILE, lambda: self.active, LOA_SAVE_DELAY_SECONDS),
+        }
+        self._by_user = {}  # user_id -> ([requested_at timestamps], [requests]), both oldest first
+        for req in self.requests:
+            self._index(req)
+        self._ends = {}  # user_id -> end timestamp
+        self._heap = []  # (end timestamp, user_id); stale entries are skipped on pop
+        for user_id, end_date in self.active.items():
+            self._schedule(int(user_id), end_date)
+
+    def _index(self, request):
+        requested_at = parse_iso_utc(request.get("requested_at", ""))
+        ts = requested_at.timestamp() if requested_at else 0
+        keys, reqs = self._by_user.setdefault(request.get("user_id"), ([], []))
+        # New requests are almost always the newest, so this is an append
+        pos = bisect.bisect_right(keys, ts)
+        keys.insert(pos, ts)
+        reqs.insert(pos, request)
+
+    def _schedule(self, user_id, end_date):
+        end = parse_iso_utc(end_date)
+        if end is None:
+            self._ends.pop(user_id, None)
+            return
+        self._ends[user_id] = end.timestamp()
+        heapq.heappush(self._heap, (end.timestamp(), user_id))
+        self.changed.set()
+
+    def _mark(self, *names):
+        for name in names:
+            self._writers[name].mark_dirty()
+
+    def is_dirty(self):
+        return any(writer.dirty for writer in self._writers.values())
+
+    async def flush(self):
+        """Write whatever is dirty. Returns False if a write failed (it stays dirty for the next save)."""
+        results = [await writer.flush() for writer in self._writers.values()]
+        return all(results)
+
+    async def close(self):
+        """Final save on unload."""
+        for writer in self._writers.values():
+            await writer.close()
+
+    def add_request(self, request):
+        self.requests.append(request)
+        self._index(request)
+        self._mark("requests")
+
+    def update_status(self, user_id, status):
+        """Set every pending request of a user to `status`."""
+        changed = False
+        for req in self._by_user.get(user_id, ([], []))[1]:
+            if req["status"] == "Pending" and status != "Pending":
+                req["status"] = status
+                changed = True
+        if changed:
+            self._mark("requests")
+
+    def latest_request(self, user_id, status):
+        for req in reversed(self._by_user.get(user_id, ([], []))[1]):
+            if req.get("status") == status:
+                return req
+        return None
+
+    def history_count(self, user_id):
+        return len(self._by_user.get(user_id, ([], []))[1])
+
+    def history_page(self, user_id, page, page_size=LOA_HISTORY_PAGE_SIZE):
+        """One page of a user's requests, newest first; only that slice is touched."""
+        reqs = self._by_user.get(user_id, ([], []))[1]
+        stop = len(reqs) - page * page_size
+        if stop <= 0:
+            return []
+        return reqs[max(0, stop - page_size):stop][::-1]
+
+    def set_active(self, user_id, end_date):
+        self.active[str(user_id)] = end_date
+        self._schedule(user_id, end_date)
+        self._mark("active")
+
+    def remove_active(self, user_id):
+        self._ends.pop(int(user_id), None)
+        if self.active.pop(str(user_id), None) is None:
+            return False
+        self._mark("active")
+        return True
+
+    def active_end(self, user_id):
+        return parse_iso_utc(self.active[str(user_id)]) if str(user_id) in self.active else None
+
+    def next_expiry(self):
+        """Timestamp of the earliest active LOA end, or None."""
+        while self._heap:
+            end_ts, user_id = self._heap[0]
+            if self._ends.get(user_id) == end_ts:
+                return end_ts
+            heapq.heappop(self._heap)  # ended, removed or rescheduled since it was pushed
+        return None
+
+    def pop_expired(self, now_ts):
+        expired = []
+        while self.next_expiry() is not None and self._heap[0][0] <= now_ts:
+            _, user_id = heapq.heappop(self._heap)
+            self.remove_active(user_id)
+            expired.append(user_id)
+        return expired
+
+LOA_REGISTRY = LOARegistry()
 
 class LOARequestModal(discord.ui.Modal, title="LOA Request"):
     reason = discord.ui.TextInput(
@@ -117,7 +211,7 @@ class LOARequestModal(discord.ui.Modal, title="LOA Request"):
             "end_date": end_date.isoformat(),  # aware ISO string
             "status": "Pending"
         }
-        save_loa_request(request)
+        LOA_REGISTRY.add_request(request)
         log_loa_action(f"REQUESTED: {interaction.user} ({interaction.user.id}) for {days} days. Reason: {self.reason.value}")
 
         # embed uses UTC-aware timestamp
@@ -167,37 +261,18 @@ class LOAReviewView(discord.ui.View):
         loa_role = interaction.guild.get_role(LOA_ACTIVE_ROLE)
         await interaction.response.send_message(f"✅ LOA approved for {member.mention if member else self.user_id}.", ephemeral=True)
         log_loa_action(f"APPROVED: {member} ({self.user_id}) by {interaction.user} ({interaction.user.id})")
-        update_loa_status(self.user_id, "Approved")
+        LOA_REGISTRY.update_status(self.user_id, "Approved")
 
-        # Find end_date for this user (from requests). If not present, skip adding active LOA here;
-        # update_loa_status sets Pending->Approved for any pending entries; try to capture end_date.
-        def _parse_iso_utc(s):
-            try:
-                d = datetime.fromisoformat(s)
-                if d.tzinfo is None:
-                    return d.replace(tzinfo=timezone.utc)
-                return d.astimezone(timezone.utc)
-            except Exception:
-                return None
-
-        req_end_date = None
-        try:
-            with open(LOA_DATA_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            # pick the most recent approved entry for this user
-            for req in reversed(data):
-                if req.get("user_id") == self.user_id and req.get("status") in ("Approved", "Approved "):
-                    req_end_date = req.get("end_date")
-                    break
-        except Exception:
-            req_end_date = None
+        # update_status sets Pending->Approved for any pending entries; the most recent one gives the end_date.
+        latest = LOA_REGISTRY.latest_request(self.user_id, "Approved")
+        req_end_date = latest.get("end_date") if latest else None
 
         if req_end_date:
-            add_active_loa(self.user_id, req_end_date)
+            LOA_REGISTRY.set_active(self.user_id, req_end_date)
 
         try:
             if member and loa_role:
-                await member.add_roles(loa_role, reason="LOA approved")
+                await apply_role_changes(member, add=[loa_role], reason="LOA approved")
                 try:
                     dm_embed = discord.Embed(
                         title="✅ LOA Approved",
@@ -205,7 +280,7 @@ class LOAReviewView(discord.ui.View):
                         color=discord.Color.green()
                     )
                     if req_end_date:
-                        parsed = _parse_iso_utc(req_end_date)
+                        parsed = parse_iso_utc(req_end_date)
                         if parsed:
                             dm_embed.add_field(name="Ends", value=f"<t:{int(parsed.timestamp())}:F>", inline=False)
                     await member.send(embed=dm_embed)
@@ -221,8 +296,8 @@ class LOAReviewView(discord.ui.View):
             await interaction.response.send_message("You do not have permission to review LOA requests.", ephemeral=True)
             return
         member = interaction.guild.get_member(self.user_id)
-        update_loa_status(self.user_id, "Denied")
-        remove_active_loa(self.user_id)
+        LOA_REGISTRY.update_status(self.user_id, "Denied")
+        LOA_REGISTRY.remove_active(self.user_id)
         await interaction.response.send_message(f"❌ LOA denied for {member.mention if member else self.user_id}.", ephemeral=True)
         log_loa_action(f"DENIED: {member} ({self.user_id}) by {interaction.user} ({interaction.user.id})")
         try:
@@ -240,12 +315,91 @@ class LOAReviewView(discord.ui.View):
             pass
         await self.update_embed(interaction, "❌ Denied", interaction.user)
 
+class LOAHistoryView(discord.ui.View):
+    """Pages through a user's LOA requests; each page is sliced from the registry's per-user index."""
+
+    def __init__(self, registry, target_user, page_size=LOA_HISTORY_PAGE_SIZE):
+        super().__init__(timeout=180)
+        self.registry = registry
+        self.target_user = target_user
+        self.page_size = page_size
+        self.page = 0
+
+    def page_count(self):
+        return max(1, -(-self.registry.history_count(self.target_user.id) // self.page_size))
+
+    def build_embed(self):
+        total = self.registry.history_count(self.target_user.id)
+        pages = self.page_count()
+        self.page = min(self.page, pages - 1)
+        requests = self.registry.history_page(self.target_user.id, self.page, self.page_size)
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page >= pages - 1
+
+        embed = discord.Embed(
+            title=f"LOA History - {self.target_user.display_name}",
+            color=discord.Color.blue()
+        )
+        embed.set_author(name=str(self.target_user), icon_url=self.target_user.display_avatar.url)
+        embed.set_footer(text=f"Page {self.page + 1}/{pages} • {total} total requests")
+        
+        lines = []
+        for i, req in enumerate(requests, self.page * self.page_size + 1):
+            status = req.get("status", "Unknown")
+            reason = req.get("reason", "N/A")
+            duration = req.get("duration", 0)
+            requested_at = parse_iso_utc(req.get("requested_at", ""))
+            end_date = parse_iso_utc(req.get("end_date", ""))
+            
+            # Status emoji
+            if "Approved" in status or "✅" in status:
+                status_emoji = "✅"
+            elif "Denied" in status or "❌" in status:
+                status_emoji = "❌"
+            else:
+                status_emoji = "⏳"
+            
+            # Format date
+            date_str = f"<t:{int(requested_at.timestamp())}:D>" if requested_at else "Unknown"
+            
+            line = f"**{i}. {status_emoji} {status}** - {duration} days\n"
+            line += f"   Requested: {date_str}"
+            if end_date:
+                line += f" | Ends: <t:{int(end_date.timestamp())}:D>"
+            line += f"\n   Reason: {reason[:100]}{'...' if len(reason) > 100 else ''}\n"
+            lines.append(line)
+        
+        embed.description = "\n".join(lines) if lines else "No requests found."
+        return embed
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(0, self.page - 1)
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
 class LOACog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        ensure_dirs()
+        self.registry = LOA_REGISTRY
         self.bot.add_view(LOAReviewView(user_id=0))  # Persistent view
-        self.loa_expiry_check.start()
+        self._expiry_task = None
+
+    async def cog_load(self):
+        self._expiry_task = asyncio.create_task(self._expiry_worker())
+
+    async def cog_unload(self):
+        if self._expiry_task:
+            self._expiry_task.cancel()
+        await self.registry.close()
+
+    async def get_history(self, user_id, limit=None):
+        """A user's LOA requests, newest first."""
+        return self.registry.history_page(user_id, 0, limit or self.registry.history_count(user_id))
 
     @discord.app_commands.command(name="loa_request", description="Request a Leave of Absence (LOA).")
     async def loa_request(self, interaction: discord.Interaction):
@@ -259,11 +413,7 @@ class LOACog(commands.Cog):
             await interaction.response.send_message("Guild only.", ephemeral=True)
             return
         
-        try:
-            with open(ACTIVE_LOAS_FILE, "r", encoding="utf-8") as f:
-                active_loas = json.load(f)
-        except Exception:
-            active_loas = {}
+        active_loas = self.registry.active
         
         if not active_loas:
             embed = discord.Embed(
@@ -275,19 +425,10 @@ class LOACog(commands.Cog):
             return
         
         loa_entries = []
-        def _parse_iso_utc(s):
-            try:
-                d = datetime.fromisoformat(s)
-                if d.tzinfo is None:
-                    return d.replace(tzinfo=timezone.utc)
-                return d.astimezone(timezone.utc)
-            except Exception:
-                return None
-
         for user_id_str, end_date_str in active_loas.items():
             try:
                 user_id = int(user_id_str)
-                end_date = _parse_iso_utc(end_date_str)
+                end_date = parse_iso_utc(end_date_str)
                 member = guild.get_member(user_id)
                 if member and end_date:
                     remaining = end_date - datetime.now(timezone.utc)
@@ -335,19 +476,7 @@ class LOACog(commands.Cog):
                 await interaction.response.send_message("You can only view your own LOA history.", ephemeral=True)
                 return
         
-        try:
-            with open(LOA_DATA_FILE, "r", encoding="utf-8") as f:
-                all_requests = json.load(f)
-        except Exception:
-            all_requests = []
-        
-        # Filter requests for target user
-        user_requests = [
-            req for req in all_requests
-            if req.get("user_id") == target_user.id
-        ]
-        
-        if not user_requests:
+        if not self.registry.history_count(target_user.id):
             embed = discord.Embed(
                 title="LOA History",
                 description=f"No LOA requests found for {target_user.mention}.",
@@ -356,67 +485,8 @@ class LOACog(commands.Cog):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        def parse_date(req):
-            try:
-                dt = datetime.fromisoformat(req.get("requested_at", ""))
-                if dt.tzinfo is None:
-                    return dt.replace(tzinfo=timezone.utc)
-                return dt.astimezone(timezone.utc)
-            except Exception:
-                return datetime.min.replace(tzinfo=timezone.utc)
-        
-        user_requests.sort(key=parse_date, reverse=True)
-        
-        def _parse_iso_utc(s):
-            try:
-                d = datetime.fromisoformat(s)
-                if d.tzinfo is None:
-                    return d.replace(tzinfo=timezone.utc)
-                return d.astimezone(timezone.utc)
-            except Exception:
-                return None
-        
-        embed = discord.Embed(
-            title=f"LOA History - {target_user.display_name}",
-            color=discord.Color.blue()
-        )
-        embed.set_author(name=str(target_user), icon_url=target_user.display_avatar.url)
-        
-        # Limit to 10 most recent for display
-        display_requests = user_requests[:10]
-        
-        if len(user_requests) > 10:
-            embed.set_footer(text=f"Showing 10 most recent of {len(user_requests)} total requests")
-        
-        lines = []
-        for i, req in enumerate(display_requests, 1):
-            status = req.get("status", "Unknown")
-            reason = req.get("reason", "N/A")
-            duration = req.get("duration", 0)
-            requested_at = _parse_iso_utc(req.get("requested_at", ""))
-            end_date = _parse_iso_utc(req.get("end_date", ""))
-            
-            # Status emoji
-            if "Approved" in status or "✅" in status:
-                status_emoji = "✅"
-            elif "Denied" in status or "❌" in status:
-                status_emoji = "❌"
-            else:
-                status_emoji = "⏳"
-            
-            # Format date
-            date_str = f"<t:{int(requested_at.timestamp())}:D>" if requested_at else "Unknown"
-            
-            line = f"**{i}. {status_emoji} {status}** - {duration} days\n"
-            line += f"   Requested: {date_str}"
-            if end_date:
-                line += f" | Ends: <t:{int(end_date.timestamp())}:D>"
-            line += f"\n   Reason: {reason[:100]}{'...' if len(reason) > 100 else ''}\n"
-            lines.append(line)
-        
-        embed.description = "\n".join(lines) if lines else "No requests found."
-        
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        view = LOAHistoryView(self.registry, target_user)
+        await interaction.response.send_message(embed=view.build_embed(), view=view, ephemeral=True)
 
     @discord.app_commands.command(name="loa_admin", description="Admin LOA management (admin only).")
     @discord.app_commands.describe(
@@ -452,23 +522,14 @@ class LOACog(commands.Cog):
                 await interaction.response.send_message("Please provide a positive number of days to extend.", ephemeral=True)
                 return
             
-            try:
-                with open(ACTIVE_LOAS_FILE, "r", encoding="utf-8") as f:
-                    active_loas = json.load(f)
-            except Exception:
-                active_loas = {}
-            
-            if str(user.id) not in active_loas:
+            current_end = self.registry.active_end(user.id)
+            if current_end is None:
                 await interaction.response.send_message(f"{user.mention} does not have an active LOA.", ephemeral=True)
                 return
             
             # Extend the LOA
-            current_end = datetime.fromisoformat(active_loas[str(user.id)])
             new_end = current_end + timedelta(days=days)
-            active_loas[str(user.id)] = new_end.isoformat()
-            
-            with open(ACTIVE_LOAS_FILE, "w", encoding="utf-8") as f:
-                json.dump(active_loas, f, indent=2)
+            self.registry.set_active(user.id, new_end.isoformat())
             
             log_loa_action(f"EXTENDED: {user} ({user.id}) LOA extended by {days} days by {interaction.user} ({interaction.user.id})")
             
@@ -494,7 +555,7 @@ class LOACog(commands.Cog):
                 return
 
             try:
-                await user.add_roles(loa_role, reason="LOA administered by admin")
+                await apply_role_changes(user, add=[loa_role], reason="LOA administered by admin")
                 log_loa_action(f"ADMINISTERED: {user} ({user.id}) LOA role added by {interaction.user} ({interaction.user.id})")
 
                 # Treat as a requested+approved LOA so it shows in active LOAs:
@@ -522,8 +583,8 @@ class LOACog(commands.Cog):
                     "end_date": end_date.isoformat(),
                     "status": "Approved"
                 }
-                save_loa_request(request)
-                add_active_loa(user.id, end_date.isoformat())
+                self.registry.add_request(request)
+                self.registry.set_active(user.id, end_date.isoformat())
 
                 embed = discord.Embed(
                     title="LOA Administered",
@@ -552,23 +613,13 @@ class LOACog(commands.Cog):
             
             if loa_role in user.roles:
                 try:
-                    await user.remove_roles(loa_role, reason="LOA ended by admin")
+                    await apply_role_changes(user, remove=[loa_role], reason="LOA ended by admin")
                     removed_role = True
                 except Exception as e:
                     await interaction.response.send_message(f"Failed to remove LOA role: {e}", ephemeral=True)
                     return
             
-            try:
-                with open(ACTIVE_LOAS_FILE, "r", encoding="utf-8") as f:
-                    active_loas = json.load(f)
-            except Exception:
-                active_loas = {}
-            
-            if str(user.id) in active_loas:
-                del active_loas[str(user.id)]
-                with open(ACTIVE_LOAS_FILE, "w", encoding="utf-8") as f:
-                    json.dump(active_loas, f, indent=2)
-                removed_entry = True
+            removed_entry = self.registry.remove_active(user.id)
             
             log_loa_action(f"ENDED: {user} ({user.id}) LOA ended by {interaction.user} ({interaction.user.id})")
             
@@ -590,17 +641,30 @@ class LOACog(commands.Cog):
             except Exception:
                 pass
 
-    @tasks.loop(minutes=10)
-    async def loa_expiry_check(self):
-        ensure_dirs()
-        now = datetime.now(timezone.utc)
-        # Check active LOAs
-        try:
-            with open(ACTIVE_LOAS_FILE, "r", encoding="utf-8") as f:
-                active_loas = json.load(f)
-        except Exception:
-            active_loas = {}
+    async def _expiry_worker(self):
+        """Sleep until the earliest active LOA ends; any change to the active set wakes it early."""
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                self.registry.changed.clear()
+                now_ts = datetime.now(timezone.utc).timestamp()
+                expired = self.registry.pop_expired(now_ts)
+                if expired:
+                    await self.expire_loas(expired)
+                    continue
+                next_ts = self.registry.next_expiry()
+                timeout = None if next_ts is None else max(0, next_ts - now_ts)
+                try:
+                    await asyncio.wait_for(self.registry.changed.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ LOA expiry worker error: {e}")
+                await asyncio.sleep(60)
 
+    async def expire_loas(self, user_ids):
         guild = self.bot.get_guild(GUILD_ID)
         if guild is None:
             try:
@@ -609,36 +673,23 @@ class LOACog(commands.Cog):
                 guild = None
 
         loa_role = guild.get_role(LOA_ACTIVE_ROLE) if guild else None
-        expired_users = []
-        for user_id, end_date_str in active_loas.items():
-            try:
-                d = datetime.fromisoformat(end_date_str)
-                if d.tzinfo is None:
-                    end_date = d.replace(tzinfo=timezone.utc)
-                else:
-                    end_date = d.astimezone(timezone.utc)
-            except Exception:
-                continue
-            if now >= end_date:
-                member = guild.get_member(int(user_id)) if guild else None
-                if member and loa_role and loa_role in member.roles:
+        for user_id in user_ids:
+            member = guild.get_member(int(user_id)) if guild else None
+            if member and loa_role and loa_role in member.roles:
+                try:
+                    await apply_role_changes(member, remove=[loa_role], reason="LOA expired")
+                    log_loa_action(f"EXPIRED: {member} ({user_id}) LOA expired and role removed.")
                     try:
-                        await member.remove_roles(loa_role, reason="LOA expired")
-                        log_loa_action(f"EXPIRED: {member} ({user_id}) LOA expired and role removed.")
-                        try:
-                            dm_embed = discord.Embed(
-                                title="LOA expired",
-                                description="Your LOA has expired and the LOA role has been removed.",
-                                color=discord.Color.red()
-                            )
-                            await member.send(embed=dm_embed)
-                        except Exception:
-                            pass
+                        dm_embed = discord.Embed(
+                            title="LOA expired",
+                            description="Your LOA has expired and the LOA role has been removed.",
+                            color=discord.Color.red()
+                        )
+                        await member.send(embed=dm_embed)
                     except Exception:
                         pass
-                expired_users.append(user_id)
-        for user_id in expired_users:
-            remove_active_loa(user_id)
+                except Exception:
+                    pass
 
 async def setup(bot):
     await bot.add_cog(LOACog(bot))
\ No newline at end of file
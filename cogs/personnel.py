@@ -0,0 +1,197 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+PERSONNEL_RECORD_ROLE_IDS = {1355842403134603275}  # Same admin role as loa_history/delreview
+PERSONNEL_RECORD_CACHE_SECONDS = int(os.getenv("PERSONNEL_RECORD_CACHE_SECONDS", 60))
+SECTION_LIMIT = 10
+COUNT_LIMIT = 100  # rows read per section for the overview counts
+EMBED_COLOUR = 0xd0b47b
+
+
+def format_duration(seconds: int) -> str:
+    h, m = divmod(int(seconds) // 60, 60)
+    return f"{h}h {m}m"
+
+
+def format_date(value) -> str:
+    """ISO string or epoch seconds -> Discord date tag; falls back to the raw value."""
+    try:
+        if isinstance(value, (int, float)):
+            return f"<t:{int(value)}:d>"
+        d = datetime.fromisoformat(value)
+        if d.tzinfo is None:
+            d = d.replace(tzinfo=timezone.utc)
+        return f"<t:{int(d.timestamp())}:d>"
+    except Exception:
+        return str(value)
+
+
+class PersonnelRecordView(discord.ui.View):
+    def __init__(self, embeds: List[discord.Embed]):
+        super().__init__(timeout=180)
+        self.embeds = embeds
+        self.page = 0
+        self._sync_buttons()
+
+    def _sync_buttons(self):
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page >= len(self.embeds) - 1
+
+    async def _show(self, interaction: discord.Interaction):
+        self._sync_buttons()
+        await interaction.response.edit_message(embed=self.embeds[self.page], view=self)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(0, self.page - 1)
+        await self._show(interaction)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = min(len(self.embeds) - 1, self.page + 1)
+        await self._show(interaction)
+
+
+class PersonnelRecord(commands.Cog):
+    """One dossier per member, assembled from every personnel store at once."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._cache: Dict[int, tuple] = {}  # member_id -> (expires_at, [embed dicts])
+
+    # Each section returns (summary, detail lines). A missing cog raises and is shown as unavailable.
+
+    def _cog(self, name):
+        cog = self.bot.get_cog(name)
+        if cog is None:
+            raise RuntimeError(f"{name} is not loaded")
+        return cog
+
+    async def _infractions(self, member):
+        rows = await self._cog("Infraction").fetch_infractions(None, COUNT_LIMIT, user_id=member.id)
+        lines = []
+        for date, _, _, _, moderator_name, action, reason, _, voided, _ in rows[:SECTION_LIMIT]:
+            line = f"{format_date(date)} **{action}** by {moderator_name}: {(reason or '')[:80]}"
+            lines.append(f"~~{line}~~ (voided)" if voided else line)
+        active = sum(1 for row in rows if not row[8])
+        more = "+" if len(rows) >= COUNT_LIMIT else ""
+        return f"{len(rows)}{more} on record, {active}{more} active", lines
+
+    async def _blacklists(self, member):
+        rows = await self._cog("Blacklist").fetch_blacklists(None, COUNT_LIMIT, user_id=member.id)
+        lines = []
+        for date, _, _, _, reason, mcng_wide, ban, voided, _ in rows[:SECTION_LIMIT]:
+            flags = ", ".join(flag for flag, on in (("MCNG-wide", mcng_wide), ("banned", ban)) if on)
+            line = f"{format_date(date)} {(reason or '')[:80]}" + (f" ({flags})" if flags else "")
+            lines.append(f"~~{line}~~ (voided)" if voided else line)
+        active = sum(1 for row in rows if not row[7])
+        return ("**Blacklisted**" if active else "Clear") + f" ({len(rows)} on record)", lines
+
+    async def _reviews(self, member):
+        rows = await self._cog("Reviews").get_reviews(member.id, SECTION_LIMIT)
+        lines = [
+            f"{format_date(created_at)} {'⭐' * rating} by {reviewer_name}: {(reason or '')[:80]}"
+            for _, reviewer_name, rating, reason, _, _, created_at in rows
+        ]
+        if not rows:
+            return "No reviews", lines
+        return f"{len(rows)} recent, average {sum(r[2] for r in rows) / len(rows):.1f}⭐", lines
+
+    async def _loa(self, member):
+        loa = self._cog("LOACog")
+        requests = await loa.get_history(member.id, SECTION_LIMIT)
+        lines = [
+            f"{format_date(req.get('requested_at', ''))} **{req.get('status', 'Unknown')}** "
+            f"{req.get('duration', 0)} days: {str(req.get('reason', 'N/A'))[:80]}"
+            for req in requests
+        ]
+        return f"{loa.registry.history_count(member.id)} requests", lines
+
+    async def _shifts(self, member):
+        store = self._cog("ShiftCog").store
+        records = [r for r in store.records if r["user_id"] == member.id]
+        records.sort(key=lambda r: r["end_ts"], reverse=True)
+        lines = [
+            f"{format_date(r['end_ts'])} {format_duration(r['duration'])} ({r.get('breaks', 0)} breaks) `{r['id']}`"
+            for r in records[:SECTION_LIMIT]
+        ]
+        summary = f"{len(records)} shifts, {format_duration(store.total_for_user(member.id))} total"
+        if store.is_on_shift(member.id):
+            summary += " (on shift now)"
+        return summary, lines
+
+    async def _callsign(self, member):
+        callsign = await self._cog("CallsignCog").view_callsign(member)
+        return callsign, []
+
+    async def build_record(self, member: discord.Member) -> List[discord.Embed]:
+        sections = [
+            ("Infractions", self._infractions),
+            ("Blacklist", self._blacklists),
+            ("Reviews", self._reviews),
+            ("LOA History", self._loa),
+            ("Shifts", self._shifts),
+            ("Callsign", self._callsign),
+        ]
+        start = time.perf_counter()
+        results = await asyncio.gather(*(fetch(member) for _, fetch in sections), return_exceptions=True)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        overview = discord.Embed(
+            title=f"Personnel Record - {member.display_name}",
+            description=f"{member.mention} (`{member.id}`)",
+            color=EMBED_COLOUR,
+            timestamp=datetime.utcnow()
+        )
+        overview.set_thumbnail(url=member.display_avatar.url)
+        if member.joined_at:
+            overview.add_field(name="Joined", value=format_date(member.joined_at.timestamp()), inline=True)
+        detail_pages = []
+        for (title, _), result in zip(sections, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ Personnel record section {title} failed for {member.id}: {result}")
+                overview.add_field(name=title, value="Unavailable", inline=True)
+                continue
+            summary, lines = result
+            overview.add_field(name=title, value=summary, inline=True)
+            if lines:
+                page = discord.Embed(title=f"{title} - {member.display_name}", color=EMBED_COLOUR)
+                page.description = "\n".join(lines)[:4000]
+                detail_pages.append(page)
+
+        embeds = [overview] + detail_pages
+        for i, embed in enumerate(embeds, 1):
+            embed.set_footer(text=f"Page {i}/{len(embeds)} • Built in {elapsed_ms:.0f} ms")
+        return embeds
+
+    async def get_record(self, member: discord.Member) -> List[discord.Embed]:
+        now = time.monotonic()
+        cached = self._cache.get(member.id)
+        if cached and cached[0] > now:
+            return [discord.Embed.from_dict(data) for data in cached[1]]
+        embeds = await self.build_record(member)
+        self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+        self._cache[member.id] = (now + PERSONNEL_RECORD_CACHE_SECONDS, [e.to_dict() for e in embeds])
+        return embeds
+
+    @app_commands.command(name="personnel_record", description="View a member's full personnel record.")
+    @app_commands.describe(member="Member to look up")
+    async def personnel_record(self, interaction: discord.Interaction, member: discord.Member):
+        if not (interaction.user.guild_permissions.administrator
+                or any(r.id in PERSONNEL_RECORD_ROLE_IDS for r in interaction.user.roles)):
+            await interaction.response.send_message("You do not have permission to view personnel records.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True)
+        embeds = await self.get_record(member)
+        view = PersonnelRecordView(embeds)
+        await interaction.followup.send(embed=embeds[0], view=view, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(PersonnelRecord(bot))
@@ -1,7 +1,6 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import sqlite3
 import os
 from datetime import datetime
 import asyncio
@@ -40,7 +39,6 @@ class Reviews(commands.Cog):
         self.bot = bot
         os.makedirs(DATA_DIR, exist_ok=True)
         os.makedirs(LOG_DIR, exist_ok=True)
-        self.init_db()
 
         self._log_queue = asyncio.Queue()
         self.log_task = self.bot.loop.create_task(self._log_sender_task())
@@ -48,10 +46,12 @@ class Reviews(commands.Cog):
     def cog_unload(self):
         self.log_task.cancel()
 
-    def init_db(self):
-        with sqlite3.connect(DB_PATH) as conn:
-            c = conn.cursor()
-            c.execute("""
+    async def cog_load(self):
+        await self.init_db()
+
+    async def init_db(self):
+        async with self.bot.db.connection(DB_PATH) as db:
+            await db.execute("""
                 CREATE TABLE IF NOT EXISTS reviews (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     reviewer_id INTEGER NOT NULL,
@@ -65,7 +65,16 @@ class Reviews(commands.Cog):
                     created_at TEXT NOT NULL
                 )
             """)
-            conn.commit()
+            await db.commit()
+
+    async def get_reviews(self, target_id: int, limit: int = 7):
+        """Most recent reviews for a user, newest first."""
+        async with self.bot.db.connection(DB_PATH) as db:
+            cursor = await db.execute("""
+                SELECT id, reviewer_name, rating, reason, message_id, channel_id, created_at
+                FROM reviews WHERE target_id = ? ORDER BY created_at DESC LIMIT ?
+            """, (target_id, limit))
+            return await cursor.fetchall()
 
     def write_log_to_file(self, message: str):
         timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
@@ -144,9 +153,8 @@ class Reviews(commands.Cog):
 
         review_msg = await review_channel.send(f"{member.mention}", embed=embed)
 
-        with sqlite3.connect(DB_PATH) as conn:
-            c = conn.cursor()
-            c.execute("""
+        async with self.bot.db.connection(DB_PATH) as db:
+            cursor = await db.execute("""
                 INSERT INTO reviews (reviewer_id, reviewer_name, target_id, target_name, rating, reason, message_id, channel_id, created_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
@@ -160,8 +168,8 @@ class Reviews(commands.Cog):
                 review_msg.channel.id,
                 datetime.utcnow().isoformat()
             ))
-            conn.commit()
-            review_id = c.lastrowid
+            await db.commit()
+            review_id = cursor.lastrowid
 
         embed.set_footer(text=f"Review ID: {review_id} | Reviewed by {interaction.user} on {datetime.utcnow().strftime('%Y-%m-%d')}")
         await review_msg.edit(embed=embed)
@@ -175,13 +183,7 @@ class Reviews(commands.Cog):
     async def review_list(self, interaction: discord.Interaction, member: discord.Member):
         await interaction.response.defer(ephemeral=True)
 
-        with sqlite3.connect(DB_PATH) as conn:
-            c = conn.cursor()
-            c.execute("""
-                SELECT id, reviewer_name, rating, reason, message_id, channel_id, created_at
-                FROM reviews WHERE target_id = ? ORDER BY created_at DESC LIMIT 7
-            """, (member.id,))
-            reviews = c.fetchall()
+        reviews = await self.get_reviews(member.id)
 
         if not reviews:
             await interaction.followup.send(f"No reviews found for {member.display_name}.", ephemeral=True)
@@ -215,10 +217,9 @@ class Reviews(commands.Cog):
             await interaction.followup.send("❌ You do not have permission to delete reviews.", ephemeral=True)
             return
 
-        with sqlite3.connect(DB_PATH) as conn:
-            c = conn.cursor()
-            c.execute("SELECT message_id, channel_id, target_name, reviewer_name FROM reviews WHERE id=?", (review_id,))
-            row = c.fetchone()
+        async with self.bot.db.connection(DB_PATH) as db:
+            cursor = await db.execute("SELECT message_id, channel_id, target_name, reviewer_name FROM reviews WHERE id=?", (review_id,))
+            row = await cursor.fetchone()
             if not row:
                 await interaction.followup.send(f"❌ Review with ID {review_id} not found.", ephemeral=True)
                 return
@@ -233,8 +234,8 @@ class Reviews(commands.Cog):
                 except Exception:
                     pass
 
-            c.execute("DELETE FROM reviews WHERE id=?", (review_id,))
-            conn.commit()
+            await db.execute("DELETE FROM reviews WHERE id=?", (review_id,))
+            await db.commit()
 
         self.log_action(f"Review ID {review_id} deleted by {interaction.user}. Target: {target_name}, Reviewer: {reviewer_name}")
 
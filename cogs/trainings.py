@@ -4,12 +4,16 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
+import bisect
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Optional, List
 import json
 import copy
 import pytz
 import re
+from utils.json_writer import DebouncedJsonWriter
+from utils.role_updates import apply_role_changes
+from utils.worker_pool import run_rate_limited
 
 TRAINING_ROLE_ID = 1329910342301515838  # role allowed to run command
 ANNOUNCE_CHANNEL_ID = 1329910495536484374
@@ -29,10 +33,19 @@ RA_FINAL_ROLES = [
 # Role allowed to record R/A results in addition to TRAINING_ROLE_ID
 RA_TRUSTED_ROLE = 1381896956548481064
 
-# Channel to post daily role list and enforcement
+# Channel to post the daily role report
 ROLE_CHECK_CHANNEL_ID = 1449359020342378556
 
 ROLE_TIMESTAMP_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "role_timestamps.json")
+ROLE_TIMESTAMP_SAVE_DELAY_SECONDS = 2  # timestamp changes within this window share one save
+ROLE_EXPIRY_RETRY_SECONDS = 60 * 60  # wait before retrying a removal that failed (e.g. missing permissions)
+ROLE_EXPIRY_CONCURRENCY = 3
+ROLE_EXPIRY_PER_SECOND = 5
+# How long a member may hold each tracked role before it is removed
+ROLE_MAX_SECONDS = {
+    PING_ROLE_ID: 14 * 24 * 60 * 60,
+    TRAINING_PASS_ROLE: 7 * 24 * 60 * 60,
+}
 LOG_CHANNEL_ID = 1343686645815181382
 
 YES_EMOJI = discord.PartialEmoji(name="yes", id=1358812809558753401)
@@ -80,45 +93,120 @@ def build_result_embeds(trainer, trainee: discord.User, result: str, cotrainer:
     return emb_visual, emb2
 
 
-def load_role_timestamps() -> dict:
-    try:
-        if os.path.exists(ROLE_TIMESTAMP_FILE):
-            with open(ROLE_TIMESTAMP_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return {"roles": {}}
+class RoleTimestampStore:
+    """When each member got a tracked role, held in memory.
 
+    Every role keeps a map of user -> timestamp plus a list of (timestamp, user)
+    sorted by time, so the members past a deadline are a prefix of that list.
+    Persisted, that list doubles as the due-time queue for role expiry; `changed`
+    is set whenever a timestamp is added so the expiry worker can re-plan.
+    Saves go through a DebouncedJsonWriter: one atomic rewrite per burst of changes.
+    """
 
-def save_role_timestamps(data: dict):
-    try:
-        os.makedirs(os.path.dirname(ROLE_TIMESTAMP_FILE), exist_ok=True)
-        with open(ROLE_TIMESTAMP_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-    except Exception:
-        pass
+    def __init__(self, path: str):
+        self.path = path
+        self.roles: Dict[int, Dict[int, int]] = {}
+        self._by_time: Dict[int, List[tuple]] = {}
+        self._writer = DebouncedJsonWriter(path, self._snapshot, ROLE_TIMESTAMP_SAVE_DELAY_SECONDS)
+        self.changed = asyncio.Event()
+        self.load()
+
+    def load(self):
+        data = {"roles": {}}
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+        except Exception:
+            pass
+        self.roles = {}
+        self._by_time = {}
+        for role_id, members in data.get("roles", {}).items():
+            self.roles[int(role_id)] = {int(uid): int(ts) for uid, ts in members.items()}
+            self._by_time[int(role_id)] = sorted((ts, uid) for uid, ts in self.roles[int(role_id)].items())
+
+    def get(self, role_id: int, user_id: int) -> Optional[int]:
+        return self.roles.get(role_id, {}).get(user_id)
+
+    def set(self, role_id: int, user_id: int, ts: Optional[int] = None) -> int:
+        ts = int(ts or datetime.now(timezone.utc).timestamp())
+        self._unindex(role_id, user_id)
+        self.roles.setdefault(role_id, {})[user_id] = ts
+        bisect.insort(self._by_time.setdefault(role_id, []), (ts, user_id))
+        self._mark_dirty()
+        self.changed.set()
+        return ts
+
+    def remove(self, role_id: int, user_id: int) -> bool:
+        if not self._unindex(role_id, user_id):
+            return False
+        del self.roles[role_id][user_id]
+        self._mark_dirty()
+        return True
+
+    def _unindex(self, role_id: int, user_id: int) -> bool:
+        ts = self.roles.get(role_id, {}).get(user_id)
+        if ts is None:
+            return False
+        entries = self._by_time[role_id]
+        i = bisect.bisect_left(entries, (ts, user_id))
+        if i < len(entries) and entries[i] == (ts, user_id):
+            del entries[i]
+        return True
+
+    def expired(self, role_id: int, max_seconds: int, now_ts: int) -> List[tuple]:
+        """(timestamp, user_id) for members holding the role longer than max_seconds, oldest first."""
+        entries = self._by_time.get(role_id, [])
+        # Strictly older than the cutoff, matching `now - ts > max_seconds`
+        return entries[:bisect.bisect_left(entries, (now_ts - max_seconds, -1))]
+
+    def entries(self, role_id: int) -> List[tuple]:
+        """(timestamp, user_id) for a role, oldest first."""
+        return list(self._by_time.get(role_id, []))
+
+    def _mark_dirty(self):
+        self._writer.mark_dirty()
+
+    def _snapshot(self) -> dict:
+        return {"roles": {str(rid): {str(uid): ts for uid, ts in members.items()} for rid, members in self.roles.items()}}
+
+    async def flush(self) -> bool:
+        """Write the store if dirty. Returns False if the write failed (it stays dirty for the next save)."""
+        return await self._writer.flush()
+
+    async def close(self):
+        """Final save on unload."""
+        await self._writer.close()
+
+
+ROLE_TIMESTAMPS = RoleTimestampStore(ROLE_TIMESTAMP_FILE)
 
 
 def set_role_timestamp(role_id: int, user_id: int, ts: Optional[int] = None):
-    data = load_role_timestamps()
-    roles = data.setdefault("roles", {})
-    r = roles.setdefault(str(role_id), {})
-    r[str(user_id)] = int(ts or datetime.now(timezone.utc).timestamp())
-    save_role_timestamps(data)
+    return ROLE_TIMESTAMPS.set(role_id, user_id, ts)
 
 
 def remove_role_timestamp(role_id: int, user_id: int):
-    data = load_role_timestamps()
-    roles = data.get("roles", {})
-    r = roles.get(str(role_id), {})
-    if str(user_id) in r:
-        del r[str(user_id)]
-        save_role_timestamps(data)
+    ROLE_TIMESTAMPS.remove(role_id, user_id)
 
 
 def get_role_timestamp(role_id: int, user_id: int) -> Optional[int]:
-    data = load_role_timestamps()
-    return data.get("roles", {}).get(str(role_id), {}).get(str(user_id))
+    return ROLE_TIMESTAMPS.get(role_id, user_id)
+
+
+def chunk_lines(lines: List[str], limit: int = 1024) -> List[str]:
+    """Join lines into newline-separated chunks no longer than `limit` (e.g. embed field values)."""
+    chunks, cur, cur_len = [], [], 0
+    for line in lines:
+        line = line[:limit]
+        if cur and cur_len + len(line) + 1 > limit:
+            chunks.append("\n".join(cur))
+            cur, cur_len = [], 0
+        cur.append(line)
+        cur_len += len(line) + 1
+    if cur:
+        chunks.append("\n".join(cur))
+    return chunks
 
 
 async def log_action(bot: commands.Bot, actor, action: str, extra: str = ""):
@@ -584,6 +672,8 @@ class Trainings(commands.Cog):
         self.guild_vote_cooldowns: Dict[int, datetime] = {}
         self.schedule_check_task = None
         self.role_check_task = None
+        self.role_expiry_task = None
+        self._role_retry_at: Dict[tuple, int] = {}  # (role_id, user_id) -> earliest retry after a failed removal
 
     training = app_commands.Group(name="training", description="Training related commands")
 
@@ -1065,7 +1155,7 @@ class Trainings(commands.Cog):
                     seconds = (utc_next - datetime.now(timezone.utc)).total_seconds()
                     if seconds > 0:
                         await asyncio.sleep(seconds)
-                    await self._perform_role_enforcement()
+                    await self._post_role_report()
                 except asyncio.CancelledError:
                     break
                 except Exception:
@@ -1073,71 +1163,150 @@ class Trainings(commands.Cog):
                     # avoid tight loop on errors
                     await asyncio.sleep(60)
 
-    async def _perform_role_enforcement(self):
-            """List members of the two roles and remove if their timestamp exceeds thresholds.
-            - PING_ROLE_ID: 14 days
-            - TRAINING_PASS_ROLE: 7 days
-            Send a message to ROLE_CHECK_CHANNEL_ID listing members and their durations.
-            """
-            channel = self.bot.get_channel(ROLE_CHECK_CHANNEL_ID) or await self.bot.fetch_channel(ROLE_CHECK_CHANNEL_ID)
-            if not channel:
-                return
-            guild = channel.guild
-            if not guild:
-                return
-            now_ts = int(datetime.now(timezone.utc).timestamp())
-            data = load_role_timestamps()
-            roles_to_check = {
-                PING_ROLE_ID: 14 * 24 * 60 * 60,
-                TRAINING_PASS_ROLE: 7 * 24 * 60 * 60,
-            }
-            lines = []
-            for role_id, max_seconds in roles_to_check.items():
-                role = guild.get_role(role_id)
-                if not role:
-                    continue
-                lines.append(f"**{role.name}**")
-                for m in role.members:
-                    ts = get_role_timestamp(role_id, m.id)
-                    if ts is None:
-                        set_role_timestamp(role_id, m.id)
-                        ts = get_role_timestamp(role_id, m.id)
-                    elapsed = now_ts - ts
-                    days = elapsed // (24*60*60)
-                    # format duration
-                    human = f"{days}d { (elapsed % (24*60*60))//3600 }h"
-                    expired = elapsed > max_seconds
-                    lines.append(f"• {m.mention} — {human} {'(EXPIRED — will be removed)' if expired else ''}")
-                lines.append("")
+    async def _role_check_channel(self):
+        try:
+            return self.bot.get_channel(ROLE_CHECK_CHANNEL_ID) or await self.bot.fetch_channel(ROLE_CHECK_CHANNEL_ID)
+        except Exception:
+            return None
 
-            if not lines:
-                await channel.send("No tracked members for role enrollment.")
-            else:
-                text = "\n".join(lines)
-                await channel.send(f"Daily role check:\n{text}")
+    async def _seed_missing_timestamps(self, guild: discord.Guild):
+        """Start the clock for members who got a tracked role while the bot was offline (once per start)."""
+        for role_id in ROLE_MAX_SECONDS:
+            role = guild.get_role(role_id)
+            if not role:
+                continue
+            for m in role.members:
+                if get_role_timestamp(role_id, m.id) is None:
+                    set_role_timestamp(role_id, m.id)
+
+    def _next_role_deadline(self, now_ts: int) -> Optional[int]:
+        """Earliest deadline still to act on; members whose removal failed wait for their retry time."""
+        deadlines = [t for t in self._role_retry_at.values() if t > now_ts]
+        for role_id, max_seconds in ROLE_MAX_SECONDS.items():
+            for ts, user_id in ROLE_TIMESTAMPS.entries(role_id):
+                if self._role_retry_at.get((role_id, user_id), 0) <= now_ts:
+                    deadlines.append(ts + max_seconds + 1)
+                    break
+        return min(deadlines) if deadlines else None
 
-            # enforce removal for expired
-            for role_id, max_seconds in roles_to_check.items():
-                role = guild.get_role(role_id)
-                if not role:
+    async def role_expiry_worker(self):
+        """Remove tracked roles at their exact expiry: sleep until the next deadline, wake early on new timestamps."""
+        await self.bot.wait_until_ready()
+        channel = await self._role_check_channel()
+        guild = getattr(channel, "guild", None)
+        if guild is None:
+            return
+        await self._seed_missing_timestamps(guild)
+        while not self.bot.is_closed():
+            try:
+                ROLE_TIMESTAMPS.changed.clear()
+                now_ts = int(datetime.now(timezone.utc).timestamp())
+                due = [
+                    (role_id, user_id)
+                    for role_id, max_seconds in ROLE_MAX_SECONDS.items()
+                    for _, user_id in ROLE_TIMESTAMPS.expired(role_id, max_seconds, now_ts)
+                    if self._role_retry_at.get((role_id, user_id), 0) <= now_ts
+                ]
+                if due:
+                    await self._expire_roles(guild, due)
                     continue
-                for m in list(role.members):
-                    ts = get_role_timestamp(role_id, m.id)
-                    if ts is None:
-                        continue
-                    if now_ts - ts > max_seconds:
-                        try:
-                            await m.remove_roles(role, reason="Role expired: exceeded allowed time for training/RA")
-                            await log_action(self.bot, 'system', 'role_removed_expired', extra=f"role={role_id} user={m.id}")
-                            remove_role_timestamp(role_id, m.id)
-                        except Exception:
-                            await log_action(self.bot, 'system', 'role_remove_failed', extra=f"role={role_id} user={m.id} {traceback.format_exc()}")
+                next_ts = self._next_role_deadline(now_ts)
+                timeout = None if next_ts is None else max(1, next_ts - now_ts)
+                try:
+                    await asyncio.wait_for(ROLE_TIMESTAMPS.changed.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                break
+            except Exception:
+                await log_action(self.bot, 'system', 'role_expiry_worker_error', extra=traceback.format_exc())
+                await asyncio.sleep(60)
+
+    async def _expire_roles(self, guild: discord.Guild, due: List[tuple]):
+        async def expire(entry):
+            role_id, user_id = entry
+            role = guild.get_role(role_id)
+            m = guild.get_member(user_id)
+            if role is not None and m is None:
+                # Not cached is not the same as gone: ask Discord before dropping the deadline
+                try:
+                    m = await guild.fetch_member(user_id)
+                except discord.NotFound:
+                    m = None
+                except Exception:
+                    self._role_retry_at[entry] = int(datetime.now(timezone.utc).timestamp()) + ROLE_EXPIRY_RETRY_SECONDS
+                    await log_action(self.bot, 'system', 'role_member_fetch_failed', extra=f"role={role_id} user={user_id} {traceback.format_exc()}")
+                    return False
+            if role is None or m is None or role not in m.roles:
+                # Left the server or lost the role while we were not watching
+                self._role_retry_at.pop(entry, None)
+                remove_role_timestamp(role_id, user_id)
+                return False
+            try:
+                await apply_role_changes(m, remove=[role], reason="Role expired: exceeded allowed time for training/RA")
+            except Exception:
+                self._role_retry_at[entry] = int(datetime.now(timezone.utc).timestamp()) + ROLE_EXPIRY_RETRY_SECONDS
+                await log_action(self.bot, 'system', 'role_remove_failed', extra=f"role={role_id} user={user_id} {traceback.format_exc()}")
+                return False
+            self._role_retry_at.pop(entry, None)
+            remove_role_timestamp(role_id, user_id)
+            await log_action(self.bot, 'system', 'role_removed_expired', extra=f"role={role_id} user={user_id}")
+            return True
+
+        await run_rate_limited(due, expire, concurrency=ROLE_EXPIRY_CONCURRENCY, per_second=ROLE_EXPIRY_PER_SECOND)
+
+    async def _post_role_report(self):
+        """Daily summary built from the timestamp index, grouped by role and chunked across embeds.
+        Expiry itself happens in role_expiry_worker at each member's deadline.
+        """
+        channel = await self._role_check_channel()
+        if not channel or not channel.guild:
+            return
+        guild = channel.guild
+        now_ts = int(datetime.now(timezone.utc).timestamp())
+        fields = []
+        for role_id, max_seconds in ROLE_MAX_SECONDS.items():
+            role = guild.get_role(role_id)
+            if not role:
+                continue
+            entries = ROLE_TIMESTAMPS.entries(role_id)
+            soon, later = [], []
+            for ts, user_id in entries:
+                elapsed = now_ts - ts
+                deadline = ts + max_seconds
+                line = f"• <@{user_id}> — {elapsed // (24*60*60)}d {(elapsed % (24*60*60)) // 3600}h, expires <t:{deadline}:R>"
+                (soon if deadline - now_ts <= 24*60*60 else later).append(line)
+            if not entries:
+                fields.append((role.name, ["(no members)"]))
+            for label, lines in (("expiring within 24h", soon), ("tracked", later)):
+                if lines:
+                    fields.append((f"{role.name} — {label} ({len(lines)})", lines))
+
+        if not fields:
+            await channel.send("No tracked members for role enrollment.")
+            return
 
-    def cog_unload(self):
-        if hasattr(self, 'schedule_check_task'):
+        embeds = [discord.Embed(title="Daily role check", color=EMBED_COLOR)]
+        size = len(embeds[0].title)
+        for name, lines in fields:
+            for idx, chunk in enumerate(chunk_lines(lines, 1024)):
+                field_name = f"{name}{' (cont.)' if idx > 0 else ''}"
+                if len(embeds[-1].fields) >= 25 or size + len(field_name) + len(chunk) > 5800:
+                    embeds.append(discord.Embed(color=EMBED_COLOR))
+                    size = 0
+                embeds[-1].add_field(name=field_name, value=chunk, inline=False)
+                size += len(field_name) + len(chunk)
+        for i in range(0, len(embeds), 10):
+            await channel.send(embeds=embeds[i:i+10])
+
+    async def cog_unload(self):
+        if self.schedule_check_task:
             self.schedule_check_task.cancel()
-        if hasattr(self, 'role_check_task'):
+        if self.role_check_task:
             self.role_check_task.cancel()
+        if self.role_expiry_task:
+            self.role_expiry_task.cancel()
+        await ROLE_TIMESTAMPS.close()
 
 async def setup(bot: commands.Bot):
     cog = Trainings(bot)
@@ -1146,6 +1315,7 @@ async def setup(bot: commands.Bot):
     try:
         cog.schedule_check_task = bot.loop.create_task(cog.check_schedule())
         cog.role_check_task = bot.loop.create_task(cog.daily_role_check())
+        cog.role_expiry_task = bot.loop.create_task(cog.role_expiry_worker())
     except Exception:
         await log_action(bot, 'system', 'start_tasks_failed', extra=traceback.format_exc())
 
@@ -1395,17 +1565,20 @@ class ConfirmResultView(discord.ui.View):
                         if member:
                             role_ping = guild.get_role(PING_ROLE_ID)
                             role_stage = guild.get_role(TRAINING_PASS_ROLE)
-                            if role_ping and role_ping in member.roles:
-                                try:
-                                    await member.remove_roles(role_ping, reason="Passed training")
-                                except Exception:
-                                    pass
+                            had_ping = bool(role_ping and role_ping in member.roles)
+                            needs_stage = bool(role_stage and role_stage not in member.roles)
+                            try:
+                                await apply_role_changes(
+                                    member,
+                                    add=[role_stage] if needs_stage else [],
+                                    remove=[role_ping] if had_ping else [],
+                                    reason="Passed training",
+                                )
+                            except Exception:
+                                pass
+                            if had_ping:
                                 remove_role_timestamp(role_ping.id, member.id)
-                            if role_stage and role_stage not in member.roles:
-                                try:
-                                    await member.add_roles(role_stage, reason="Passed training")
-                                except Exception:
-                                    pass
+                            if needs_stage:
                                 set_role_timestamp(role_stage.id, member.id)
                                 await log_action(self.bot, self.trainer, "training_role_changed", extra=f"user={member.id} removed={PING_ROLE_ID} added={TRAINING_PASS_ROLE}")
                 except Exception:
@@ -1487,18 +1660,12 @@ class ConfirmRAResultView(discord.ui.View):
                                 to_remove.append(role_stage)
                             if role_extra and role_extra in member.roles:
                                 to_remove.append(role_extra)
-                            if to_remove:
-                                try:
-                                    await member.remove_roles(*to_remove, reason="Passed R/A")
-                                except Exception:
-                                    pass
                             final_objs = [guild.get_role(rid) for rid in RA_FINAL_ROLES]
                             final_objs = [r for r in final_objs if r is not None]
-                            if final_objs:
-                                try:
-                                    await member.add_roles(*final_objs, reason="Passed R/A")
-                                except Exception:
-                                    pass
+                            try:
+                                await apply_role_changes(member, add=final_objs, remove=to_remove, reason="Passed R/A")
+                            except Exception:
+                                pass
                             remove_role_timestamp(TRAINING_PASS_ROLE, member.id)
                             remove_role_timestamp(RA_ROLE_TO_REMOVE, member.id)
                             await log_action(self.bot, self.trainer, "ra_role_changed", extra=f"user={member.id} removed={[r.id for r in to_remove]} added={RA_FINAL_ROLES}")
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Economy Benchmark - Drive the Economy cog against a synthetic database
+Usage: python economy_bench.py [--users N] [--ops N] [--concurrency N] [--pool N] [--seed N] [--keep]
+Example: python economy_bench.py --users 20000 --ops 5000 --concurrency 32
+
+Builds an isolated economy database in a temp directory (never data/economy.db),
+fills it with N users and fish/junk/shop inventories, then runs daily, work,
+fish, sellall, rob, deposit and leaderboard concurrently through the cog's
+internal methods with a fake destination. Reports per-operation p50/p99
+latency, pool wait and BEGIN IMMEDIATE wait (DB lock contention), lock errors,
+and rows written per operation.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+
+OPERATIONS = ["daily", "work", "fish", "sellall", "rob", "deposit", "leaderboard"]
+WEIGHTS = [5, 25, 30, 10, 10, 10, 10]
+
+# Per-operation counters, set by each worker before it runs an operation
+current_op = contextvars.ContextVar("current_op", default=None)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class FakeMember:
+    """Just enough of discord.Member for the economy methods."""
+
+    def __init__(self, user_id):
+        self.id = user_id
+        self.name = f"user{user_id}"
+        self.mention = f"<@{user_id}>"
+        self.roles = []
+
+    def __str__(self):
+        return self.name
+
+
+class FakeDestination:
+    """Stands in for commands.Context: the cog calls send(), nothing goes to Discord."""
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        self.sent += 1
+
+
+class TimedConnection:
+    """Proxy over a pooled connection that times BEGIN IMMEDIATE (the write-lock wait)."""
+
+    def __init__(self, db, stats):
+        self._db = db
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    async def execute(self, sql, parameters=None):
+        if sql.startswith("BEGIN"):
+            start = time.perf_counter()
+            try:
+                return await self._db.execute(sql, parameters)
+            finally:
+                self._stats["begin_wait"].append(time.perf_counter() - start)
+        return await self._db.execute(sql, parameters)
+
+
+def make_database(pool_size, stats):
+    from utils.database import DatabaseService
+
+    class InstrumentedDatabase(DatabaseService):
+        @asynccontextmanager
+        async def connection(self, path):
+            pool = self._pool(path)
+            start = time.perf_counter()
+            db = await pool.acquire()
+            stats["pool_wait"].append(time.perf_counter() - start)
+            before = db.total_changes
+            try:
+                yield TimedConnection(db, stats)
+            finally:
+                op = current_op.get()
+                if op is not None:
+                    op["rows"] += db.total_changes - before
+                await pool.release(db)
+
+    return InstrumentedDatabase(pool_size=pool_size)
+
+
+async def seed_database(bot, db_path, users, rng, fish_types, shop_items):
+    """Insert synthetic accounts and inventories in one transaction."""
+    account_rows = [(uid, rng.randint(0, 5000), rng.randint(0, 20000)) for uid in range(1, users + 1)]
+    inventory_rows = []
+    for uid in range(1, users + 1):
+        for item in rng.sample(fish_types, rng.randint(0, 8)):
+            for value in {rng.randrange(100, 1001, 5) for _ in range(rng.randint(1, 4))}:
+                inventory_rows.append((uid, item, rng.randint(1, 5), value))
+        for item in rng.sample(shop_items, min(len(shop_items), rng.randint(0, 2))):
+            inventory_rows.append((uid, item, rng.randint(1, 3), None))
+    async with bot.db.connection(db_path) as db:
+        await db.execute("BEGIN")
+        await db.executemany(
+            "INSERT INTO users (user_id, balance, last_daily, last_work, bank) VALUES (?, ?, NULL, NULL, ?)",
+            account_rows
+        )
+        await db.executemany(
+            "INSERT INTO inventory (user_id, item, amount, value) VALUES (?, ?, ?, ?)", inventory_rows
+        )
+        await db.commit()
+    return len(account_rows), len(inventory_rows)
+
+
+async def run_operation(cog, name, members, rng, destination):
+    member = rng.choice(members)
+    if name == "daily":
+        await cog._daily(member, destination)
+    elif name == "work":
+        await cog._work(member, destination)
+    elif name == "fish":
+        await cog.fish(member, destination)
+    elif name == "sellall":
+        await cog.sell_all(member, destination)
+    elif name == "rob":
+        target = rng.choice(members)
+        while target is member:
+            target = rng.choice(members)
+        await cog.rob(member, target, destination)
+    elif name == "deposit":
+        await cog.deposit(member, rng.randint(1, 500), destination)
+    elif name == "leaderboard":
+        if rng.random() < 0.5:
+            await cog.econ_leaderboard(destination, page=rng.randint(1, 5))
+        else:
+            await cog.econ_leaderboard(destination, user=member)
+
+
+async def worker(cog, queue, members, rng, destination, results):
+    while True:
+        try:
+            name = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        op = {"rows": 0}
+        token = current_op.set(op)
+        start = time.perf_counter()
+        try:
+            await run_operation(cog, name, members, rng, destination)
+        except Exception as e:
+            results[name]["errors"][type(e).__name__ + ": " + str(e)[:60]] += 1
+        finally:
+            current_op.reset(token)
+        results[name]["latency"].append(time.perf_counter() - start)
+        results[name]["rows"].append(op["rows"])
+
+
+async def main_async(args):
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="economy_bench_")
+    db_path = os.path.join(workdir, "economy.db")
+    # DB_PATH and the action log location are read at import time
+    os.environ["ECONOMY_DB_FILE"] = db_path
+
+    import discord  # noqa: F401  (fail early with a clear message if discord.py is missing)
+    from cogs import economy
+    from cogs.econ.action_log import econ_log
+
+    econ_log.log_dir = os.path.join(workdir, "logs")
+    stats = defaultdict(list)
+
+    class FakeBot:
+        guilds = []
+        db = make_database(args.pool, stats)
+
+        async def wait_until_ready(self):
+            pass
+
+        def get_guild(self, guild_id):
+            return None
+
+    bot = FakeBot()
+    cog = economy.Economy(bot)
+    cog.apply_bank_interest.cancel()
+    init_tasks = [t for t in asyncio.all_tasks() if t.get_coro().__qualname__.endswith("_initialize_db")]
+    await asyncio.gather(*init_tasks)
+    await cog.cog_load()
+
+    print("=" * 60)
+    print("📈 ECONOMY BENCHMARK")
+    print("=" * 60)
+    print(f"📌 Users: {args.users} | Ops: {args.ops} | Concurrency: {args.concurrency} | Pool: {args.pool}")
+    print(f"📁 Database: {db_path}")
+
+    start = time.perf_counter()
+    accounts, inventory = await seed_database(
+        bot, economy.DB_PATH, args.users, rng,
+        economy.FISH_TYPES + economy.JUNK_TYPES, list(economy.SHOP_CATALOG.items)
+    )
+    print(f"🌱 Seeded {accounts} accounts and {inventory} inventory rows in {time.perf_counter() - start:.2f}s")
+    stats.clear()
+
+    members = [FakeMember(uid) for uid in range(1, args.users + 1)]
+    queue = asyncio.Queue()
+    for name in rng.choices(OPERATIONS, weights=WEIGHTS, k=args.ops):
+        queue.put_nowait(name)
+    results = defaultdict(lambda: {"latency": [], "rows": [], "errors": Counter()})
+    destination = FakeDestination()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        worker(cog, queue, members, random.Random(rng.random()), destination, results)
+        for _ in range(args.concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+    await cog.cog_unload()
+
+    print(f"\n📊 {args.ops} operations in {elapsed:.2f}s ({args.ops / elapsed:,.0f} ops/s)")
+    print(f"\n{'operation':<12} {'count':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'rows/op':>8} {'errors':>7}")
+    for name in OPERATIONS:
+        r = results.get(name)
+        if not r:
+            continue
+        lat = r["latency"]
+        print(
+            f"{name:<12} {len(lat):>6} {percentile(lat, 50) * 1000:>8.2f} {percentile(lat, 99) * 1000:>8.2f} "
+            f"{max(lat) * 1000:>8.2f} {sum(r['rows']) / len(r['rows']):>8.1f} {sum(r['errors'].values()):>7}"
+        )
+
+    print("\n🔒 Lock contention:")
+    for key, label in (("pool_wait", "Pool acquire wait"), ("begin_wait", "BEGIN IMMEDIATE wait")):
+        values = stats.get(key, [])
+        print(
+            f"   • {label}: n={len(values)} p50={percentile(values, 50) * 1000:.2f}ms "
+            f"p99={percentile(values, 99) * 1000:.2f}ms max={max(values, default=0) * 1000:.2f}ms"
+        )
+    errors = Counter()
+    for r in results.values():
+        errors.update(r["errors"])
+    locked = sum(count for message, count in errors.items() if "locked" in message or "busy" in message)
+    print(f"   • 'database is locked' errors: {locked}")
+    if errors:
+        print("\n⚠️ Errors:")
+        for message, count in errors.most_common(10):
+            print(f"   • {count}x {message}")
+
+    await bot.db.close()
+    if args.keep:
+        print(f"\n💾 Kept benchmark files in {workdir}")
+    else:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print("\n" + "=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Economy cog against a synthetic database.")
+    parser.add_argument("--users", type=int, default=10000, help="Synthetic accounts to create (default: 10000)")
+    parser.add_argument("--ops", type=int, default=2000, help="Total operations to run (default: 2000)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent workers (default: 16)")
+    parser.add_argument("--pool", type=int, default=int(os.getenv("DB_POOL_SIZE", 4)), help="Connections per database file (default: DB_POOL_SIZE or 4)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated database and logs")
+    args = parser.parse_args()
+    if args.users < 2:
+        print("❌ Error: --users must be at least 2 (rob needs a target)")
+        sys.exit(1)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
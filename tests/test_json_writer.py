@@ -0,0 +1,33 @@
+import asyncio
+import json
+
+from utils.json_writer import DebouncedJsonWriter
+
+
+def test_sync_save_outside_loop(tmp_path):
+    path = tmp_path / "store.json"
+    data = {"a": 1}
+    writer = DebouncedJsonWriter(str(path), lambda: data)
+    writer.mark_dirty()
+    assert json.loads(path.read_text()) == {"a": 1}
+    assert not writer.dirty
+
+
+def test_burst_coalesces_and_keeps_late_changes(tmp_path):
+    path = tmp_path / "nested" / "store.json"
+    data = {}
+    writer = DebouncedJsonWriter(str(path), lambda: dict(data), delay=0.01)
+
+    async def run():
+        for i in range(5):
+            data[str(i)] = i
+            writer.mark_dirty()
+        await asyncio.sleep(0.05)
+        # A change after the burst was saved schedules another save
+        data["late"] = True
+        writer.mark_dirty()
+        await writer.close()
+
+    asyncio.run(run())
+    assert json.loads(path.read_text()) == {"0": 0, "1": 1, "2": 2, "3": 3, "4": 4, "late": True}
+    assert not (tmp_path / "nested" / "store.json.tmp").exists()
@@ -0,0 +1,37 @@
+import importlib
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("discord")
+
+
+def _load_loa(tmp_path, monkeypatch, active=None, requests=None):
+    # The registry paths are relative, so build the data dir and import from there
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "active_loas.json").write_text(json.dumps(active or {}))
+    (tmp_path / "data" / "loa_requests.json").write_text(json.dumps(requests or []))
+    import cogs.loa
+    return importlib.reload(cogs.loa)
+
+
+def test_registry_loads_with_active_loa(tmp_path, monkeypatch):
+    end = datetime.now(timezone.utc) + timedelta(days=3)
+    loa = _load_loa(tmp_path, monkeypatch, active={"42": end.isoformat()})
+
+    registry = loa.LOA_REGISTRY
+    assert registry.next_expiry() == pytest.approx(end.timestamp())
+    assert registry.changed.is_set()
+    assert not registry.is_dirty()
+
+
+def test_update_status_only_marks_dirty_on_change(tmp_path, monkeypatch):
+    requests = [{"user_id": 42, "status": "Approved", "requested_at": datetime.now(timezone.utc).isoformat()}]
+    loa = _load_loa(tmp_path, monkeypatch, requests=requests)
+
+    registry = loa.LOA_REGISTRY
+    registry.update_status(42, "Denied")
+    assert not registry.is_dirty()
+    assert registry.requests[0]["status"] == "Approved"
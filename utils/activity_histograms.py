@@ -0,0 +1,165 @@
+"""
+Activity histograms
+
+Per-user message activity kept as a 7x24 (UTC weekday x UTC hour) histogram
+packed into an array('I'). Recording a message is a single bucket increment;
+older activity fades out with an exponential daily decay instead of being
+filtered from a list of timestamps. Histograms are persisted as BLOBs
+(`array.tobytes()`, native byte order) in batches by the owning cog.
+
+Example usage in a cog:
+    from utils.activity_histograms import ActivityHistogramStore
+
+    store = ActivityHistogramStore()
+    store.record(message.author.id)          # O(1), throttled to once per hour
+    store.active_window(user_id)             # -> (start_hour, end_hour) or None, cached
+    rows = store.dirty_rows()                # -> [(user_id, day, last_seen, blob)] to upsert
+"""
+
+import os
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+DAYS = 7
+HOURS = 24
+BUCKETS = DAYS * HOURS
+# Fixed point: one recorded hour adds SCALE, so decayed counts stay integers
+SCALE = 100
+HALF_LIFE_DAYS = float(os.getenv("ACTIVITY_HALF_LIFE_DAYS", 14))
+DAILY_DECAY = 0.5 ** (1 / HALF_LIFE_DAYS)
+# At most one sample per user per hour, as before
+RECORD_INTERVAL_SECONDS = 3600
+MIN_SAMPLES = 5
+
+_NO_WINDOW = object()
+
+
+class UserHistogram:
+    __slots__ = ("buckets", "day", "last_seen")
+
+    def __init__(self, buckets: Optional[array] = None, day: int = 0, last_seen: int = 0):
+        self.buckets = buckets if buckets is not None else array("I", bytes(4 * BUCKETS))
+        self.day = day  # epoch day the buckets were last decayed to
+        self.last_seen = last_seen  # epoch seconds of the last recorded sample
+
+    def decay_to(self, today: int):
+        days = today - self.day
+        if days <= 0:
+            return
+        factor = DAILY_DECAY ** days
+        b = self.buckets
+        for i in range(BUCKETS):
+            if b[i]:
+                b[i] = int(b[i] * factor)
+        self.day = today
+
+    def hourly(self) -> List[int]:
+        """Collapse weekdays into a 24-hour profile."""
+        b = self.buckets
+        return [sum(b[d * HOURS + h] for d in range(DAYS)) for h in range(HOURS)]
+
+
+def longest_active_range(hour_counts: List[int]) -> Optional[Tuple[int, int]]:
+    """Longest run of consecutive hours with at least half the peak count."""
+    peak = max(hour_counts)
+    if peak <= 0:
+        return None
+    threshold = max(SCALE, peak * 0.5)  # counts are fixed point: at least one recorded hour
+    best = None
+    run_start = None
+    for hour in range(HOURS + 1):
+        active = hour < HOURS and hour_counts[hour] >= threshold
+        if active and run_start is None:
+            run_start = hour
+        elif not active and run_start is not None:
+            if best is None or hour - 1 - run_start > best[1] - best[0]:
+                best = (run_start, hour - 1)
+            run_start = None
+    return best
+
+
+class ActivityHistogramStore:
+    """In-memory histograms with dirty tracking and a cached active window per user."""
+
+    def __init__(self):
+        self.users: Dict[int, UserHistogram] = {}
+        self.dirty = set()
+        self._windows: Dict[int, tuple] = {}  # user_id -> (day computed, window or _NO_WINDOW)
+
+    def load_row(self, user_id: int, day: int, last_seen: int, blob: bytes):
+        buckets = array("I")
+        buckets.frombytes(blob)
+        if len(buckets) != BUCKETS:
+            return
+        self.users[user_id] = UserHistogram(buckets, day, last_seen)
+
+    def dirty_rows(self) -> List[tuple]:
+        """Rows for every changed user, clearing the dirty set."""
+        rows = []
+        for user_id in self.dirty:
+            h = self.users.get(user_id)
+            if h is not None:
+                rows.append((user_id, h.day, h.last_seen, h.buckets.tobytes()))
+        self.dirty.clear()
+        return rows
+
+    def record(self, user_id: int, timestamp: Optional[float] = None) -> bool:
+        """Count one message; returns False if the user already has a sample within the hour."""
+        ts = int(timestamp if timestamp is not None else time.time())
+        today = ts // 86400
+        h = self.users.get(user_id)
+        if h is None:
+            h = self.users[user_id] = UserHistogram(day=today)
+        elif ts - h.last_seen < RECORD_INTERVAL_SECONDS:
+            return False
+        h.decay_to(today)
+        dt = datetime.utcfromtimestamp(ts)
+        h.buckets[dt.weekday() * HOURS + dt.hour] += SCALE
+        h.last_seen = ts
+        self.dirty.add(user_id)
+        self._windows.pop(user_id, None)
+        return True
+
+    def active_window(self, user_id: int, now: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """(start_hour, end_hour) UTC the user is usually active, or None without enough data.
+
+        Cached until the user's histogram changes or the day rolls over.
+        """
+        today = int(now if now is not None else time.time()) // 86400
+        cached = self._windows.get(user_id)
+        if cached is not None and cached[0] == today:
+            return None if cached[1] is _NO_WINDOW else cached[1]
+        window = None
+        h = self.users.get(user_id)
+        if h is not None:
+            hourly = h.hourly()
+            samples = sum(hourly) * DAILY_DECAY ** max(0, today - h.day)
+            if samples >= MIN_SAMPLES * SCALE:
+                window = longest_active_range(hourly)
+        self._windows[user_id] = (today, _NO_WINDOW if window is None else window)
+        return window
+
+
+def snapshot(store: ActivityHistogramStore, user_ids=None) -> Tuple[bytes, List[int]]:
+    """Copy histograms (all users, or `user_ids`) into one packed buffer plus their decay days.
+
+    Cheap enough to run on the event loop; the result can be handed to a worker thread.
+    """
+    users = store.users
+    ids = users.keys() if user_ids is None else [uid for uid in user_ids if uid in users]
+    hists = [users[uid] for uid in ids]
+    return b"".join(h.buckets.tobytes() for h in hists), [h.day for h in hists]
+
+
+def aggregate_matrix(packed: bytes, days: List[int], today: int):
+    """Sum packed histograms into a 7x24 numpy matrix of decayed message-hours."""
+    import numpy as np
+
+    if not days:
+        return np.zeros((DAYS, HOURS))
+    hists = np.frombuffer(packed, dtype=np.uint32).reshape(len(days), DAYS, HOURS)
+    ages = np.maximum(0, today - np.asarray(days, dtype=np.float64))
+    factors = DAILY_DECAY ** ages
+    return np.tensordot(factors, hists, axes=1) / SCALE
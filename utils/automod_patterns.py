@@ -0,0 +1,83 @@
+"""
+Automod pattern engine.
+
+Pattern lists and the matching helpers shared by `cogs/automod.py` and the
+offline evaluation tool (`automod_eval.py`). This module must not import
+discord so it can be loaded in worker processes.
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Tuple
+
+BLOCKED_WORDS_FILE = os.path.join("data", "blocked_words.json")
+
+INFRACTION_PATTERNS = [    r"\b[s$5z]+[\W_]*[h#]+[\W_]*[i1!|l]+[\W_]*[t7+]+[a-z0-9$#@!*+_-]*\b",
+    r"\b[n]+[\W_]*[i1!l|]+[\W_]*[gq9]+[\W_]*[gq9]+[\W_]*[ea4r3]*[a-z0-9]*\b",
+    r"\b[n][i|1|!][g|9]{2,}[e|3]r\b",
+    r"\b[n][!|1][g|9]{2,}[a|@]\b",
+    r"\b[fph@][\W_]*[u*o0v]+[\W_]*[c(kq)(ck)*x]+[\W_]*[kq]+(ing|er|ed|s|in'?|a)?\b",
+    r"\b[fF]+[uU*0]+[cC*k]+[kK]+(ing|er|ed|s)?\b",
+    r"\b[fFph@]+[\W_]*[uU*0]+[\W_]*[cCckkqx]+[\W_]*[kKqx]+(ing|er|ed|s)?\b",
+    r"\b(f+|ph)(y|i|u)?(c+|k+|q+)(y|k|n)?\b",
+    r"\b(f+|ph)([a*u*y*i]*)(c+|k+|q+|z+|w+|\*+)([u*c*k*q*z*w]*)(k+|c+|\*)(e+r+|i+n+g+|e+d+)?\b",
+    r"\b[s$5z]+[\W_]*[h#]+[\W_]*[i1!|l]+[\W_]*[t7+]+s*\b",]
+MUTE_PATTERNS = [    r"\b[s$5z]+[\W_]*[h#]+[\W_]*[i1!|l]+[\W_]*[t7+]+[a-z0-9$#@!*+_-]*\b",
+    r"\b[n]+[\W_]*[i1!l|]+[\W_]*[gq9]+[\W_]*[gq9]+[\W_]*[ea4r3]*[a-z0-9]*\b",
+    r"\b[n][i|1|!][g|9]{2,}[e|3]r\b",
+    r"\b[n][!|1][g|9]{2,}[a|@]\b",
+    r"\b[fph@][\W_]*[u*o0v]+[\W_]*[c(kq)(ck)*x]+[\W_]*[kq]+(ing|er|ed|s|in'?|a)?\b",
+    r"\b[fF]+[uU*0]+[cC*k]+[kK]+(ing|er|ed|s)?\b",
+    r"\b[fFph@]+[\W_]*[uU*0]+[\W_]*[cCckkqx]+[\W_]*[kKqx]+(ing|er|ed|s)?\b",
+    r"\b(f+|ph)(y|i|u)?(c+|k+|q+)(y|k|n)?\b",
+    r"\b(f+|ph)([a*u*y*i]*)(c+|k+|q+|z+|w+|\*+)([u*c*k*q*z*w]*)(k+|c+|\*)(e+r+|i+n+g+|e+d+)?\b",
+    r"\b[s$5z]+[\W_]*[h#]+[\W_]*[i1!|l]+[\W_]*[t7+]+s*\b",]
+QUARANTINE_PATTERNS = [
+]
+BAN_PATTERNS = [
+
+]
+
+COMPILED_INFRACTION = [re.compile(p, re.IGNORECASE) for p in INFRACTION_PATTERNS]
+COMPILED_MUTE = [re.compile(p, re.IGNORECASE) for p in MUTE_PATTERNS]
+COMPILED_QUARANTINE = [re.compile(p, re.IGNORECASE) for p in QUARANTINE_PATTERNS]
+COMPILED_BAN = [re.compile(p, re.IGNORECASE) for p in BAN_PATTERNS]
+
+# Hierarchy order used by the cog: ban > quarantine > mute > infraction
+TIERS = (
+    ("ban", COMPILED_BAN),
+    ("quarantine", COMPILED_QUARANTINE),
+    ("mute", COMPILED_MUTE),
+    ("infraction", COMPILED_INFRACTION),
+)
+
+
+def iter_pattern_matches(content: str) -> Iterator[Tuple[str, int, str]]:
+    """Yield (tier, pattern_index, matched_text) for every non-empty match in content."""
+    if not content:
+        return
+    for tier, compiled in TIERS:
+        for idx, pattern in enumerate(compiled):
+            for m in pattern.finditer(content):
+                if m.group(0):
+                    yield tier, idx, m.group(0)
+
+
+def find_matches(content: str) -> Dict[str, List[str]]:
+    """Return matched words grouped by tier (keys: ban, quarantine, mute, infraction)."""
+    matches: Dict[str, List[str]] = {tier: [] for tier, _ in TIERS}
+    for tier, _idx, text in iter_pattern_matches(content):
+        matches[tier].append(text)
+    return matches
+
+
+def load_blocked_words(path: str = BLOCKED_WORDS_FILE) -> set:
+    """Load the set of words staff have exempted from detection."""
+    try:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return set(json.load(f).get("blocked_words", []))
+    except Exception:
+        pass
+    return set()
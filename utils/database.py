@@ -0,0 +1,148 @@
+"""
+Shared SQLite connection pool
+
+bot.py creates one DatabaseService and exposes it as `bot.db`. Cogs borrow a
+long-lived aiosqlite connection for a database file instead of opening a new
+one (and a new worker thread) for every query:
+
+    async with self.bot.db.connection(DB_PATH) as db:
+        cursor = await db.execute("SELECT ...", (...,))
+        row = await cursor.fetchone()
+
+Each connection is exclusive to the borrower for the duration of the `async
+with` block. Any transaction left open (no commit) when the block exits is
+rolled back, matching what closing a fresh connection used to do.
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Dict
+
+import aiosqlite
+
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 4))
+# sqlite3 keeps a per-connection LRU of prepared statements; long-lived
+# connections let repeated queries skip re-parsing.
+STATEMENT_CACHE_SIZE = 256
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+class _ConnectionPool:
+    """Fixed-size pool of aiosqlite connections to a single database file."""
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self.size = max(1, size)
+        self._idle = []
+        self._created = 0
+        self._all = set()
+        # Guards _idle/_created; notified whenever a connection or a free slot becomes available
+        self._available = asyncio.Condition()
+
+    async def _open(self) -> aiosqlite.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        db = await aiosqlite.connect(self.path, cached_statements=STATEMENT_CACHE_SIZE)
+        for pragma in PRAGMAS:
+            try:
+                await db.execute(pragma)
+            except Exception as e:
+                print(f"⚠️ Failed to apply '{pragma}' on {self.path}: {e}")
+        return db
+
+    async def acquire(self) -> aiosqlite.Connection:
+        async with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1  # reserve the slot; the connection is opened outside the lock
+                    break
+                await self._available.wait()
+        try:
+            db = await self._open()
+        except Exception:
+            await self._free_slot()
+            raise
+        self._all.add(db)
+        return db
+
+    async def _free_slot(self):
+        async with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    async def release(self, db: aiosqlite.Connection):
+        try:
+            if db.in_transaction:
+                await db.rollback()
+        except Exception as e:
+            # Connection is unusable; drop it and wake a waiter so it can open a fresh one.
+            print(f"⚠️ Discarding broken connection to {self.path}: {e}")
+            self._all.discard(db)
+            try:
+                await db.close()
+            except Exception:
+                pass
+            await self._free_slot()
+            return
+        async with self._available:
+            self._idle.append(db)
+            self._available.notify()
+
+    async def close(self):
+        for db in list(self._all):
+            try:
+                await db.close()
+            except Exception:
+                pass
+        self._all.clear()
+        async with self._available:
+            self._idle.clear()
+            self._created = 0
+            self._available.notify_all()
+
+
+class DatabaseService:
+    """Pooled, long-lived SQLite connections keyed by database file."""
+
+    def __init__(self, pool_size: int = POOL_SIZE):
+        self.pool_size = pool_size
+        self._pools: Dict[str, _ConnectionPool] = {}
+
+    def _pool(self, path: str) -> _ConnectionPool:
+        key = os.path.abspath(path)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = _ConnectionPool(key, self.pool_size)
+            self._pools[key] = pool
+        return pool
+
+    @asynccontextmanager
+    async def connection(self, path: str):
+        """Borrow a connection to `path` for the duration of the block."""
+        pool = self._pool(path)
+        db = await pool.acquire()
+        try:
+            yield db
+        finally:
+            await pool.release(db)
+
+    async def close(self):
+        """Close every pooled connection (called on bot shutdown)."""
+        for pool in list(self._pools.values()):
+            await pool.close()
+        self._pools.clear()
+
+
+database = DatabaseService()
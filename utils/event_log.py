@@ -0,0 +1,144 @@
+"""
+Append-only event log with tombstones
+
+Records are JSON lines that are only ever appended. Removing a record means
+appending a tombstone that names its key; readers skip tombstoned keys, and
+`compact()` occasionally rewrites the file without them. Nothing on the hot
+path reads or rewrites the whole file.
+
+Example usage in a cog:
+    from utils.event_log import TombstoneLog
+
+    events = TombstoneLog("logs/infraction_events.jsonl", key="infraction_id")
+    events.append("issue", infraction_id=infraction_id, reason=reason)
+    events.tombstone(infraction_id, reason="Issued in error")
+    for record in events.live():                 # streamed, tombstoned keys skipped
+        ...
+    kept, dropped = await events.compact()
+    if not events.is_backfilled():               # one-time import, survives compaction
+        ...
+        events.mark_backfilled()
+"""
+
+import asyncio
+import json
+import os
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Set, Tuple
+
+TOMBSTONE = "void"
+
+
+class TombstoneLog:
+    """JSONL event log where deletes are tombstone records."""
+
+    def __init__(self, path: str, key: str):
+        self.path = path
+        self.key = key
+        self._compacting = False
+
+    def append(self, event: str, **fields):
+        record = {"ts": datetime.utcnow().isoformat(), "event": event, **fields}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One short O_APPEND write per event; never a read-modify-write of the file
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def append_many(self, records: Iterable[dict]) -> int:
+        """Append pre-built records (each with its own "event" and optional "ts") in one write."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        count = 0
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                record = {"ts": datetime.utcnow().isoformat(), **record}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+
+    def is_empty(self) -> bool:
+        return not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+
+    def is_backfilled(self) -> bool:
+        """Whether a one-time import has been recorded. Kept in a marker file, since
+        compaction can legitimately leave the log itself empty."""
+        return os.path.exists(self.path + ".backfilled")
+
+    def mark_backfilled(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path + ".backfilled", "w", encoding="utf-8") as f:
+            f.write(datetime.utcnow().isoformat() + "\n")
+
+    def tombstone(self, key_value: str, **fields):
+        self.append(TOMBSTONE, **{self.key: key_value}, **fields)
+
+    def records(self, stop: Optional[int] = None) -> Iterator[dict]:
+        """Stream every record (tombstones included), optionally only up to byte offset `stop`."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            position = 0
+            for line in f:
+                position += len(line)
+                if stop is not None and position > stop:
+                    break
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def tombstoned(self, stop: Optional[int] = None) -> Set[str]:
+        """Keys that have a tombstone (first streaming pass; only the keys are kept in memory)."""
+        return {r.get(self.key) for r in self.records(stop) if r.get("event") == TOMBSTONE}
+
+    def live(self, include_tombstoned: bool = False) -> Iterator[dict]:
+        """Stream non-tombstone records, oldest first. Tombstoned records are skipped unless asked for."""
+        dead = set() if include_tombstoned else self.tombstoned()
+        for record in self.records():
+            if record.get("event") != TOMBSTONE and record.get(self.key) not in dead:
+                yield record
+
+    def _rewrite(self, stop: int, tmp_path: str) -> Tuple[int, int]:
+        dead = self.tombstoned(stop)
+        kept = dropped = 0
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            for record in self.records(stop):
+                if record.get("event") == TOMBSTONE or record.get(self.key) in dead:
+                    dropped += 1
+                    continue
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                kept += 1
+        return kept, dropped
+
+    async def compact(self) -> Tuple[int, int]:
+        """Rewrite the log without tombstoned records. Returns (kept, dropped).
+
+        The bulk rewrite runs in a worker thread up to the current end of the file.
+        Anything appended meanwhile is copied over on the event loop right before
+        the atomic rename, so concurrent appends are never lost.
+        """
+        if self._compacting or not os.path.exists(self.path):
+            return 0, 0
+        self._compacting = True
+        tmp_path = self.path + ".compact"
+        try:
+            stop = os.path.getsize(self.path)
+            kept, dropped = await asyncio.to_thread(self._rewrite, stop, tmp_path)
+            # No awaits from here on: appends (which run on the loop) cannot interleave
+            with open(self.path, "rb") as src:
+                src.seek(stop)
+                tail = src.read()
+            if tail:
+                with open(tmp_path, "ab") as out:
+                    out.write(tail)
+            os.replace(tmp_path, self.path)
+            return kept, dropped
+        finally:
+            self._compacting = False
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
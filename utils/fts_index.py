@@ -0,0 +1,107 @@
+"""
+Full-text search indexes
+
+External-content FTS5 indexes keyed by an explicit INTEGER PRIMARY KEY column.
+The key is declared in the table schema (an alias of the rowid), so VACUUM can
+never renumber it underneath the index or the keyset cursors that page by it.
+Tables created before the key existed are rebuilt once with it added.
+
+Example usage in a cog:
+    from utils.fts_index import ensure_fts_index, ensure_keyed_table
+
+    async with self.bot.db.connection(DB_PATH) as db:
+        await ensure_keyed_table(db, "notes", \"\"\"
+            id INTEGER PRIMARY KEY,
+            note_id TEXT NOT NULL UNIQUE,
+            body TEXT,
+            date TEXT
+        \"\"\")
+        await ensure_fts_index(db, "notes", ["body"])
+        await db.commit()
+
+    # SELECT n.* FROM notes_fts f JOIN notes n ON n.id = f.rowid WHERE notes_fts MATCH ?
+"""
+
+from typing import List
+
+KEY_COLUMN = "id"
+
+
+async def _columns(db, table: str) -> List[str]:
+    cursor = await db.execute(f"PRAGMA table_info({table})")
+    return [row[1] for row in await cursor.fetchall()]
+
+
+async def ensure_keyed_table(db, table: str, schema: str, key: str = KEY_COLUMN):
+    """Create `table` from the column definitions in `schema`, migrating an older copy that lacks `key`.
+
+    SQLite cannot add a PRIMARY KEY column with ALTER TABLE, so the old table is
+    copied into a new one (each row keeps its old rowid as `key`), dropped, and
+    the copy renamed into place in one transaction. Its indexes and triggers
+    go with the old table; callers recreate them afterwards.
+    """
+    existing = await _columns(db, table)
+    if not existing:
+        await db.execute(f"CREATE TABLE IF NOT EXISTS {table} ({schema})")
+        return
+    if key in existing:
+        return
+    staging = f"{table}_rekeyed"
+    await db.execute("BEGIN")
+    try:
+        await db.execute(f"DROP TABLE IF EXISTS {staging}")
+        await db.execute(f"CREATE TABLE {staging} ({schema})")
+        wanted = await _columns(db, staging)
+        shared = ", ".join(c for c in existing if c in wanted)
+        await db.execute(f"INSERT INTO {staging} ({key}, {shared}) SELECT rowid, {shared} FROM {table}")
+        await db.execute(f"DROP TABLE {table}")
+        await db.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    print(f"Migrated {table} to an explicit {key} INTEGER PRIMARY KEY")
+
+
+async def ensure_fts_index(db, table: str, columns: List[str], key: str = KEY_COLUMN):
+    """Create `{table}_fts`, an external-content FTS5 index over `columns` of `table`, plus its sync triggers.
+
+    The index stores no copy of the rows and its rowid is the table's `key`
+    column, so the triggers remove stale entries with the FTS 'delete' command
+    by key instead of scanning the index. An index built any other way (a
+    standalone copy, or one keyed by the implicit rowid) is dropped and rebuilt.
+    """
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    old_cols = ", ".join(f"old.{c}" for c in columns)
+    new_cols = ", ".join(f"new.{c}" for c in columns)
+    cursor = await db.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,))
+    row = await cursor.fetchone()
+    trigger_cursor = await db.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ? AND name LIKE ?",
+        (table, f"{fts}_%")
+    )
+    triggers = (await trigger_cursor.fetchone())[0]
+    if row is not None and f"content_rowid='{key}'" in row[0] and triggers == 3:
+        return
+    for trigger in ("insert", "delete", "update"):
+        await db.execute(f"DROP TRIGGER IF EXISTS {fts}_{trigger}")
+    await db.execute(f"DROP TABLE IF EXISTS {fts}")
+    await db.execute(f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='{key}')")
+    await db.execute(f"""
+        CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts} (rowid, {cols}) VALUES (new.{key}, {new_cols});
+        END
+    """)
+    await db.execute(f"""
+        CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.{key}, {old_cols});
+        END
+    """)
+    await db.execute(f"""
+        CREATE TRIGGER {fts}_update AFTER UPDATE OF {cols} ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.{key}, {old_cols});
+            INSERT INTO {fts} (rowid, {cols}) VALUES (new.{key}, {new_cols});
+        END
+    """)
+    await db.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
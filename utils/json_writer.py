@@ -0,0 +1,88 @@
+"""
+Debounced JSON file writer
+
+For in-memory stores persisted as one JSON file. Changes only mark the writer
+dirty; one save per burst serialises the current state on the event loop (a
+consistent snapshot) and writes it atomically (temp file + rename) in a worker
+thread. Outside a running loop the save happens immediately.
+
+Example usage in a cog:
+    from utils.json_writer import DebouncedJsonWriter
+
+    self.data = {}
+    self.writer = DebouncedJsonWriter("data/store.json", lambda: self.data, delay=1)
+    self.data["key"] = "value"
+    self.writer.mark_dirty()
+    ...
+    await self.writer.close()                    # final save on unload
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Callable, Optional
+
+
+def write_atomic(path: str, payload: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+class DebouncedJsonWriter:
+    """Coalesces saves of one JSON file; `build()` returns the object to write."""
+
+    def __init__(self, path: str, build: Callable[[], Any], delay: float = 1):
+        self.path = path
+        self.build = build
+        self.delay = delay
+        self.dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()  # one writer at a time, so two flushes never share a temp file
+
+    def mark_dirty(self):
+        self.dirty = True
+        if self._save_task is None or self._save_task.done():
+            try:
+                self._save_task = asyncio.get_running_loop().create_task(self._save_later())
+            except RuntimeError:
+                try:
+                    write_atomic(self.path, self._payload())
+                except Exception as e:
+                    self.dirty = True
+                    print(f"⚠️ Failed to save {self.path}: {e}")
+
+    async def _save_later(self):
+        await asyncio.sleep(self.delay)
+        # Changes made while a write is in flight find this task still running and
+        # do not schedule another, so keep saving until nothing is left dirty.
+        while self.dirty:
+            if not await self.flush():
+                break
+
+    def _payload(self) -> str:
+        self.dirty = False
+        return json.dumps(self.build(), indent=2)
+
+    async def flush(self) -> bool:
+        """Write the file if dirty. Returns False if the write failed (it stays dirty for the next save)."""
+        async with self._save_lock:
+            if not self.dirty:
+                return True
+            try:
+                await asyncio.to_thread(write_atomic, self.path, self._payload())
+            except Exception as e:
+                self.dirty = True
+                print(f"⚠️ Failed to save {self.path}: {e}")
+                return False
+            return True
+
+    async def close(self):
+        """Final save. The flush waits for any write in progress; the pending save task is then redundant."""
+        await self.flush()
+        if self._save_task and not self._save_task.done():
+            self._save_task.cancel()
@@ -0,0 +1,103 @@
+"""
+Keyset pagination
+
+Pages through `ORDER BY date DESC, id DESC` queries by remembering the
+(date, id) of the last row shown instead of using OFFSET, so every page is
+one index seek no matter how deep it is. `id` is the table's INTEGER PRIMARY
+KEY (see utils.fts_index.ensure_keyed_table), which VACUUM never renumbers. The view keeps the cursor of each page
+it has visited for the Previous/Next buttons.
+
+Example usage in a cog:
+    from utils.keyset_pages import KeysetPageView, keyset_clause
+
+    async def fetch(cursor, limit):
+        # cursor is None (first page) or the (date, id) of the previous page's last row
+        after, params = keyset_clause(cursor)
+        ...  # SELECT date, id, ... WHERE user_id = ? {after} ORDER BY date DESC, id DESC LIMIT ?
+        return rows
+
+    view = KeysetPageView(fetch, render, page_size=5)
+    embed = await view.start(page=1)   # None if there are no rows at all
+    await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+"""
+
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import discord
+
+Cursor = Optional[tuple]
+
+
+def keyset_clause(cursor: Cursor, table: str = "", key: str = "id") -> Tuple[str, tuple]:
+    """SQL fragment and parameters that resume after `cursor` (empty on the first page).
+
+    Kept out of the query entirely when there is no cursor, so SQLite can plan a
+    plain index range seek either way.
+    """
+    if cursor is None:
+        return "", ()
+    prefix = f"{table}." if table else ""
+    return f" AND ({prefix}date, {prefix}{key}) < (?, ?)", tuple(cursor)
+
+
+def fts_match_query(text: str) -> str:
+    """Turn free text into an FTS5 MATCH expression: every word is a quoted prefix term (AND)."""
+    terms = [word.replace('"', '""') for word in text.split()]
+    return " ".join(f'"{term}"*' for term in terms if term)
+
+
+class KeysetPageView(discord.ui.View):
+    """Previous/Next buttons over a keyset-paginated query.
+
+    `fetch(cursor, limit)` returns rows whose first two columns are (date, id);
+    `render(rows, page_number)` builds the embed for one page.
+    """
+
+    def __init__(self, fetch: Callable[[Cursor, int], Awaitable[List[tuple]]],
+                 render: Callable[[List[tuple], int], discord.Embed], page_size: int = 5, timeout: float = 120):
+        super().__init__(timeout=timeout)
+        self.fetch = fetch
+        self.render = render
+        self.page_size = page_size
+        self.cursors: List[Cursor] = [None]  # cursors[i] starts page i
+        self.index = 0
+        self.has_next = False
+
+    async def _load(self) -> List[tuple]:
+        # One extra row tells us whether a next page exists without a COUNT
+        rows = await self.fetch(self.cursors[self.index], self.page_size + 1)
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.has_next and len(self.cursors) == self.index + 1:
+            self.cursors.append((rows[-1][0], rows[-1][1]))
+        self.previous.disabled = self.index == 0
+        self.next.disabled = not self.has_next
+        return rows
+
+    async def start(self, page: int = 1) -> Optional[discord.Embed]:
+        """Load the first page (walking forward to `page` if asked); None if there is nothing to show."""
+        rows = await self._load()
+        while self.index + 1 < page and self.has_next:
+            self.index += 1
+            rows = await self._load()
+        return self.render(rows, self.index + 1) if rows else None
+
+    async def _show(self, interaction: discord.Interaction):
+        rows = await self._load()
+        await interaction.response.edit_message(embed=self.render(rows, self.index + 1), view=self)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.index > 0:
+            self.index -= 1
+            await self._show(interaction)
+        else:
+            await interaction.response.defer()
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.has_next:
+            self.index += 1
+            await self._show(interaction)
+        else:
+            await interaction.response.defer()
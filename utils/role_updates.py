@@ -0,0 +1,94 @@
+"""
+Role transition helper
+
+Computes a member's target role set once and applies it with a single
+`member.edit(roles=...)` call instead of a chain of add_roles/remove_roles.
+
+Example usage in a cog:
+    from utils.role_updates import apply_role_changes
+
+    await apply_role_changes(member, add=[STRIKE_1_ROLE_ID], remove=[WARNING_1_ROLE_ID, WARNING_2_ROLE_ID],
+                             reason="Infraction system discipline update")
+"""
+
+import asyncio
+import logging
+from typing import Iterable, Optional, Union
+
+import discord
+
+logger = logging.getLogger("RoleUpdates")
+
+RoleLike = Union[int, discord.abc.Snowflake, None]
+
+MAX_RETRIES = 3
+BASE_BACKOFF_SECONDS = 1.0
+
+
+def _resolve_ids(roles: Iterable[RoleLike]) -> set:
+    """Normalise role objects / ids to a set of ints, ignoring None and 0."""
+    ids = set()
+    for role in roles or ():
+        if role is None:
+            continue
+        rid = role if isinstance(role, int) else getattr(role, "id", None)
+        if rid:
+            ids.add(int(rid))
+    return ids
+
+
+def compute_target_roles(member: discord.Member, add: Iterable[RoleLike] = (), remove: Iterable[RoleLike] = ()) -> Optional[list]:
+    """Return the member's new role list, or None if nothing would change.
+
+    Removals win over additions when a role appears in both. Role ids that do
+    not exist in the guild are skipped.
+    """
+    guild = member.guild
+    current = {r.id: r for r in member.roles if not r.is_default()}
+    add_ids = _resolve_ids(add)
+    remove_ids = _resolve_ids(remove)
+
+    target = {rid: role for rid, role in current.items() if rid not in remove_ids}
+    for rid in add_ids - remove_ids:
+        if rid in target:
+            continue
+        role = guild.get_role(rid)
+        if role is not None and not role.is_default():
+            target[rid] = role
+
+    if set(target) == set(current):
+        return None
+    return list(target.values())
+
+
+async def apply_role_changes(
+    member: discord.Member,
+    add: Iterable[RoleLike] = (),
+    remove: Iterable[RoleLike] = (),
+    reason: Optional[str] = None,
+    retries: int = MAX_RETRIES,
+) -> bool:
+    """Apply role additions/removals to a member in one API call.
+
+    Retries with exponential backoff when Discord answers 429 or a 5xx.
+    Returns True if the member was edited, False if no change was needed.
+    Other HTTP errors (e.g. Forbidden) are raised to the caller.
+    """
+    target = compute_target_roles(member, add, remove)
+    if target is None:
+        return False
+
+    attempt = 0
+    while True:
+        try:
+            await member.edit(roles=target, reason=reason)
+            return True
+        except discord.HTTPException as e:
+            status = getattr(e, "status", None)
+            if attempt >= retries or not (status == 429 or (status is not None and status >= 500)):
+                raise
+            retry_after = getattr(e, "retry_after", None)
+            delay = retry_after if retry_after else BASE_BACKOFF_SECONDS * (2 ** attempt)
+            logger.warning(f"Role update for {member} got HTTP {status}; retrying in {delay:.1f}s")
+            attempt += 1
+            await asyncio.sleep(delay)
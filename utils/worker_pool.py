@@ -0,0 +1,77 @@
+"""
+Rate-limited worker pool
+
+Runs one coroutine per item through a fixed number of workers, starting at
+most `per_second` jobs per second across all of them. Used for waves of
+member edits (nicknames, roles) so a batch finishes quickly without
+hammering a single Discord rate-limit bucket.
+
+Example usage in a cog:
+    from utils.worker_pool import run_rate_limited
+
+    async def rename(member):
+        await member.edit(nick=new_nicks[member.id])
+
+    results = await run_rate_limited(members, rename, concurrency=4, per_second=5)
+    failed = [member for member, error in results if isinstance(error, Exception)]
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Iterable, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_PER_SECOND = 5.0
+
+
+async def run_rate_limited(
+    items: Iterable[T],
+    handler: Callable[[T], Awaitable],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_second: float = DEFAULT_PER_SECOND,
+) -> List[Tuple[T, object]]:
+    """Run `handler(item)` for every item. Returns (item, result) pairs in input order.
+
+    A handler that raises has the exception as its result; one failure never
+    stops the rest of the batch.
+    """
+    items = list(items)
+    results: List[object] = [None] * len(items)
+    queue: asyncio.Queue = asyncio.Queue()
+    for index in range(len(items)):
+        queue.put_nowait(index)
+
+    interval = 1.0 / per_second if per_second > 0 else 0.0
+    pacing_lock = asyncio.Lock()
+    next_start = time.monotonic()
+
+    async def pace():
+        nonlocal next_start
+        async with pacing_lock:
+            now = time.monotonic()
+            if next_start > now:
+                await asyncio.sleep(next_start - now)
+                now = next_start
+            next_start = now + interval
+
+    async def worker():
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await pace()
+            try:
+                results[index] = await handler(items[index])
+            except Exception as e:
+                results[index] = e
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, len(items))))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    return list(zip(items, results))